@@ -7,15 +7,23 @@ Telegram-бот-агрегатор финансовых новостей
 """
 
 import asyncio
+import multiprocessing
+import signal
+import socket
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional
 
 from aiogram import Bot, Dispatcher
+from aiogram.client.session.aiohttp import AiohttpSession
+from aiogram.client.telegram import TelegramAPIServer
+from aiogram.webhook.aiohttp_server import SimpleRequestHandler, setup_application
+from aiohttp import web
 
 from config.settings import Settings
 from controllers import BotController
 from models import NewsAggregator, UserManager
-from utils import setup_logging, get_logger, scheduler
+from utils import setup_logging, get_logger, scheduler, LoopLagMonitor
 
 # Настройка логирования
 setup_logging()
@@ -25,13 +33,25 @@ logger = get_logger(__name__)
 class NewsBot:
     """Основной класс бота"""
     
-    def __init__(self):
+    def __init__(self, worker_id: Optional[int] = None):
         self.bot: Optional[Bot] = None
         self.dp: Optional[Dispatcher] = None
         self.controller: Optional[BotController] = None
         self.news_aggregator: Optional[NewsAggregator] = None
         self.user_manager: Optional[UserManager] = None
-        
+        # Номер процесса в режиме webhook с несколькими процессами (None — единственный процесс)
+        self.worker_id = worker_id
+        self.is_primary = worker_id in (None, 0)
+        # Сбор новостей выполняется вне цикла событий, по одному циклу за раз
+        self.ingest_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='ingest')
+        self.loop_monitor = LoopLagMonitor(Settings.LOOP_LAG_INTERVAL, Settings.LOOP_LAG_WARN_THRESHOLD)
+        self._monitor_task: Optional[asyncio.Task] = None
+        self._users_sync_task: Optional[asyncio.Task] = None
+        # Дополнительные процессы только читают базу, которую обновляет основной
+        self._external_ingest = Settings.INGEST_MODE.lower() == 'external' or not self.is_primary
+        self._stop_event: Optional[asyncio.Event] = None
+        self._runner: Optional[web.AppRunner] = None
+    
     def initialize(self):
         """Инициализирует компоненты бота"""
         try:
@@ -39,15 +59,19 @@ class NewsBot:
             Settings.validate()
             
             # Инициализация бота и диспетчера
-            self.bot = Bot(token=Settings.TELEGRAM_TOKEN)
+            session = None
+            if Settings.TELEGRAM_API_SERVER:
+                session = AiohttpSession(api=TelegramAPIServer.from_base(Settings.TELEGRAM_API_SERVER))
+            self.bot = Bot(token=Settings.TELEGRAM_TOKEN, session=session)
             self.dp = Dispatcher()
             
             # Инициализация моделей
             self.news_aggregator = NewsAggregator()
-            self.user_manager = UserManager()
+            self.user_manager = UserManager(worker_id=self.worker_id)
             
             # Инициализация контроллера
-            self.controller = BotController(self.bot, self.dp)
+            self.controller = BotController(
+                self.bot, self.dp, self.news_aggregator, self.user_manager)
             
             # Настройка планировщика задач
             self._setup_scheduler()
@@ -60,35 +84,73 @@ class NewsBot:
     
     def _setup_scheduler(self):
         """Настраивает планировщик задач"""
-        # Ежедневный дайджест
-        scheduler.add_daily_task(
-            Settings.DAILY_TIME,
-            self.controller.send_daily_digest_to_all_users
-        )
+        if self.is_primary:
+            # Ежедневный дайджест
+            scheduler.add_daily_task(
+                Settings.DAILY_TIME,
+                self.controller.send_daily_digest_to_all_users,
+                name='daily_digest'
+            )
         
-        # Периодическое обновление новостей
-        scheduler.add_interval_task(
-            Settings.NEWS_UPDATE_INTERVAL,
-            self._update_news_task
-        )
+        if self._external_ingest:
+            # Новости собирает другой процесс, бот только подхватывает изменения базы
+            scheduler.add_interval_task(
+                Settings.NEWS_REFRESH_INTERVAL,
+                self._refresh_news_task,
+                name='refresh_news'
+            )
+        else:
+            # Периодическое обновление новостей; при адаптивном опросе задача
+            # запускается чаще и опрашивает только источники, которым пора
+            scheduler.add_interval_task(
+                Settings.SOURCE_POLL_TICK if Settings.ADAPTIVE_POLLING else Settings.NEWS_UPDATE_INTERVAL,
+                self._update_news_task,
+                name='update_news'
+            )
         
-        # Очистка неактивных пользователей (раз в неделю)
-        scheduler.add_interval_task(
-            7 * 24 * 60 * 60,  # 7 дней
-            self._cleanup_users_task
-        )
+        if self.is_primary:
+            # Очистка неактивных пользователей (раз в неделю)
+            scheduler.add_interval_task(
+                7 * 24 * 60 * 60,  # 7 дней
+                self._cleanup_users_task,
+                name='cleanup_users'
+            )
         
         logger.info("Планировщик задач настроен")
     
     async def _update_news_task(self):
         """Задача обновления новостей"""
         try:
+            if not self.news_aggregator.has_due_sources():
+                # При адаптивном опросе задача запускается часто, а источникам может быть ещё рано
+                logger.debug("Обновление новостей пропущено: нет источников для опроса")
+                return
             logger.info("Запуск обновления новостей...")
-            self.news_aggregator.update_news_database()
-            logger.info("Новости успешно обновлены")
+            self.loop_monitor.reset_max()
+            # Сетевые запросы, разбор RSS и запись базы идут в отдельном потоке;
+            # обработчики читают опубликованный снимок, который подменяется атомарно
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(self.ingest_executor, self.news_aggregator.update_news_database)
+            logger.info(
+                f"Новости успешно обновлены, макс. задержка цикла событий: "
+                f"{self.loop_monitor.reset_max() * 1000:.0f} мс")
         except Exception as e:
             logger.error(f"Ошибка обновления новостей: {e}")
     
+    async def _refresh_news_task(self):
+        """Задача проверки базы новостей, обновляемой другим процессом"""
+        try:
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(self.ingest_executor, self.news_aggregator.refresh_from_storage)
+        except Exception as e:
+            logger.error(f"Ошибка чтения базы новостей: {e}")
+    
+    async def _sync_users_task(self):
+        """Применяет изменения пользователей, сделанные другими процессами"""
+        while True:
+            await asyncio.sleep(Settings.USERS_SYNC_INTERVAL)
+            self.user_manager.sync_from_journal()
+    
     async def _cleanup_users_task(self):
         """Задача очистки неактивных пользователей"""
         try:
@@ -98,47 +160,132 @@ class NewsBot:
         except Exception as e:
             logger.error(f"Ошибка очистки пользователей: {e}")
     
-    async def start(self):
+    async def _health_handler(self, request: web.Request) -> web.Response:
+        """Обработчик /health для обратного прокси и мониторинга"""
+        return web.json_response(self.get_status())
+    
+    async def _start_webhook(self, sock: Optional[socket.socket] = None):
+        """Принимает обновления через webhook до сигнала остановки"""
+        app = web.Application()
+        SimpleRequestHandler(
+            dispatcher=self.dp,
+            bot=self.bot,
+            secret_token=Settings.WEBHOOK_SECRET or None
+        ).register(app, path=Settings.WEBHOOK_PATH)
+        app.router.add_get('/health', self._health_handler)
+        setup_application(app, self.dp, bot=self.bot)
+        
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        if sock is not None:
+            # Сокет открыт родительским процессом и общий для всех процессов
+            site = web.SockSite(self._runner, sock)
+        else:
+            site = web.TCPSite(self._runner, Settings.WEBHOOK_HOST, Settings.WEBHOOK_PORT)
+        await site.start()
+        logger.info(f"Webhook принимает обновления на {site.name}{Settings.WEBHOOK_PATH}")
+        
+        if self.is_primary and Settings.WEBHOOK_URL:
+            await self.bot.set_webhook(
+                Settings.WEBHOOK_URL.rstrip('/') + Settings.WEBHOOK_PATH,
+                secret_token=Settings.WEBHOOK_SECRET or None
+            )
+            logger.info("Webhook зарегистрирован в Telegram")
+        
+        await self._stop_event.wait()
+    
+    async def start(self, sock: Optional[socket.socket] = None):
         """Запускает бота"""
         try:
             logger.info("Запуск бота...")
+            self._stop_event = asyncio.Event()
+            
+            # Мониторинг задержки цикла событий
+            self._monitor_task = asyncio.create_task(self.loop_monitor.start())
+            
+            if self.worker_id is not None:
+                self._users_sync_task = asyncio.create_task(self._sync_users_task())
             
-            # Первоначальное обновление новостей
-            await self._update_news_task()
+            # Первоначальное обновление (или загрузка) новостей
+            if self._external_ingest:
+                await self._refresh_news_task()
+            else:
+                await self._update_news_task()
             
             # Запуск планировщика в фоне
             asyncio.create_task(scheduler.start())
             
             # Запуск бота
-            await self.dp.start_polling(self.bot)
+            if Settings.BOT_MODE.lower() == 'webhook':
+                await self._start_webhook(sock)
+            else:
+                await self.dp.start_polling(self.bot)
             
         except Exception as e:
             logger.error(f"Ошибка запуска бота: {e}")
             raise
     
+    def request_stop(self):
+        """Просит бота завершить работу (обработчик сигналов)"""
+        if self._stop_event is not None:
+            self._stop_event.set()
+    
     async def stop(self):
         """Останавливает бота"""
         try:
             logger.info("Остановка бота...")
-            scheduler.stop()
-            await self.bot.session.close()
+            try:
+                scheduler.stop()
+                self.loop_monitor.stop()
+                if self._users_sync_task is not None:
+                    self._users_sync_task.cancel()
+                if self._runner is not None:
+                    await self._runner.cleanup()
+                # Текущий цикл загрузки дорабатывает в отдельном потоке,
+                # не блокируя цикл событий
+                await asyncio.to_thread(self.ingest_executor.shutdown, wait=True)
+                if self.news_aggregator:
+                    self.news_aggregator.close()
+            finally:
+                try:
+                    if self.user_manager:
+                        # Гарантированно сохраняем отложенные изменения пользователей,
+                        # даже если остановка остальных компонентов завершилась ошибкой
+                        self.user_manager.close()
+                finally:
+                    await self.bot.session.close()
             logger.info("Бот остановлен")
         except Exception as e:
             logger.error(f"Ошибка остановки бота: {e}")
     
+    def _get_source_stats(self) -> dict:
+        """Возвращает сводку по сбойным источникам"""
+        if not self.news_aggregator:
+            return {}
+        source_health = self.news_aggregator.source_health
+        if self._external_ingest:
+            # Состояние источников ведёт процесс-сборщик, бот читает его файл
+            source_health.load()
+        return source_health.get_stats()
+
     def get_status(self) -> dict:
         """Возвращает статус бота"""
         return {
             'initialized': self.controller is not None,
-            'news_count': len(self.news_aggregator.load_news_data()) if self.news_aggregator else 0,
+            'worker_id': self.worker_id,
+            'news_count': self.news_aggregator.get_news_count() if self.news_aggregator else 0,
             'users_count': len(self.user_manager.get_all_users()) if self.user_manager else 0,
-            'scheduler_running': scheduler.is_running
+            'scheduler_running': scheduler.is_running,
+            'jobs': scheduler.get_stats(),
+            'ingest_mode': 'external' if self._external_ingest else 'inline',
+            'sources': self._get_source_stats(),
+            'loop_lag': self.loop_monitor.stats()
         }
 
 
-async def main():
-    """Основная функция"""
-    bot_instance = NewsBot()
+async def run_bot(worker_id: Optional[int] = None, sock: Optional[socket.socket] = None):
+    """Инициализирует и запускает один процесс бота"""
+    bot_instance = NewsBot(worker_id)
     
     try:
         # Инициализация
@@ -147,9 +294,18 @@ async def main():
         # Вывод статуса
         status = bot_instance.get_status()
         logger.info(f"Статус бота: {status}")
+
+        if Settings.BOT_MODE.lower() == 'webhook':
+            # Корректная остановка по SIGTERM (в режиме polling сигналы обрабатывает aiogram)
+            loop = asyncio.get_running_loop()
+            for sig in (signal.SIGTERM, signal.SIGINT):
+                try:
+                    loop.add_signal_handler(sig, bot_instance.request_stop)
+                except NotImplementedError:  # Windows
+                    pass
         
         # Запуск
-        await bot_instance.start()
+        await bot_instance.start(sock)
         
     except KeyboardInterrupt:
         logger.info("Получен сигнал остановки")
@@ -160,11 +316,64 @@ async def main():
         await bot_instance.stop()
 
 
+def _worker_main(worker_id: int, sock: socket.socket):
+    """Точка входа процесса, принимающего обновления webhook"""
+    asyncio.run(run_bot(worker_id, sock))
+
+
+def run_webhook_workers(workers: int):
+    """Запускает несколько процессов webhook на общем слушающем сокете.
+
+    Сокет открывается до создания процессов, и ядро распределяет входящие
+    соединения между ними. Плановые задачи (сбор новостей, дайджест,
+    очистка пользователей) выполняет только процесс 0.
+    """
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((Settings.WEBHOOK_HOST, Settings.WEBHOOK_PORT))
+    sock.listen(1024)
+    sock.set_inheritable(True)
+    logger.info(f"Запуск {workers} процессов webhook на {Settings.WEBHOOK_HOST}:{Settings.WEBHOOK_PORT}")
+
+    context = multiprocessing.get_context('fork')
+    processes = [
+        context.Process(target=_worker_main, args=(worker_id, sock), name=f'bot-worker-{worker_id}')
+        for worker_id in range(workers)
+    ]
+    for process in processes:
+        process.start()
+
+    def terminate(*args):
+        for process in processes:
+            if process.is_alive():
+                process.terminate()
+
+    signal.signal(signal.SIGTERM, terminate)
+    signal.signal(signal.SIGINT, terminate)
+
+    for process in processes:
+        process.join()
+    sock.close()
+
+    failed = [process.name for process in processes if process.exitcode]
+    if failed:
+        logger.error(f"Процессы завершились с ошибкой: {failed}")
+        sys.exit(1)
+
+
+async def main():
+    """Основная функция"""
+    await run_bot()
+
+
 if __name__ == '__main__':
     try:
-        asyncio.run(main())
+        if Settings.BOT_MODE.lower() == 'webhook' and Settings.WEBHOOK_WORKERS > 1:
+            run_webhook_workers(Settings.WEBHOOK_WORKERS)
+        else:
+            asyncio.run(main())
     except KeyboardInterrupt:
         logger.info("Бот остановлен пользователем")
     except Exception as e:
         logger.error(f"Критическая ошибка: {e}")
-        sys.exit(1)
\ No newline at end of file
+        sys.exit(1)
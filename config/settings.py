@@ -14,10 +14,47 @@ class Settings:
     
     # Telegram Bot
     TELEGRAM_TOKEN = os.getenv('TELEGRAM_TOKEN')
+    # Адрес Bot API (пусто — api.telegram.org), например локальная заглушка tools/telegram_stub.py
+    TELEGRAM_API_SERVER = os.getenv('TELEGRAM_API_SERVER', '')
+    
+    # Получение обновлений: polling или webhook
+    BOT_MODE = os.getenv('BOT_MODE', 'polling')
+    WEBHOOK_URL = os.getenv('WEBHOOK_URL', '')  # внешний адрес за обратным прокси; пусто — не регистрировать
+    WEBHOOK_PATH = os.getenv('WEBHOOK_PATH', '/webhook')
+    WEBHOOK_SECRET = os.getenv('WEBHOOK_SECRET', '')
+    WEBHOOK_HOST = os.getenv('WEBHOOK_HOST', '127.0.0.1')
+    WEBHOOK_PORT = int(os.getenv('WEBHOOK_PORT', '8080'))
+    WEBHOOK_WORKERS = int(os.getenv('WEBHOOK_WORKERS', '1'))  # процессов, принимающих обновления
     
     # Пути к файлам данных
     DATABASE_PATH = os.getenv('DATABASE_PATH', 'data/news.json')
+    SQLITE_DATABASE_PATH = os.getenv('SQLITE_DATABASE_PATH', 'data/news.db')
+    NEWS_PARTITIONS_PATH = os.getenv('NEWS_PARTITIONS_PATH', 'data/news_partitions')
+    NDJSON_DATABASE_PATH = os.getenv('NDJSON_DATABASE_PATH', 'data/news.ndjson')
     USERS_PATH = os.getenv('USERS_PATH', 'data/users.json')
+    FEED_CACHE_PATH = os.getenv('FEED_CACHE_PATH', 'data/feed_cache.json')
+    SOURCE_SCHEDULE_PATH = os.getenv('SOURCE_SCHEDULE_PATH', 'data/source_schedule.json')
+    SOURCE_HEALTH_PATH = os.getenv('SOURCE_HEALTH_PATH', 'data/source_health.json')
+    SEEN_FILTER_PATH = os.getenv('SEEN_FILTER_PATH', 'data/seen_ids.bloom')
+    
+    # Отложенная запись пользователей: изменения сохраняются не чаще раза в интервал
+    USERS_WRITE_BEHIND = os.getenv('USERS_WRITE_BEHIND', 'true').lower() in ('1', 'true', 'yes')
+    USERS_FLUSH_INTERVAL = float(os.getenv('USERS_FLUSH_INTERVAL', '5'))  # секунд
+    
+    # Журнал изменений пользователей: операции дописываются в файл, снимок пишется при уплотнении
+    USERS_JOURNAL = os.getenv('USERS_JOURNAL', 'false').lower() in ('1', 'true', 'yes')
+    USERS_JOURNAL_PATH = os.getenv('USERS_JOURNAL_PATH', 'data/users.journal')
+    USERS_JOURNAL_COMPACT_RECORDS = int(os.getenv('USERS_JOURNAL_COMPACT_RECORDS', '10000'))
+    USERS_JOURNAL_COMPACT_INTERVAL = float(os.getenv('USERS_JOURNAL_COMPACT_INTERVAL', '3600'))  # секунд
+    USERS_SYNC_INTERVAL = float(os.getenv('USERS_SYNC_INTERVAL', '1'))  # чтение журнала других процессов, секунд
+    
+    # Хранилище новостей: json, sqlite, ndjson или partitioned
+    NEWS_STORAGE = os.getenv('NEWS_STORAGE', 'json')
+    
+    # Партиции новостей: по дням или часам, срок хранения и сжатие остывших
+    NEWS_PARTITION_GRANULARITY = os.getenv('NEWS_PARTITION_GRANULARITY', 'day')  # day или hour
+    NEWS_RETENTION_DAYS = float(os.getenv('NEWS_RETENTION_DAYS', '30'))  # 0 — хранить всё
+    NEWS_PARTITION_COMPRESS_AFTER_DAYS = float(os.getenv('NEWS_PARTITION_COMPRESS_AFTER_DAYS', '2'))  # 0 — не сжимать
     
     # RSS источники
     SOURCES = []
@@ -33,6 +70,12 @@ class Settings:
     DIGEST_SIZE = int(os.getenv('DIGEST_SIZE', '10'))
     MAX_NEWS_COUNT = int(os.getenv('MAX_NEWS_COUNT', '1000'))
     
+    # Рассылка дайджеста: лимит Telegram ~30 сообщений в секунду на бота
+    DIGEST_RATE_LIMIT = float(os.getenv('DIGEST_RATE_LIMIT', '25'))  # сообщений в секунду
+    DIGEST_CONCURRENCY = int(os.getenv('DIGEST_CONCURRENCY', '20'))  # одновременных отправок
+    DIGEST_MAX_RETRIES = int(os.getenv('DIGEST_MAX_RETRIES', '3'))
+    DIGEST_PROGRESS_EVERY = int(os.getenv('DIGEST_PROGRESS_EVERY', '1000'))  # логировать прогресс каждые N
+    
     # Фильтрация
     FILTER_KEYWORDS = [kw.strip().lower() for kw in os.getenv('FILTER_KEYWORDS', '').split(',') if kw.strip()]
     
@@ -45,15 +88,71 @@ class Settings:
     
     # Интервалы обновления
     NEWS_UPDATE_INTERVAL = int(os.getenv('NEWS_UPDATE_INTERVAL', '1800'))  # 30 минут в секундах
-    SCHEDULER_CHECK_INTERVAL = int(os.getenv('SCHEDULER_CHECK_INTERVAL', '60'))  # 1 минута
+    
+    # Сбор новостей: inline — внутри процесса бота, external — отдельным процессом fetcher.py
+    INGEST_MODE = os.getenv('INGEST_MODE', 'inline')
+    NEWS_REFRESH_INTERVAL = int(os.getenv('NEWS_REFRESH_INTERVAL', '60'))  # проверка версии базы в режиме external
+    
+    # Мониторинг задержки цикла событий
+    LOOP_LAG_INTERVAL = float(os.getenv('LOOP_LAG_INTERVAL', '0.1'))  # период измерения, секунд
+    LOOP_LAG_WARN_THRESHOLD = float(os.getenv('LOOP_LAG_WARN_THRESHOLD', '0.2'))  # порог предупреждения, секунд
+    
+    # Параллельный сбор новостей
+    FETCH_MAX_WORKERS = int(os.getenv('FETCH_MAX_WORKERS', '8'))  # одновременно загружаемых источников
+    FETCH_CONNECT_TIMEOUT = float(os.getenv('FETCH_CONNECT_TIMEOUT', '5'))  # секунд на соединение
+    FETCH_READ_TIMEOUT = float(os.getenv('FETCH_READ_TIMEOUT', '15'))  # секунд на чтение ответа
+    FETCH_CYCLE_DEADLINE = float(os.getenv('FETCH_CYCLE_DEADLINE', '120'))  # общий дедлайн цикла сбора
+    FETCH_MAX_BYTES = int(os.getenv('FETCH_MAX_BYTES', str(5 * 1024 * 1024)))  # максимум тела ответа
+    HTTP_POOL_CONNECTIONS = int(os.getenv('HTTP_POOL_CONNECTIONS', '32'))  # хостов с пулом соединений
+    HTTP_USER_AGENT = os.getenv('HTTP_USER_AGENT', 'FinanceNewsBot/1.0 (+RSS aggregator)')
+    TEXT_EXTRACT_PROCESSES = int(os.getenv('TEXT_EXTRACT_PROCESSES', '0'))  # процессов для разбора HTML, 0 — без пула
+    TEXT_EXTRACT_BATCH = int(os.getenv('TEXT_EXTRACT_BATCH', '500'))  # описаний в пачке, разбираемой в пуле
+    
+    # Фильтр Блума обработанных новостей вне базы (вытесненных и дубликатов): ёмкость поколения и доля ложных срабатываний
+    SEEN_FILTER_CAPACITY = int(os.getenv('SEEN_FILTER_CAPACITY', '100000'))
+    SEEN_FILTER_ERROR_RATE = float(os.getenv('SEEN_FILTER_ERROR_RATE', '0.001'))
+    
+    # Почти одинаковые новости из разных источников объединяются в одну
+    NEAR_DUPLICATE_DETECTION = os.getenv('NEAR_DUPLICATE_DETECTION', 'true').lower() in ('1', 'true', 'yes')
+    NEAR_DUPLICATE_THRESHOLD = float(os.getenv('NEAR_DUPLICATE_THRESHOLD', '0.6'))  # сходство по Жаккару
+    NEAR_DUPLICATE_WINDOW = float(os.getenv('NEAR_DUPLICATE_WINDOW', '172800'))  # 48 часов
+    
+    # Адаптивный опрос: у каждого источника свой интервал по частоте публикаций
+    ADAPTIVE_POLLING = os.getenv('ADAPTIVE_POLLING', 'true').lower() in ('1', 'true', 'yes')
+    SOURCE_POLL_TICK = int(os.getenv('SOURCE_POLL_TICK', '60'))  # проверка, какие источники пора опросить
+    SOURCE_MIN_INTERVAL = float(os.getenv('SOURCE_MIN_INTERVAL', '120'))  # 2 минуты
+    SOURCE_MAX_INTERVAL = float(os.getenv('SOURCE_MAX_INTERVAL', '21600'))  # 6 часов
+    SOURCE_TARGET_ITEMS = float(os.getenv('SOURCE_TARGET_ITEMS', '1'))  # новых записей на один опрос
+    SOURCE_RATE_ALPHA = float(os.getenv('SOURCE_RATE_ALPHA', '0.3'))  # вес нового наблюдения в среднем
+    SOURCE_JITTER = float(os.getenv('SOURCE_JITTER', '0.1'))  # разброс момента опроса, доля интервала
+    
+    # Выключатель сбойных источников: после N ошибок подряд источник отключается с растущей паузой
+    SOURCE_FAILURE_THRESHOLD = int(os.getenv('SOURCE_FAILURE_THRESHOLD', '3'))
+    SOURCE_BACKOFF_BASE = float(os.getenv('SOURCE_BACKOFF_BASE', '300'))  # 5 минут
+    SOURCE_BACKOFF_MAX = float(os.getenv('SOURCE_BACKOFF_MAX', '86400'))  # сутки
     
     @classmethod
-    def validate(cls) -> bool:
+    def validate(cls, require_token: bool = True) -> bool:
         """Проверяет корректность настроек"""
-        if not cls.TELEGRAM_TOKEN:
+        if require_token and not cls.TELEGRAM_TOKEN:
             raise ValueError("TELEGRAM_TOKEN не установлен")
         
         if not cls.SOURCES:
             raise ValueError("Не указаны RSS источники")
         
+        if cls.NEWS_STORAGE.lower() not in ('json', 'sqlite', 'ndjson', 'partitioned'):
+            raise ValueError(f"Неизвестное хранилище новостей: {cls.NEWS_STORAGE}")
+        
+        if cls.NEWS_PARTITION_GRANULARITY.lower() not in ('day', 'hour'):
+            raise ValueError(f"Неизвестная гранулярность партиций: {cls.NEWS_PARTITION_GRANULARITY}")
+        
+        if cls.INGEST_MODE.lower() not in ('inline', 'external'):
+            raise ValueError(f"Неизвестный режим сбора новостей: {cls.INGEST_MODE}")
+        
+        if cls.BOT_MODE.lower() not in ('polling', 'webhook'):
+            raise ValueError(f"Неизвестный режим получения обновлений: {cls.BOT_MODE}")
+        
+        if cls.WEBHOOK_WORKERS < 1:
+            raise ValueError("WEBHOOK_WORKERS должно быть не меньше 1")
+        
         return True
@@ -3,5 +3,6 @@
 """
 
 from .bot_controller import BotController
+from .digest_planner import DigestPlanner, DigestGroup
 
-__all__ = ['BotController']
+__all__ = ['BotController', 'DigestPlanner', 'DigestGroup']
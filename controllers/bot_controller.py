@@ -2,16 +2,21 @@
 Контроллер для обработки команд бота
 """
 
+import asyncio
 import logging
+import time
 from typing import List, Dict, Optional
 
 from aiogram import Bot, Dispatcher, types
+from aiogram.exceptions import TelegramNetworkError, TelegramRetryAfter, TelegramServerError
 from aiogram.filters import Command, CommandStart
 from aiogram.types import Message
 
 from models import NewsAggregator, UserManager
 from views import MessageFormatter
+from .digest_planner import DigestPlanner
 from config.settings import Settings
+from utils.rate_limiter import TokenBucket
 
 logger = logging.getLogger(__name__)
 
@@ -19,12 +24,17 @@ logger = logging.getLogger(__name__)
 class BotController:
     """Основной контроллер бота"""
 
-    def __init__(self, bot: Bot, dp: Dispatcher):
+    def __init__(self, bot: Bot, dp: Dispatcher, news_aggregator: Optional[NewsAggregator] = None,
+                 user_manager: Optional[UserManager] = None):
         self.bot = bot
         self.dp = dp
-        self.news_aggregator = NewsAggregator()
-        self.user_manager = UserManager()
+        # Используем общие модели, чтобы видеть снимки новостей и несохранённые изменения пользователей
+        self.news_aggregator = news_aggregator or NewsAggregator()
+        self.user_manager = user_manager or UserManager()
         self.formatter = MessageFormatter()
+        self.digest_planner = DigestPlanner(self.news_aggregator, self.formatter)
+        # Общий лимит отправки рассылок под ограничения Telegram Bot API
+        self.rate_limiter = TokenBucket(Settings.DIGEST_RATE_LIMIT)
         self._register_handlers()
 
     def _register_handlers(self):
@@ -161,7 +171,8 @@ class BotController:
             topics = self.user_manager.get_user_topics(user_id)
 
             # Ищем новости по запросу и темам пользователя
-            search_results = self.news_aggregator.search_news(query, topics)
+            search_results = self.news_aggregator.search_news(
+                query, topics, Settings.DIGEST_SIZE)
 
             if not search_results:
                 await message.answer(
@@ -170,9 +181,7 @@ class BotController:
                 )
                 return
 
-            # Берем первые результаты
-            results = search_results[:Settings.DIGEST_SIZE]
-            response = self.formatter.format_search_results(query, results)
+            response = self.formatter.format_search_results(query, search_results)
             await message.answer(response)
 
         except IndexError:
@@ -192,11 +201,7 @@ class BotController:
             return
 
         # Получаем новости по ID
-        favorites = []
-        for news_id in favorite_ids:
-            news = self.news_aggregator.get_news_by_id(news_id)
-            if news:
-                favorites.append(news)
+        favorites = self.news_aggregator.get_news_by_ids(favorite_ids)
 
         if not favorites:
             await message.answer("⭐ Сохранённые новости больше не доступны")
@@ -214,12 +219,14 @@ class BotController:
             news_number = int(message.text.split(' ', 1)[1].strip())
             topics = self.user_manager.get_user_topics(user_id)
 
-            # Получаем новости по темам пользователя
-            user_news = self.news_aggregator.get_news_by_topics(
-                topics)
+            # Получаем только нужную новость по темам пользователя
+            user_news = []
+            if news_number >= 1:
+                user_news = self.news_aggregator.get_news_by_topics(
+                    topics, 1, news_number)
 
-            if 1 <= news_number <= len(user_news):
-                news = user_news[news_number - 1]
+            if user_news:
+                news = user_news[0]
                 if self.user_manager.add_favorite(user_id, news['id']):
                     await message.answer(
                         self.formatter.format_success_message(
@@ -230,7 +237,8 @@ class BotController:
             else:
                 await message.answer(
                     self.formatter.format_error_message(
-                        'invalid_news_number', self.formatter.format_news_range(len(user_news)))
+                        'invalid_news_number', self.formatter.format_news_range(
+                            self.news_aggregator.count_news_by_topics(topics)))
                 )
 
         except (IndexError, ValueError):
@@ -240,36 +248,90 @@ class BotController:
 
     async def send_daily_digest_to_user(self, user_id: str, user_topics: List[str]) -> bool:
         """Отправляет ежедневный дайджест пользователю"""
-        try:
-            # Получаем новости по темам пользователя
-            user_news = self.news_aggregator.get_news_by_topics(
-                user_topics, Settings.DIGEST_SIZE)
-
-            if not user_news:
-                return False
-
-            digest_text = self.formatter.format_daily_digest(user_news)
-            await self.bot.send_message(user_id, digest_text)
-            logger.info(f"Дайджест отправлен пользователю {user_id}")
-            return True
+        return await self._deliver_digest(user_id, user_topics) == 'sent'
 
+    async def _deliver_digest(self, user_id: str, user_topics: List[str]) -> str:
+        """Готовит и отправляет дайджест одному пользователю"""
+        try:
+            digest_text = self.digest_planner.render(
+                self.digest_planner.normalize_topics(user_topics))
         except Exception as e:
             logger.error(
-                f"Ошибка отправки дайджеста пользователю {user_id}: {e}")
-            return False
-
-    async def send_daily_digest_to_all_users(self):
-        """Отправляет ежедневный дайджест всем пользователям"""
+                f"Ошибка подготовки дайджеста пользователю {user_id}: {e}")
+            return 'failed'
+
+        if digest_text is None:
+            return 'skipped'
+        return await self._send_digest_text(user_id, digest_text)
+
+    async def _send_digest_text(self, user_id: str, digest_text: str) -> str:
+        """Отправляет готовый дайджест с учётом лимита скорости и повторов.
+
+        Возвращает 'sent' или 'failed'.
+        """
+        for attempt in range(Settings.DIGEST_MAX_RETRIES + 1):
+            await self.rate_limiter.acquire()
+            try:
+                await self.bot.send_message(user_id, digest_text)
+                logger.debug(f"Дайджест отправлен пользователю {user_id}")
+                return 'sent'
+            except TelegramRetryAfter as e:
+                # Флуд-контроль действует на весь бот: приостанавливаем всю рассылку
+                logger.warning(f"Превышен лимит Telegram, пауза {e.retry_after} с")
+                self.rate_limiter.pause(e.retry_after)
+            except (TelegramNetworkError, TelegramServerError) as e:
+                delay = 2 ** attempt
+                logger.warning(
+                    f"Временная ошибка отправки пользователю {user_id}: {e}, повтор через {delay} с")
+                await asyncio.sleep(delay)
+            except Exception as e:
+                logger.error(
+                    f"Ошибка отправки дайджеста пользователю {user_id}: {e}")
+                return 'failed'
+
+        logger.error(f"Дайджест пользователю {user_id} не отправлен после {attempt + 1} попыток")
+        return 'failed'
+
+    async def send_daily_digest_to_all_users(self) -> Dict[str, int]:
+        """Отправляет ежедневный дайджест всем пользователям параллельно"""
         users_with_topics = self.user_manager.get_users_with_topics()
+        stats = {'sent': 0, 'failed': 0, 'skipped': 0}
 
         if not users_with_topics:
             logger.info("Нет пользователей для отправки дайджеста")
-            return
-
-        for user_id, user_info in users_with_topics.items():
-            topics = user_info.get('topics', [])
-            if topics:
-                await self.send_daily_digest_to_user(user_id, topics)
+            return stats
+
+        total = len(users_with_topics)
+        logger.info(f"Рассылка дайджеста: {total} пользователей, "
+                    f"потоков: {Settings.DIGEST_CONCURRENCY}, лимит: {Settings.DIGEST_RATE_LIMIT} сообщ./с")
+        started = time.monotonic()
+
+        # Один текст на каждый уникальный набор тем
+        plan = self.digest_planner.plan(users_with_topics)
+        stats['skipped'] = sum(len(group.user_ids) for group in plan if group.text is None)
+
+        # Общий итератор: воркеры разбирают пользователей по одному
+        pending = ((user_id, group.text) for group in plan if group.text is not None
+                   for user_id in group.user_ids)
+
+        async def worker():
+            for user_id, digest_text in pending:
+                status = await self._send_digest_text(user_id, digest_text)
+                stats[status] += 1
+                done = sum(stats.values())
+                if done % Settings.DIGEST_PROGRESS_EVERY == 0:
+                    logger.info(f"Рассылка дайджеста: {done}/{total}")
+
+        await asyncio.gather(*(worker() for _ in range(min(Settings.DIGEST_CONCURRENCY, total))))
+
+        elapsed = max(time.monotonic() - started, 1e-6)
+        logger.info(
+            f"Рассылка дайджеста завершена за {elapsed:.1f} с: "
+            f"отправлено {stats['sent']} ({stats['sent'] / elapsed:.1f}/с), "
+            f"ошибок {stats['failed']} ({stats['failed'] / elapsed:.1f}/с), "
+            f"пропущено {stats['skipped']} ({stats['skipped'] / elapsed:.1f}/с)"
+        )
+        return stats
 
     def get_news_aggregator(self) -> NewsAggregator:
         """Возвращает экземпляр NewsAggregator"""
@@ -0,0 +1,64 @@
+"""
+Планировщик ежедневной рассылки
+"""
+
+import logging
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from config.settings import Settings
+from models import NewsAggregator
+from views import MessageFormatter
+
+logger = logging.getLogger(__name__)
+
+
+class DigestGroup(NamedTuple):
+    """Пользователи с одинаковым набором тем и общий текст дайджеста"""
+    topics: Tuple[str, ...]
+    text: Optional[str]
+    user_ids: List[str]
+
+
+class DigestPlanner:
+    """Готовит дайджесты один раз на каждый уникальный набор тем.
+
+    Пользователи группируются по нормализованному набору тем, поэтому
+    выборка новостей и форматирование выполняются O(число наборов), а не
+    O(число пользователей).
+    """
+
+    def __init__(self, news_aggregator: NewsAggregator, formatter: MessageFormatter):
+        self.news_aggregator = news_aggregator
+        self.formatter = formatter
+
+    @staticmethod
+    def normalize_topics(topics: List[str]) -> Tuple[str, ...]:
+        """Приводит список тем к ключу группы (без повторов и порядка)"""
+        return tuple(sorted(set(topics)))
+
+    def render(self, topics: Tuple[str, ...]) -> Optional[str]:
+        """Формирует текст дайджеста для набора тем, None — если новостей нет"""
+        news = self.news_aggregator.get_news_by_topics(list(topics), Settings.DIGEST_SIZE)
+        if not news:
+            return None
+        return self.formatter.format_daily_digest(news)
+
+    def plan(self, users: Dict[str, Dict]) -> List[DigestGroup]:
+        """Группирует пользователей и готовит текст для каждой группы"""
+        groups: Dict[Tuple[str, ...], List[str]] = {}
+        for user_id, user_info in users.items():
+            topics = self.normalize_topics(user_info.get('topics', []))
+            if topics:
+                groups.setdefault(topics, []).append(user_id)
+
+        plan = [DigestGroup(topics, self.render(topics), user_ids) for topics, user_ids in groups.items()]
+
+        users_count = sum(len(group.user_ids) for group in plan)
+        if users_count:
+            rendered = sum(1 for group in plan if group.text is not None)
+            reused = users_count - len(plan)
+            logger.info(
+                f"План дайджеста: пользователей {users_count}, уникальных наборов тем {len(plan)}, "
+                f"отрисовано {rendered}, переиспользовано {reused} ({reused / users_count:.0%})"
+            )
+        return plan
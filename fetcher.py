@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Процесс сбора новостей
+Периодически загружает RSS-каналы и обновляет общую базу новостей.
+Боты, запущенные с INGEST_MODE=external, только читают базу и подхватывают
+изменения по версии хранилища.
+
+Запуск:
+    python fetcher.py [--once]
+"""
+
+import argparse
+import signal
+import sys
+import threading
+import time
+
+from config.settings import Settings
+from models import NewsAggregator
+from utils import setup_logging, get_logger
+
+# Настройка логирования
+setup_logging()
+logger = get_logger(__name__)
+
+
+class NewsFetcher:
+    """Долгоживущий процесс обновления базы новостей"""
+    
+    def __init__(self, interval: int = None):
+        self.interval = interval or Settings.NEWS_UPDATE_INTERVAL
+        self.news_aggregator = NewsAggregator()
+        self._stop_event = threading.Event()
+    
+    def run_once(self) -> None:
+        """Выполняет один цикл сбора новостей"""
+        started = time.monotonic()
+        try:
+            logger.info("Запуск обновления новостей...")
+            self.news_aggregator.update_news_database()
+            logger.info(f"Новости успешно обновлены за {time.monotonic() - started:.1f} с")
+            health = self.news_aggregator.source_health.get_stats()
+            if health['unhealthy']:
+                logger.info(f"Сбойных источников: {health['unhealthy']}")
+        except Exception as e:
+            logger.error(f"Ошибка обновления новостей: {e}")
+    
+    def run(self) -> None:
+        """Обновляет базу с заданным интервалом до остановки"""
+        if self.news_aggregator.source_scheduler is not None:
+            logger.info("Сборщик новостей запущен, адаптивный опрос источников")
+        else:
+            logger.info(f"Сборщик новостей запущен, интервал {self.interval} секунд")
+        while not self._stop_event.is_set():
+            self.run_once()
+            self._stop_event.wait(self._next_wait())
+        logger.info("Сборщик новостей остановлен")
+    
+    def _next_wait(self) -> float:
+        """Время до следующего цикла: при адаптивном опросе — до ближайшего источника"""
+        source_scheduler = self.news_aggregator.source_scheduler
+        if source_scheduler is None:
+            return self.interval
+        return max(1.0, source_scheduler.next_due_in())
+    
+    def stop(self, *args) -> None:
+        """Останавливает сборщик после текущего цикла"""
+        self._stop_event.set()
+    
+    def close(self) -> None:
+        """Освобождает ресурсы"""
+        self.news_aggregator.close()
+
+
+def main():
+    """Основная функция"""
+    parser = argparse.ArgumentParser(description='Сборщик новостей для Telegram-бота')
+    parser.add_argument('--once', action='store_true', help='выполнить один цикл и завершиться')
+    args = parser.parse_args()
+    
+    try:
+        Settings.validate(require_token=False)
+        fetcher = NewsFetcher()
+    except Exception as e:
+        logger.error(f"Ошибка инициализации сборщика: {e}")
+        sys.exit(1)
+    
+    signal.signal(signal.SIGTERM, fetcher.stop)
+    signal.signal(signal.SIGINT, fetcher.stop)
+    
+    try:
+        if args.once:
+            fetcher.run_once()
+        else:
+            fetcher.run()
+    finally:
+        fetcher.close()
+
+
+if __name__ == '__main__':
+    main()
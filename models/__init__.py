@@ -4,5 +4,22 @@
 
 from .news_aggregator import NewsAggregator
 from .user_manager import UserManager
+from .user_journal import UserJournal
+from .feed_cache import FeedCache
+from .source_scheduler import SourceScheduler
+from .source_health import SourceHealth
+from .news_item import NewsItem
+from .news_store import NewsStore
+from .search_index import SearchIndex
+from .dedup import NearDuplicateIndex
+from .topic_classifier import TopicClassifier, Classification
+from .news_storage import (
+    NewsStorage, JsonNewsStorage, SqliteNewsStorage, NdjsonNewsStorage, PartitionedNewsStorage, create_news_storage
+)
 
-__all__ = ['NewsAggregator', 'UserManager']
+__all__ = [
+    'NewsAggregator', 'UserManager', 'UserJournal', 'FeedCache', 'SourceScheduler', 'SourceHealth',
+    'NewsItem', 'NewsStore', 'SearchIndex', 'NearDuplicateIndex', 'TopicClassifier', 'Classification',
+    'NewsStorage', 'JsonNewsStorage', 'SqliteNewsStorage', 'NdjsonNewsStorage', 'PartitionedNewsStorage',
+    'create_news_storage'
+]
@@ -0,0 +1,100 @@
+"""
+Кэш валидаторов RSS-каналов для условных HTTP-запросов
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+from typing import Dict, Optional
+
+from config.settings import Settings
+from utils.file_utils import atomic_write_json
+
+logger = logging.getLogger(__name__)
+
+
+class FeedCache:
+    """Хранит ETag, Last-Modified и хэш содержимого каждого источника"""
+
+    def __init__(self, cache_path: str = None):
+        self.cache_path = cache_path or Settings.FEED_CACHE_PATH
+        self.entries: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+        self._dirty = False
+        self.cycle_stats = {'hits': 0, 'misses': 0}
+        self.load()
+
+    def load(self) -> None:
+        """Загружает кэш из файла"""
+        try:
+            if os.path.exists(self.cache_path):
+                with open(self.cache_path, 'r', encoding='utf-8') as f:
+                    self.entries = json.load(f)
+        except Exception as e:
+            logger.error(f"Ошибка загрузки кэша RSS: {e}")
+            self.entries = {}
+
+    def save(self) -> None:
+        """Сохраняет кэш в файл, если он изменился"""
+        with self._lock:
+            if not self._dirty:
+                return
+            snapshot = {url: dict(entry) for url, entry in self.entries.items()}
+            self._dirty = False
+        try:
+            atomic_write_json(self.cache_path, snapshot)
+        except Exception as e:
+            logger.error(f"Ошибка сохранения кэша RSS: {e}")
+
+    def start_cycle(self) -> None:
+        """Сбрасывает счётчики текущего цикла сбора"""
+        with self._lock:
+            self.cycle_stats = {'hits': 0, 'misses': 0}
+
+    @staticmethod
+    def content_hash(content: bytes) -> str:
+        """Вычисляет хэш тела ответа"""
+        return hashlib.sha256(content).hexdigest()
+
+    def conditional_headers(self, url: str) -> Dict[str, str]:
+        """Возвращает заголовки условного запроса для источника"""
+        with self._lock:
+            entry = self.entries.get(url, {})
+            headers = {}
+            if entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                headers['If-Modified-Since'] = entry['last_modified']
+            return headers
+
+    def is_unchanged(self, url: str, content_hash: str) -> bool:
+        """Проверяет, совпадает ли хэш содержимого с сохранённым"""
+        with self._lock:
+            return self.entries.get(url, {}).get('content_hash') == content_hash
+
+    def update(self, url: str, etag: Optional[str], last_modified: Optional[str], content_hash: str) -> None:
+        """Запоминает валидаторы успешно обработанного ответа"""
+        with self._lock:
+            entry = self.entries.setdefault(url, {'hits': 0, 'misses': 0})
+            entry['etag'] = etag
+            entry['last_modified'] = last_modified
+            entry['content_hash'] = content_hash
+            self._dirty = True
+
+    def record_hit(self, url: str) -> Dict:
+        """Учитывает попадание в кэш (источник не изменился)"""
+        return self._record(url, 'hits')
+
+    def record_miss(self, url: str) -> Dict:
+        """Учитывает промах кэша (источник изменился)"""
+        return self._record(url, 'misses')
+
+    def _record(self, url: str, counter: str) -> Dict:
+        with self._lock:
+            entry = self.entries.setdefault(url, {'hits': 0, 'misses': 0})
+            entry[counter] = entry.get(counter, 0) + 1
+            self.cycle_stats[counter] += 1
+            self._dirty = True
+            return {'hits': entry.get('hits', 0), 'misses': entry.get('misses', 0)}
@@ -2,222 +2,515 @@
 Модель для сбора и обработки новостей
 """
 
-import json
 import logging
-import os
+import threading
 import time
-from typing import Dict, List, Optional
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeoutError, as_completed
+from typing import Dict, List, NamedTuple, Optional, Tuple
 from urllib.parse import urlparse
 
 import feedparser
-import requests
-from bs4 import BeautifulSoup
 
 from config.settings import Settings
+from utils.bloom_filter import BloomFilter
+from utils.http_client import HttpClient
+from utils.text_extractor import TextExtractor
+from .dedup import NearDuplicateIndex
+from .feed_cache import FeedCache
+from .news_storage import NewsStorage, create_news_storage
+from .news_id import make_news_id
+from .news_item import NewsItem, to_epoch
+from .news_store import NewsStore
+from .search_index import SearchIndex
+from .source_health import SourceHealth
+from .source_scheduler import SourceScheduler
+from .topic_classifier import TopicClassifier
 
 logger = logging.getLogger(__name__)
 
 
+class _FetchResult(NamedTuple):
+    """Результат загрузки источника.
+
+    validators — валидаторы нового содержимого канала (None, если канал
+    не изменился), error — описание ошибки загрузки или разбора.
+    """
+    news: List[NewsItem]
+    validators: Optional[Dict] = None
+    error: Optional[str] = None
+
+
 class NewsAggregator:
     """Класс для сбора и обработки новостей из RSS-каналов"""
 
-    def __init__(self):
+    # Сколько ID отфильтрованных записей помнить между циклами
+    FILTERED_IDS_LIMIT = 50000
+
+    def __init__(self, storage: Optional[NewsStorage] = None):
         self.sources = Settings.SOURCES
         self.filter_keywords = Settings.FILTER_KEYWORDS
-        self.database_path = Settings.DATABASE_PATH
+        self.storage = storage or create_news_storage()
         self.max_news_count = Settings.MAX_NEWS_COUNT
+        self.max_workers = max(1, Settings.FETCH_MAX_WORKERS)
+        self.timeout = (Settings.FETCH_CONNECT_TIMEOUT, Settings.FETCH_READ_TIMEOUT)
+        self.cycle_deadline = Settings.FETCH_CYCLE_DEADLINE
+        self.http_client = HttpClient(timeout=self.timeout)
+        self.feed_cache = FeedCache()
+        self.source_health = SourceHealth()
+        self.source_scheduler: Optional[SourceScheduler] = (
+            SourceScheduler(self.sources) if Settings.ADAPTIVE_POLLING else None)
+        self._store: Optional[NewsStore] = None
+        self._store_lock = threading.Lock()
+        self._storage_version: Optional[str] = None
+        self.search_index = SearchIndex()
+        # ID, обработанные в текущем цикле сбора, и ID отброшенных фильтром записей
+        self._cycle_lock = threading.Lock()
+        self._cycle_ids = set()
+        self._filtered_ids = set()
+        # ID записей, которых нет в базе, но которые уже обработаны (вытесненные
+        # и почти дубликаты): ленты ещё показывают их, но добавлять их снова не нужно
+        self.seen_ids = BloomFilter.load(
+            Settings.SEEN_FILTER_PATH, Settings.SEEN_FILTER_CAPACITY, Settings.SEEN_FILTER_ERROR_RATE)
+        self.entry_stats = {'skipped': 0, 'processed': 0, 'filtered': 0}
+        # Индекс сигнатур строится при первом обновлении базы: читающим процессам он не нужен
+        self.dedup_index: Optional[NearDuplicateIndex] = self._create_dedup_index()
+        self._dedup_ready = False
+        self.classifier = TopicClassifier(filter_keywords=self.filter_keywords)
+        self.text_extractor = TextExtractor()
+
+    @property
+    def store(self) -> NewsStore:
+        """Текущий снимок базы новостей (при первом обращении читается с диска)"""
+        store = self._store
+        if store is None:
+            with self._store_lock:
+                if self._store is None:
+                    # Версия читается до данных: запись между ними лишь вызовет повторное чтение
+                    self._storage_version = self.storage.version()
+                    self._store = NewsStore(self.load_news_data())
+                    self.search_index.rebuild(self._store.items)
+                store = self._store
+        return store
+
+    def _publish_store(self, store: NewsStore) -> NewsStore:
+        """Атомарно подменяет текущий снимок новым"""
+        with self._store_lock:
+            self._store = store
+            return store
+
+    def refresh_from_storage(self) -> bool:
+        """Перечитывает базу, если её обновил другой процесс.
+
+        Используется, когда сбор новостей выполняет отдельный процесс
+        (fetcher.py): проверка версии хранилища дешёвая, а полное чтение
+        и перестройка индекса выполняются только при изменениях.
+        """
+        if self._store is None:
+            # Первое обращение к снимку само загружает базу
+            logger.info(f"База новостей загружена из хранилища. Всего новостей: {len(self.store)}")
+            return True
+
+        version = self.storage.version()
+        if version == self._storage_version:
+            return False
 
-    def load_news_data(self) -> List[Dict]:
-        """Загружает новости из файла"""
         try:
-            if os.path.exists(self.database_path):
-                with open(self.database_path, 'r', encoding='utf-8') as f:
-                    return json.load(f)
+            news_data = self.load_news_data()
         except Exception as e:
-            logger.error(f"Ошибка загрузки новостей: {e}")
-        return []
+            logger.error(f"Ошибка чтения базы новостей из хранилища: {e}")
+            return False
+        if not news_data and len(self._store):
+            # Загрузчики хранилищ при ошибке чтения (файл заменён во время чтения,
+            # повреждён) возвращают пустой список: оставляем прежний снимок
+            # и не запоминаем версию, чтобы перечитать базу при следующей проверке
+            logger.warning(f"Хранилище вернуло пустую базу, оставлен прежний снимок из {len(self._store)} новостей")
+            return False
 
-    def save_news_data(self, data: List[Dict]) -> None:
-        """Сохраняет новости в файл"""
-        try:
-            os.makedirs(os.path.dirname(self.database_path), exist_ok=True)
-            with open(self.database_path, 'w', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
-        except Exception as e:
-            logger.error(f"Ошибка сохранения новостей: {e}")
+        self.search_index.rebuild(news_data)
+        store = self._publish_store(NewsStore(news_data, self._store.version + 1))
+        self._storage_version = version
+        logger.info(f"База новостей перечитана из хранилища. Всего новостей: {len(store)}, версия: {store.version}")
+        return True
+
+    def load_news_data(self) -> List[NewsItem]:
+        """Загружает из хранилища max_news_count самых свежих новостей"""
+        return [NewsItem.from_dict(news) for news in self.storage.load_recent(self.max_news_count)]
+
+    def _download_feed(self, url: str) -> Optional[Tuple[bytes, Dict]]:
+        """Загружает RSS-канал условным запросом.
+
+        Возвращает None, если канал не изменился с прошлой загрузки
+        (ответ 304 или тот же хэш содержимого), иначе тело ответа и его валидаторы.
+        """
+        response = self.http_client.get(url, headers=self.feed_cache.conditional_headers(url))
+
+        if response.status_code == 304:
+            stats = self.feed_cache.record_hit(url)
+            logger.info(f"Источник не изменился (304): {url}, кэш: {stats}")
+            return None
+
+        response.raise_for_status()
+        content = response.content
+        content_hash = self.feed_cache.content_hash(content)
+
+        if self.feed_cache.is_unchanged(url, content_hash):
+            stats = self.feed_cache.record_hit(url)
+            logger.info(f"Источник не изменился (хэш): {url}, кэш: {stats}")
+            return None
+
+        stats = self.feed_cache.record_miss(url)
+        logger.info(f"Источник обновился: {url}, кэш: {stats}")
+        validators = {
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified'),
+            'content_hash': content_hash
+        }
+        return content, validators
 
-    def fetch_news_from_rss(self, url: str) -> List[Dict]:
+    def fetch_news_from_rss(self, url: str) -> List[NewsItem]:
         """Получает новости из RSS-канала"""
+        result = self._fetch_source(url)
+        self._apply_fetch_result(url, result)
+        return result.news
+
+    def _apply_fetch_result(self, url: str, result: _FetchResult) -> None:
+        """Запоминает валидаторы канала и учитывает успех или ошибку источника"""
+        if result.error is not None:
+            self.source_health.record_failure(url, result.error)
+            return
+        if result.validators is not None:
+            self.feed_cache.update(url, **result.validators)
+        self.source_health.record_success(url)
+
+    def _fetch_source(self, url: str) -> _FetchResult:
+        """Загружает и разбирает RSS-канал.
+
+        Кэш валидаторов и состояние источника не меняются: их обновляет
+        вызывающий, только если результат действительно использован
+        (загрузка, не уложившаяся в дедлайн цикла, отбрасывается).
+        """
         news_list = []
         try:
-            feed = feedparser.parse(url)
+            downloaded = self._download_feed(url)
+            if downloaded is None:
+                return _FetchResult(news_list)
+
+            content, validators = downloaded
+            feed = feedparser.parse(content)
             if feed.bozo:
                 logger.warning(f"Проблемы с парсингом RSS: {url}")
-                return news_list
+                return _FetchResult(news_list, error=f"RSS не разобран: {feed.get('bozo_exception')}")
 
+            netloc = urlparse(url).netloc
+            known_ids = self.store.by_id
+            skipped = processed = filtered = 0
+            pending = []
             for entry in feed.entries:
                 try:
-                    # Извлекаем текст из описания
-                    description = self._extract_description(entry)
+                    # Дешёвая проверка до разбора HTML и классификации: большинство
+                    # записей в ленте уже есть в базе или встречались в этом цикле
+                    news_id = self._make_news_id(netloc, entry)
+                    if news_id in known_ids or news_id in self.seen_ids or not self._claim_news_id(news_id):
+                        skipped += 1
+                        continue
+                    pending.append((news_id, entry))
+                except ValueError as e:
+                    # Запись без ссылки, guid и заголовка не отличить от других
+                    logger.warning(f"Запись RSS пропущена: {e}")
+                except Exception as e:
+                    logger.error(f"Ошибка обработки новости: {e}")
 
-                    # Определяем тему на основе заголовка и описания
-                    topic = self._detect_topic(entry.title, description)
+            # Извлекаем текст описаний одной пачкой (большую — в пуле процессов)
+            descriptions = self.text_extractor.extract_many(
+                [self._raw_description(entry) for _, entry in pending])
 
-                    # Проверяем фильтры
-                    if self._should_filter(entry.title, description):
-                        continue
+            for (news_id, entry), description in zip(pending, descriptions):
+                try:
+                    processed += 1
 
-                    news_item = {
-                        'id': f"{urlparse(url).netloc}_{hash(entry.link)}",
-                        'title': entry.title,
-                        'link': entry.link,
-                        'description': description[:500] + "..." if len(description) > 500 else description,
-                        'source': urlparse(url).netloc,
-                        'topic': topic,
-                        'published': entry.get('published_parsed', time.gmtime()),
-                        'timestamp': time.time()
-                    }
+                    # Определяем тему и проверяем фильтры за один проход
+                    classification = self.classifier.classify(entry.title, description)
+                    if classification.filtered:
+                        self._remember_filtered(news_id)
+                        filtered += 1
+                        continue
+                    topic = classification.topic
+
+                    now = time.time()
+                    published = to_epoch(entry.get('published_parsed'))
+                    news_item = NewsItem(
+                        id=news_id,
+                        title=entry.title,
+                        link=entry.get('link', ''),
+                        description=description[:500] + "..." if len(description) > 500 else description,
+                        source=netloc,
+                        feed=url,
+                        topic=topic,
+                        published=now if published is None else published,
+                        timestamp=now
+                    )
                     news_list.append(news_item)
 
                 except Exception as e:
                     logger.error(f"Ошибка обработки новости: {e}")
                     continue
 
-        except Exception as e:
-            logger.error(f"Ошибка получения RSS: {url}, {e}")
-
-        return news_list
+            self._count_entries(skipped, processed, filtered)
 
-    def _extract_description(self, entry) -> str:
-        """Извлекает описание из записи RSS"""
-        description = ""
+            # Валидаторы возвращаем только после успешного разбора канала
+            return _FetchResult(news_list, validators)
 
+        except Exception as e:
+            logger.error(f"Ошибка получения RSS: {url}, {e}")
+            return _FetchResult(news_list, error=str(e))
+
+    @staticmethod
+    def _make_news_id(netloc: str, entry) -> str:
+        """Формирует стабильный ID новости по ссылке (или guid, или заголовку) записи RSS"""
+        return make_news_id(netloc, entry.get('link'), entry.get('id'),
+                            entry.get('title'), to_epoch(entry.get('published_parsed')))
+
+    def _claim_news_id(self, news_id: str) -> bool:
+        """Отмечает ID как обработанный в текущем цикле.
+
+        Возвращает False, если запись уже обработана в этом цикле (одна и та же
+        новость в нескольких лентах) или ранее отброшена фильтром.
+        """
+        with self._cycle_lock:
+            if news_id in self._cycle_ids or news_id in self._filtered_ids:
+                return False
+            self._cycle_ids.add(news_id)
+            return True
+
+    def _remember_filtered(self, news_id: str) -> None:
+        """Запоминает ID отфильтрованной записи, чтобы не классифицировать её снова"""
+        with self._cycle_lock:
+            if len(self._filtered_ids) >= self.FILTERED_IDS_LIMIT:
+                self._filtered_ids.clear()
+            self._filtered_ids.add(news_id)
+
+    def _count_entries(self, skipped: int, processed: int, filtered: int) -> None:
+        with self._cycle_lock:
+            self.entry_stats['skipped'] += skipped
+            self.entry_stats['processed'] += processed
+            self.entry_stats['filtered'] += filtered
+
+    @staticmethod
+    def _raw_description(entry) -> str:
+        """Возвращает HTML описания записи RSS"""
         if hasattr(entry, 'summary'):
-            soup = BeautifulSoup(entry.summary, 'html.parser')
-            description = soup.get_text().strip()
-        elif hasattr(entry, 'description'):
-            soup = BeautifulSoup(entry.description, 'html.parser')
-            description = soup.get_text().strip()
-
-        return description
-
-    def _detect_topic(self, title: str, description: str) -> str:
-        """Определяет тему новости на основе заголовка и описания"""
-        text = f"{title} {description}".lower()
-
-        topics = {
-            'экономика': [
-                'экономика', 'экономический', 'экономист', 'экономические', 'экономике',
-                'economy', 'economic', 'economics', 'economist', 'macroeconomics', 'microeconomics', 'growth', 'gdp', 'inflation', 'recession'
-            ],
-
-            'финансы': [
-                'финансы', 'финансовый', 'финансовые', 'банк', 'банки', 'кредит', 'деньги',
-                'finance', 'financial', 'bank', 'banks', 'credit', 'money', 'loan', 'monetary', 'cash', 'budget', 'liquidity', 'debt', 'funding'
-            ],
-
-            'рынки': [
-                'рынок', 'рынки', 'торговля', 'торговый', 'акции', 'облигации', 'индекс',
-                'market', 'markets', 'trade', 'trading', 'stocks', 'shares', 'bonds', 'index', 'indices', 'commodities', 'forex', 'exchange', 'derivatives'
-            ],
-
-            'технологии': [
-                'технология', 'технологии', 'технологический', 'инновации', 'стартап',
-                'technology', 'technologies', 'tech', 'innovation', 'innovations', 'startup', 'startups', 'ai', 'artificial intelligence', 'machine learning', 'blockchain', 'fintech', 'digital', 'automation', 'software'
-            ],
-
-            'инвестиции': [
-                'инвестиции', 'инвестиционный', 'инвестор', 'капитал', 'портфель',
-                'investment', 'investments', 'investor', 'investors', 'capital', 'portfolio', 'venture', 'fund', 'funds', 'asset', 'equity', 'returns', 'valuation', 'securities'
-            ]
-        }
-
-        for topic, keywords in topics.items():
-            if any(keyword in text for keyword in keywords):
-                return topic
-
-        return 'общее'
-
-    def _should_filter(self, title: str, description: str) -> bool:
-        """Проверяет, нужно ли фильтровать новость"""
-        if not self.filter_keywords:
-            return False
-
-        text = f"{title} {description}".lower()
-        return any(keyword in text for keyword in self.filter_keywords)
-
-    def collect_news(self) -> List[Dict]:
-        """Собирает новости из всех источников"""
-        all_news = []
-
-        for source in self.sources:
-            logger.info(f"Сбор новостей из: {source}")
-            news = self.fetch_news_from_rss(source)
-            all_news.extend(news)
-            logger.info(f"Получено {len(news)} новостей из {source}")
-
-        # Удаляем дубликаты
-        seen_ids = set()
-        unique_news = []
-        for news in all_news:
-            if news['id'] not in seen_ids:
-                seen_ids.add(news['id'])
-                unique_news.append(news)
-
-        return unique_news
+            return entry.summary
+        return entry.get('description', '')
+
+    @staticmethod
+    def _create_dedup_index() -> Optional[NearDuplicateIndex]:
+        if not Settings.NEAR_DUPLICATE_DETECTION:
+            return None
+        return NearDuplicateIndex(Settings.NEAR_DUPLICATE_THRESHOLD, Settings.NEAR_DUPLICATE_WINDOW)
+
+    @staticmethod
+    def _with_alt_source(canonical: NewsItem, duplicate: NewsItem) -> NewsItem:
+        """Возвращает копию новости с лентой дубликата в alt_sources.
+
+        Хранится URL ленты, а не хост: у одного издания бывает несколько лент
+        на общем хосте.
+        """
+        alt_source = duplicate.feed or duplicate.source
+        if alt_source == (canonical.feed or canonical.source) or alt_source in canonical.alt_sources:
+            return canonical
+        return canonical.replace(alt_sources=canonical.alt_sources + (alt_source,))
+
+    def _collect_by_source(self, sources: List[str]) -> Dict[str, List[NewsItem]]:
+        """Загружает источники параллельно, возвращает новости по каждому.
+
+        Источники с ошибкой загрузки, не уложившиеся в дедлайн цикла и
+        отключённые выключателем в результат не попадают.
+        """
+        # Источники с разомкнутым выключателем пропускаем до конца паузы
+        allowed = self.source_health.filter_allowed(sources)
+        if len(allowed) < len(sources):
+            logger.info(f"Пропущено отключённых источников: {len(sources) - len(allowed)}")
+        sources = allowed
+        logger.info(f"Сбор новостей из {len(sources)} источников, потоков: {self.max_workers}")
+        started = time.monotonic()
+        results = {}
+        self.feed_cache.start_cycle()
+        with self._cycle_lock:
+            self._cycle_ids = set()
+            self.entry_stats = {'skipped': 0, 'processed': 0, 'filtered': 0}
+
+        executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='rss-fetch')
+        futures = {executor.submit(self._fetch_source, source): source for source in sources}
+        try:
+            for future in as_completed(futures, timeout=self.cycle_deadline):
+                source = futures[future]
+                # Кэш и состояние источника обновляются здесь, а не в потоке загрузки:
+                # опоздавшая загрузка не должна сохранить валидаторы отброшенных новостей
+                result = future.result()
+                self._apply_fetch_result(source, result)
+                if result.error is not None:
+                    continue
+                results[source] = result.news
+                logger.info(f"Получено {len(results[source])} новостей из {source}")
+        except FuturesTimeoutError:
+            pending = [source for future, source in futures.items() if not future.done()]
+            logger.warning(
+                f"Превышен дедлайн цикла сбора ({self.cycle_deadline} с), "
+                f"пропущено источников: {len(pending)}: {', '.join(pending)}"
+            )
+            for source in pending:
+                self.source_health.record_failure(source, "превышен дедлайн цикла сбора")
+        finally:
+            # Не ждём зависшие загрузки: их ограничивает таймаут чтения
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        self.feed_cache.save()
+        self.source_health.save()
+        logger.info(
+            f"Сбор новостей завершён за {time.monotonic() - started:.1f} с, "
+            f"кэш RSS: попаданий {self.feed_cache.cycle_stats['hits']}, "
+            f"промахов {self.feed_cache.cycle_stats['misses']}; "
+            f"записей пропущено (уже известны) {self.entry_stats['skipped']}, "
+            f"обработано {self.entry_stats['processed']}, "
+            f"отфильтровано {self.entry_stats['filtered']}"
+        )
+
+        # Сохраняем порядок источников, чтобы дедупликация была детерминированной
+        return {source: results[source] for source in sources if source in results}
+
+    def has_due_sources(self) -> bool:
+        """Проверяет, есть ли источники, которые пора опросить"""
+        return self.source_scheduler is None or bool(self.source_scheduler.due_sources())
 
     def update_news_database(self) -> None:
-        """Обновляет базу данных новостей"""
-        # Загружаем существующие новости
-        news_data = self.load_news_data()
+        """Обновляет базу данных новостей.
+
+        При адаптивном опросе загружаются только источники, которым пора
+        обновиться; если таких нет, метод ничего не делает.
+        """
+        sources = self.sources
+        if self.source_scheduler is not None:
+            sources = self.source_scheduler.due_sources()
+            if not sources:
+                logger.debug(f"Нет источников для опроса, ближайший через "
+                             f"{self.source_scheduler.next_due_in():.0f} с")
+                return
+
+        # Берём существующие новости из резидентного снимка
+        current = self.store
 
         # Собираем новые новости
-        new_news = self.collect_news()
-
-        # Добавляем новые новости
-        existing_ids = {news['id'] for news in news_data}
-        for news in new_news:
-            if news['id'] not in existing_ids:
-                news_data.append(news)
-
-        # Сортируем по времени публикации (новые сначала)
-        news_data.sort(key=lambda x: x['timestamp'], reverse=True)
-
-        # Ограничиваем количество новостей
-        if len(news_data) > self.max_news_count:
-            news_data = news_data[:self.max_news_count]
-
-        # Сохраняем обновленные данные
-        self.save_news_data(news_data)
-        logger.info(f"База данных обновлена. Всего новостей: {len(news_data)}")
+        results = self._collect_by_source(sources)
+
+        if self.dedup_index is not None and not self._dedup_ready:
+            self.dedup_index.rebuild(current.items)
+            self._dedup_ready = True
+
+        # Добавляем новые новости: точные дубликаты между источниками отбрасываем,
+        # почти одинаковые из других лент добавляют свою ленту в alt_sources первой новости
+        cycle_ids = set()
+        added: Dict[str, NewsItem] = {}
+        updated: Dict[str, NewsItem] = {}
+        duplicates = 0
+        for source, news_list in results.items():
+            source_new = [news for news in news_list
+                          if news.id not in current.by_id and news.id not in cycle_ids]
+            for news in source_new:
+                cycle_ids.add(news.id)
+                canonical_id = None
+                if self.dedup_index is not None:
+                    signature = self.dedup_index.signature(news)
+                    if signature is not None:
+                        canonical_id = self.dedup_index.find(news, signature)
+                        if canonical_id is None:
+                            self.dedup_index.add(news, signature)
+                if canonical_id is None:
+                    added[news.id] = news
+                    continue
 
-    def get_news_by_topics(self, topics: List[str], limit: int = None, page: int = 1) -> List[Dict]:
+                duplicates += 1
+                self.seen_ids.add(news.id)
+                if canonical_id in added:
+                    added[canonical_id] = self._with_alt_source(added[canonical_id], news)
+                    continue
+                canonical = updated.get(canonical_id) or current.by_id[canonical_id]
+                merged = self._with_alt_source(canonical, news)
+                if merged is not canonical:
+                    updated[canonical_id] = merged
+            if self.source_scheduler is not None:
+                interval = self.source_scheduler.record(source, len(source_new))
+                logger.info(f"Новых записей {len(source_new)} из {source}, следующий опрос через {interval:.0f} с")
+        if self.source_scheduler is not None:
+            # Неудачный опрос не означает, что новых записей нет: частоту по нему
+            # не оцениваем, а повторяем через прежний интервал
+            for source in sources:
+                if source not in results:
+                    interval = self.source_scheduler.postpone(source)
+                    logger.info(f"Опрос не удался: {source}, повтор через {interval:.0f} с")
+            self.source_scheduler.save()
+        if duplicates:
+            logger.info(f"Объединено почти одинаковых новостей: {duplicates}")
+
+        added_news = list(added.values())
+        if not added_news and not updated and len(current) <= self.max_news_count:
+            logger.info(f"Новых новостей нет. Всего новостей: {len(current)}, версия: {current.version}")
+            return
+
+        # Вливаем изменения в упорядоченный снимок и отрезаем хвост сверх лимита
+        store, evicted_news = current.merged(added_news, updated.values(), self.max_news_count)
+
+        # Инкрементально обновляем поисковый индекс
+        self.search_index.add_many(added_news)
+        for news in evicted_news:
+            self.search_index.remove(news.id)
+            if self.dedup_index is not None:
+                self.dedup_index.remove(news.id)
+            self.seen_ids.add(news.id)
+        if self.seen_ids.dirty:
+            try:
+                self.seen_ids.save(Settings.SEEN_FILTER_PATH)
+            except Exception as e:
+                logger.error(f"Ошибка сохранения фильтра обработанных новостей: {e}")
+
+        # Записываем в хранилище только изменения и публикуем новый снимок
+        self.storage.append_news([news.to_dict() for news in added_news + list(updated.values())],
+                                 self.max_news_count,
+                                 evicted_ids=[news.id for news in evicted_news])
+        self._storage_version = self.storage.version()
+        self._publish_store(store)
+        logger.info(f"База данных обновлена. Всего новостей: {len(store)}, версия: {store.version}")
+
+    def close(self) -> None:
+        """Закрывает соединения HTTP-клиента и хранилища, пул разбора HTML"""
+        self.http_client.close()
+        self.text_extractor.close()
+        self.storage.close()
+
+    def get_news_count(self) -> int:
+        """Возвращает количество новостей в базе"""
+        return len(self.store)
+
+    def count_news_by_topics(self, topics: List[str]) -> int:
+        """Возвращает количество новостей по заданным темам"""
+        return self.store.count_by_topics(topics)
+
+    def get_news_by_topics(self, topics: List[str], limit: int = None, page: int = 1) -> List[NewsItem]:
         """Получает новости по заданным темам"""
-        news_data = self.load_news_data()
-        filtered_news = [news for news in news_data if news['topic'] in topics]
-
         if limit and page:
-            return filtered_news[(page-1)*limit:(page)*limit]
-        return filtered_news
-
-    def search_news(self, query: str, topics: List[str] = None) -> List[Dict]:
-        """Ищет новости по запросу"""
-        news_data = self.load_news_data()
-
-        # Ищем по запросу
-        query_lower = query.lower()
-        results = []
+            return self.store.get_by_topics(topics, limit, (page - 1) * limit)
+        return self.store.get_by_topics(topics)
 
-        for news in news_data:
-            if (query_lower in news['topic'].lower()):
-                results.append(news)
+    def search_news(self, query: str, topics: List[str] = None, limit: int = 10) -> List[NewsItem]:
+        """Ищет новости по запросу (BM25 по заголовку и описанию)"""
+        store = self.store
+        news_ids = self.search_index.search(query, topics, limit)
+        return [store.by_id[news_id] for news_id in news_ids if news_id in store.by_id]
 
-        return news_data
-
-    def get_news_by_id(self, news_id: str) -> Optional[Dict]:
+    def get_news_by_id(self, news_id: str) -> Optional[NewsItem]:
         """Получает новость по ID"""
-        news_data = self.load_news_data()
-        for news in news_data:
-            if news['id'] == news_id:
-                return news
-        return None
+        return self.store.get(news_id)
+
+    def get_news_by_ids(self, news_ids: List[str]) -> List[NewsItem]:
+        """Получает доступные новости по списку ID, сохраняя порядок"""
+        store = self.store
+        return [store.by_id[news_id] for news_id in news_ids if news_id in store.by_id]
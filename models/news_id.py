@@ -0,0 +1,46 @@
+"""
+Стабильные идентификаторы новостей
+"""
+
+import hashlib
+from typing import Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+# Параметры ссылок, которые не меняют статью (метки рекламных кампаний и т.п.)
+TRACKING_PARAMS = {'fbclid', 'gclid', 'yclid', 'mc_cid', 'mc_eid', 'cmpid', 'ncid', 'ref', 'src', 'mod'}
+
+
+def canonicalize_link(link: str) -> str:
+    """Приводит ссылку к каноническому виду.
+
+    Схема и хост в нижнем регистре, без фрагмента, без меток отслеживания
+    (utm_* и TRACKING_PARAMS), с отсортированными параметрами и без
+    завершающего слэша в пути.
+    """
+    parts = urlsplit(link.strip())
+    query = sorted(
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not key.lower().startswith('utm_') and key.lower() not in TRACKING_PARAMS
+    )
+    path = parts.path.rstrip('/') or '/'
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), path, urlencode(query), ''))
+
+
+def make_news_id(source: str, link: Optional[str], guid: Optional[str] = None,
+                 title: Optional[str] = None, published: Optional[float] = None) -> str:
+    """Формирует ID новости, одинаковый между перезапусками.
+
+    Основа — каноническая ссылка, при её отсутствии guid записи, а если нет
+    и его — заголовок вместе со временем публикации. Запись без ссылки,
+    guid и заголовка идентифицировать нельзя: вызывается ValueError.
+    """
+    if link:
+        key = canonicalize_link(link)
+    elif guid and guid.strip():
+        key = guid.strip()
+    elif title and title.strip():
+        key = title.strip() if published is None else f"{title.strip()}\n{published:.0f}"
+    else:
+        raise ValueError(f"У записи {source} нет ни ссылки, ни guid, ни заголовка")
+    digest = hashlib.sha1(key.encode('utf-8')).hexdigest()[:16]
+    return f"{source}_{digest}"
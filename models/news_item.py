@@ -0,0 +1,92 @@
+"""
+Модель новости
+"""
+
+import calendar
+import sys
+from dataclasses import asdict, dataclass, replace
+from typing import Any, Dict, Optional, Tuple
+
+
+def to_epoch(published: Any) -> Optional[float]:
+    """Переводит время публикации (struct_time, список из 9 полей или число) в секунды UTC"""
+    if published is None:
+        return None
+    if isinstance(published, (int, float)):
+        return float(published)
+    # feedparser отдаёт время в UTC, в JSON оно сохранялось списком полей struct_time
+    return float(calendar.timegm(tuple(published)))
+
+
+@dataclass(frozen=True, slots=True)
+class NewsItem:
+    """Новость в резидентной базе.
+
+    Слоты вместо словаря не хранят ключи в каждом экземпляре, источник,
+    лента и тема интернируются (одна строка на все новости источника), а время
+    публикации хранится числом вместо struct_time. Объект неизменяем:
+    снимки базы разделяют новости между потоками, изменения делаются через
+    replace(). Для совместимости с кодом, работающим со словарями,
+    поддерживаются news['поле'] и news.get('поле').
+    """
+
+    id: str
+    title: str
+    link: str
+    description: str
+    source: str
+    topic: str
+    published: float
+    timestamp: float
+    # URL RSS-ленты; у новостей, сохранённых до появления поля, пустой
+    feed: str = ''
+    alt_sources: Tuple[str, ...] = ()
+
+    def __post_init__(self):
+        object.__setattr__(self, 'source', sys.intern(self.source))
+        object.__setattr__(self, 'topic', sys.intern(self.topic))
+        object.__setattr__(self, 'feed', sys.intern(self.feed))
+        if self.alt_sources:
+            object.__setattr__(self, 'alt_sources', tuple(sys.intern(source) for source in self.alt_sources))
+
+    def __getitem__(self, key: str) -> Any:
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Возвращает поле по имени, как dict.get"""
+        return getattr(self, key, default)
+
+    def replace(self, **changes) -> 'NewsItem':
+        """Возвращает копию новости с изменёнными полями"""
+        return replace(self, **changes)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Преобразует новость в словарь для хранилища"""
+        data = asdict(self)
+        if not self.feed:
+            del data['feed']
+        if self.alt_sources:
+            data['alt_sources'] = list(self.alt_sources)
+        else:
+            del data['alt_sources']
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'NewsItem':
+        """Создаёт новость из словаря (в том числе в прежнем формате с published-списком)"""
+        published = to_epoch(data.get('published'))
+        return cls(
+            id=data['id'],
+            title=data['title'],
+            link=data.get('link', ''),
+            description=data.get('description', ''),
+            source=data['source'],
+            topic=data['topic'],
+            published=data['timestamp'] if published is None else published,
+            timestamp=data['timestamp'],
+            feed=data.get('feed', ''),
+            alt_sources=tuple(data.get('alt_sources', ()))
+        )
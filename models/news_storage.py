@@ -0,0 +1,784 @@
+"""
+Хранилища базы новостей
+"""
+
+import gzip
+import json
+import logging
+import mmap
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+from config.settings import Settings
+from utils.file_utils import atomic_write_bytes, atomic_write_json
+
+logger = logging.getLogger(__name__)
+
+
+class NewsStorage:
+    """Базовый интерфейс хранилища новостей"""
+
+    def load_all(self) -> List[Dict]:
+        """Загружает все новости (новые сначала)"""
+        raise NotImplementedError
+
+    def load_recent(self, limit: int) -> List[Dict]:
+        """Загружает limit самых свежих новостей (новые сначала)"""
+        return self.load_all()[:limit]
+
+    def save_all(self, news_list: List[Dict]) -> None:
+        """Полностью перезаписывает базу новостей"""
+        raise NotImplementedError
+
+    def append_news(self, news_list: List[Dict], max_count: int, evicted_ids: List[str] = None) -> None:
+        """Добавляет новости (заменяя записи с теми же ID) и оставляет только max_count самых свежих.
+
+        Если вызывающий уже знает вытесненные новости (evicted_ids), удаляются
+        только они, без поиска хвоста по всей базе.
+        """
+        raise NotImplementedError
+
+    def get_by_id(self, news_id: str) -> Optional[Dict]:
+        """Возвращает новость по ID"""
+        raise NotImplementedError
+
+    def get_by_topics(self, topics: List[str], limit: int = None, offset: int = 0) -> List[Dict]:
+        """Возвращает новости по темам (новые сначала)"""
+        raise NotImplementedError
+
+    def count(self) -> int:
+        """Возвращает количество новостей"""
+        raise NotImplementedError
+
+    def version(self) -> Optional[str]:
+        """Возвращает метку версии данных, меняющуюся при каждой записи.
+
+        Проверка должна быть дешёвой: по ней процессы, которые только читают
+        базу, узнают, что её пора перечитать.
+        """
+        raise NotImplementedError
+
+    def close(self) -> None:
+        """Освобождает ресурсы хранилища"""
+
+
+class JsonNewsStorage(NewsStorage):
+    """Хранилище новостей в одном JSON-файле"""
+
+    def __init__(self, path: str = None):
+        self.path = path or Settings.DATABASE_PATH
+
+    def load_all(self) -> List[Dict]:
+        try:
+            if os.path.exists(self.path):
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    return json.load(f)
+        except Exception as e:
+            logger.error(f"Ошибка загрузки новостей: {e}")
+        return []
+
+    def save_all(self, news_list: List[Dict]) -> None:
+        try:
+            # Атомарная запись: читающие процессы не увидят недописанный файл
+            atomic_write_json(self.path, news_list, indent=2)
+        except Exception as e:
+            logger.error(f"Ошибка сохранения новостей: {e}")
+
+    def append_news(self, news_list: List[Dict], max_count: int, evicted_ids: List[str] = None) -> None:
+        # Формат файла не позволяет дописывать записи, поэтому он перезаписывается целиком
+        updates = {news['id']: news for news in news_list}
+        evicted = set(evicted_ids or ())
+        news_data = [updates.pop(news['id'], news) for news in self.load_all() if news['id'] not in evicted]
+        news_data.extend(updates.values())
+        news_data.sort(key=lambda x: x['timestamp'], reverse=True)
+        self.save_all(news_data[:max_count])
+
+    def get_by_id(self, news_id: str) -> Optional[Dict]:
+        for news in self.load_all():
+            if news['id'] == news_id:
+                return news
+        return None
+
+    def get_by_topics(self, topics: List[str], limit: int = None, offset: int = 0) -> List[Dict]:
+        filtered_news = [news for news in self.load_all() if news['topic'] in topics]
+        stop = offset + limit if limit else None
+        return filtered_news[offset:stop]
+
+    def count(self) -> int:
+        return len(self.load_all())
+
+    def version(self) -> Optional[str]:
+        # Файл заменяется через rename, поэтому меняются inode и время изменения
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return f"{stat.st_ino}:{stat.st_mtime_ns}:{stat.st_size}"
+
+
+class SqliteNewsStorage(NewsStorage):
+    """Хранилище новостей в SQLite с индексами по ID, теме и источнику.
+
+    База работает в режиме WAL: чтение не блокируется записью при сборе
+    новостей. Каждый поток использует собственное соединение.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS news (
+            id TEXT PRIMARY KEY,
+            topic TEXT NOT NULL,
+            source TEXT NOT NULL,
+            timestamp REAL NOT NULL,
+            data TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_news_topic_timestamp ON news (topic, timestamp DESC);
+        CREATE INDEX IF NOT EXISTS idx_news_source ON news (source);
+        CREATE INDEX IF NOT EXISTS idx_news_timestamp ON news (timestamp DESC);
+        CREATE TABLE IF NOT EXISTS meta (
+            key TEXT PRIMARY KEY,
+            value INTEGER NOT NULL
+        );
+    """
+
+    BUMP_VERSION = (
+        "INSERT INTO meta (key, value) VALUES ('version', 1) "
+        "ON CONFLICT (key) DO UPDATE SET value = value + 1"
+    )
+
+    def __init__(self, path: str = None):
+        self.path = path or Settings.SQLITE_DATABASE_PATH
+        self._local = threading.local()
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._connection().executescript(self.SCHEMA)
+
+    def _connection(self) -> sqlite3.Connection:
+        """Возвращает соединение текущего потока"""
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=30)
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('PRAGMA synchronous=NORMAL')
+            self._local.connection = connection
+        return connection
+
+    @staticmethod
+    def _row(news: Dict) -> tuple:
+        return (
+            news['id'], news['topic'], news['source'], news['timestamp'],
+            json.dumps(news, ensure_ascii=False)
+        )
+
+    def load_all(self) -> List[Dict]:
+        try:
+            rows = self._connection().execute(
+                'SELECT data FROM news ORDER BY timestamp DESC').fetchall()
+            return [json.loads(data) for (data,) in rows]
+        except Exception as e:
+            logger.error(f"Ошибка загрузки новостей: {e}")
+            return []
+
+    def load_recent(self, limit: int) -> List[Dict]:
+        try:
+            rows = self._connection().execute(
+                'SELECT data FROM news ORDER BY timestamp DESC LIMIT ?', (limit,)).fetchall()
+            return [json.loads(data) for (data,) in rows]
+        except Exception as e:
+            logger.error(f"Ошибка загрузки новостей: {e}")
+            return []
+
+    def save_all(self, news_list: List[Dict]) -> None:
+        try:
+            with self._connection() as connection:
+                connection.execute('DELETE FROM news')
+                connection.executemany(
+                    'INSERT OR IGNORE INTO news (id, topic, source, timestamp, data) VALUES (?, ?, ?, ?, ?)',
+                    (self._row(news) for news in news_list)
+                )
+                connection.execute(self.BUMP_VERSION)
+        except Exception as e:
+            logger.error(f"Ошибка сохранения новостей: {e}")
+
+    def append_news(self, news_list: List[Dict], max_count: int, evicted_ids: List[str] = None) -> None:
+        try:
+            with self._connection() as connection:
+                connection.executemany(
+                    'INSERT OR REPLACE INTO news (id, topic, source, timestamp, data) VALUES (?, ?, ?, ?, ?)',
+                    (self._row(news) for news in news_list)
+                )
+                if evicted_ids is not None:
+                    # Удаление по первичному ключу: без обхода индекса по времени до хвоста
+                    connection.executemany('DELETE FROM news WHERE id = ?', ((news_id,) for news_id in evicted_ids))
+                else:
+                    # Ограничение по количеству: удаляем всё, что дальше max_count по свежести
+                    connection.execute(
+                        'DELETE FROM news WHERE id IN '
+                        '(SELECT id FROM news ORDER BY timestamp DESC LIMIT -1 OFFSET ?)',
+                        (max_count,)
+                    )
+                connection.execute(self.BUMP_VERSION)
+        except Exception as e:
+            logger.error(f"Ошибка сохранения новостей: {e}")
+
+    def get_by_id(self, news_id: str) -> Optional[Dict]:
+        row = self._connection().execute(
+            'SELECT data FROM news WHERE id = ?', (news_id,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def get_by_topics(self, topics: List[str], limit: int = None, offset: int = 0) -> List[Dict]:
+        topics = list(set(topics))
+        if not topics:
+            return []
+        placeholders = ', '.join('?' for _ in topics)
+        rows = self._connection().execute(
+            f'SELECT data FROM news WHERE topic IN ({placeholders}) '
+            f'ORDER BY timestamp DESC LIMIT ? OFFSET ?',
+            (*topics, limit if limit else -1, offset)
+        ).fetchall()
+        return [json.loads(data) for (data,) in rows]
+
+    def count(self) -> int:
+        return self._connection().execute('SELECT COUNT(*) FROM news').fetchone()[0]
+
+    def version(self) -> Optional[str]:
+        row = self._connection().execute(
+            "SELECT value FROM meta WHERE key = 'version'").fetchone()
+        return str(row[0]) if row else None
+
+    def close(self) -> None:
+        connection = getattr(self._local, 'connection', None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
+
+
+class PartitionedNewsStorage(NewsStorage):
+    """Хранилище новостей, разбитое на файлы по дням (или часам).
+
+    Новость попадает в партицию по времени добавления (UTC). Список
+    партиций с числом записей и границами времени хранится в небольшом
+    манифесте, поэтому свежие новости читаются только из последних
+    партиций, а запись затрагивает лишь партиции с изменениями. Хранение
+    ограничивается сроком: партиции старше retention_days удаляются
+    целиком, а остывшие (старше compress_after_days) сжимаются gzip.
+    """
+
+    MANIFEST = 'manifest.json'
+    KEY_FORMATS = {'day': '%Y-%m-%d', 'hour': '%Y-%m-%dT%H'}
+
+    def __init__(self, path: str = None, granularity: str = None,
+                 retention_days: float = None, compress_after_days: float = None):
+        self.path = path or Settings.NEWS_PARTITIONS_PATH
+        granularity = (granularity or Settings.NEWS_PARTITION_GRANULARITY).lower()
+        if granularity not in self.KEY_FORMATS:
+            raise ValueError(f"Неизвестная гранулярность партиций: {granularity}")
+        self.key_format = self.KEY_FORMATS[granularity]
+        self.retention_days = Settings.NEWS_RETENTION_DAYS if retention_days is None else retention_days
+        self.compress_after_days = (Settings.NEWS_PARTITION_COMPRESS_AFTER_DAYS
+                                    if compress_after_days is None else compress_after_days)
+        self.manifest_path = os.path.join(self.path, self.MANIFEST)
+        self._lock = threading.Lock()
+        os.makedirs(self.path, exist_ok=True)
+
+    def _partition_key(self, news: Dict) -> str:
+        return time.strftime(self.key_format, time.gmtime(news['timestamp']))
+
+    def _load_manifest(self) -> Dict[str, Dict]:
+        try:
+            if os.path.exists(self.manifest_path):
+                with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                    return json.load(f)['partitions']
+        except Exception as e:
+            logger.error(f"Ошибка загрузки манифеста партиций: {e}")
+        return {}
+
+    def _save_manifest(self, partitions: Dict[str, Dict]) -> None:
+        atomic_write_json(self.manifest_path, {'partitions': dict(sorted(partitions.items()))})
+
+    def _load_partition(self, entry: Dict) -> List[Dict]:
+        path = os.path.join(self.path, entry['file'])
+        if entry.get('compressed'):
+            with gzip.open(path, 'rt', encoding='utf-8') as f:
+                return json.load(f)
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def _read_partition(self, entry: Dict) -> List[Dict]:
+        """Читает партицию для выборки: нечитаемая пропускается"""
+        try:
+            return self._load_partition(entry)
+        except FileNotFoundError:
+            # Партицию удалили или сжали после чтения манифеста
+            logger.warning(f"Партиция новостей не найдена: {entry['file']}")
+        except Exception as e:
+            logger.error(f"Ошибка чтения партиции новостей {entry['file']}: {e}")
+        return []
+
+    def _read_partition_for_update(self, entry: Dict) -> Optional[List[Dict]]:
+        """Читает партицию перед перезаписью.
+
+        Возвращает None, если файл есть, но не читается: такую партицию
+        нельзя ни перезаписывать, ни удалять, иначе её новости будут потеряны.
+        """
+        try:
+            return self._load_partition(entry)
+        except FileNotFoundError:
+            # Терять нечего: файл удалили после чтения манифеста
+            logger.warning(f"Партиция новостей не найдена: {entry['file']}")
+            return []
+        except Exception as e:
+            logger.error(f"Партиция новостей {entry['file']} не прочитана и оставлена как есть: {e}")
+            return None
+
+    def _write_partition(self, key: str, news_list: List[Dict], compressed: bool = False) -> Optional[Dict]:
+        """Записывает партицию и возвращает её запись в манифесте.
+
+        Для пустой партиции файл не пишется и возвращается None: прежний файл
+        вызывающий удаляет через _commit, после сохранения манифеста.
+        """
+        if not news_list:
+            return None
+        news_list.sort(key=lambda x: x['timestamp'], reverse=True)
+        data = json.dumps(news_list, ensure_ascii=False).encode('utf-8')
+        file_name = f"{key}.json.gz" if compressed else f"{key}.json"
+        atomic_write_bytes(os.path.join(self.path, file_name), gzip.compress(data) if compressed else data)
+        return {
+            'file': file_name,
+            'compressed': compressed,
+            'count': len(news_list),
+            'min_timestamp': news_list[-1]['timestamp'],
+            'max_timestamp': news_list[0]['timestamp']
+        }
+
+    def _remove_file(self, file_name: str) -> None:
+        try:
+            os.remove(os.path.join(self.path, file_name))
+        except FileNotFoundError:
+            pass
+
+    def _iter_newest(self, partitions: Dict[str, Dict] = None) -> Iterator[Dict]:
+        """Перебирает новости от новых к старым, открывая партиции по очереди"""
+        partitions = self._load_manifest() if partitions is None else partitions
+        for key in sorted(partitions, reverse=True):
+            yield from self._read_partition(partitions[key])
+
+    def _apply_retention(self, partitions: Dict[str, Dict]) -> List[str]:
+        """Удаляет устаревшие партиции и сжимает остывшие, возвращает ненужные файлы"""
+        now = time.time()
+        obsolete = []
+        for key, entry in list(partitions.items()):
+            age_days = (now - entry['max_timestamp']) / 86400
+            if self.retention_days and age_days > self.retention_days:
+                obsolete.append(entry['file'])
+                del partitions[key]
+            elif self.compress_after_days and age_days > self.compress_after_days and not entry.get('compressed'):
+                news_list = self._read_partition_for_update(entry)
+                if news_list is None:
+                    continue
+                compressed = self._write_partition(key, news_list, compressed=True)
+                self._set_partition(partitions, key, compressed)
+                obsolete.append(entry['file'])
+        return obsolete
+
+    @staticmethod
+    def _set_partition(partitions: Dict[str, Dict], key: str, entry: Optional[Dict]) -> None:
+        if entry is None:
+            partitions.pop(key, None)
+        else:
+            partitions[key] = entry
+
+    def _commit(self, partitions: Dict[str, Dict], obsolete: List[str]) -> None:
+        # Сначала партиции, затем манифест и только потом удаление старых файлов:
+        # читатель со старым манифестом не останется без данных
+        obsolete = obsolete + self._apply_retention(partitions)
+        self._save_manifest(partitions)
+        current_files = {entry['file'] for entry in partitions.values()}
+        for file_name in obsolete:
+            if file_name not in current_files:
+                self._remove_file(file_name)
+
+    def load_all(self) -> List[Dict]:
+        return list(self._iter_newest())
+
+    def load_recent(self, limit: int) -> List[Dict]:
+        result = []
+        for news in self._iter_newest():
+            if len(result) >= limit:
+                break
+            result.append(news)
+        return result
+
+    def save_all(self, news_list: List[Dict]) -> None:
+        try:
+            groups: Dict[str, List[Dict]] = {}
+            for news in news_list:
+                groups.setdefault(self._partition_key(news), []).append(news)
+            with self._lock:
+                old_partitions = self._load_manifest()
+                partitions = {}
+                for key, group in groups.items():
+                    self._set_partition(partitions, key, self._write_partition(key, group))
+                self._commit(partitions, [entry['file'] for entry in old_partitions.values()])
+        except Exception as e:
+            logger.error(f"Ошибка сохранения новостей: {e}")
+
+    def append_news(self, news_list: List[Dict], max_count: int, evicted_ids: List[str] = None) -> None:
+        # Объём истории ограничивается сроком хранения партиций, а не max_count:
+        # вытесненные из памяти новости остаются в своих партициях
+        try:
+            groups: Dict[str, Dict[str, Dict]] = {}
+            for news in news_list:
+                groups.setdefault(self._partition_key(news), {})[news['id']] = news
+            with self._lock:
+                partitions = self._load_manifest()
+                obsolete = []
+                for key, updates in groups.items():
+                    entry = partitions.get(key)
+                    existing = self._read_partition_for_update(entry) if entry else []
+                    if existing is None:
+                        logger.error(f"Новости не записаны в партицию {entry['file']}: {len(updates)}")
+                        continue
+                    merged = [updates.pop(news['id'], news) for news in existing]
+                    merged.extend(updates.values())
+                    written = self._write_partition(key, merged, compressed=bool(entry and entry.get('compressed')))
+                    self._set_partition(partitions, key, written)
+                    if entry and (written is None or entry['file'] != written['file']):
+                        obsolete.append(entry['file'])
+                self._commit(partitions, obsolete)
+        except Exception as e:
+            logger.error(f"Ошибка сохранения новостей: {e}")
+
+    def get_by_id(self, news_id: str) -> Optional[Dict]:
+        for news in self._iter_newest():
+            if news['id'] == news_id:
+                return news
+        return None
+
+    def get_by_topics(self, topics: List[str], limit: int = None, offset: int = 0) -> List[Dict]:
+        topics = set(topics)
+        stop = offset + limit if limit else None
+        result = []
+        for news in self._iter_newest():
+            if news['topic'] in topics:
+                result.append(news)
+                if stop is not None and len(result) >= stop:
+                    break
+        return result[offset:stop]
+
+    def count(self) -> int:
+        return sum(entry['count'] for entry in self._load_manifest().values())
+
+    def version(self) -> Optional[str]:
+        # Манифест перезаписывается через rename при каждом изменении
+        try:
+            stat = os.stat(self.manifest_path)
+        except FileNotFoundError:
+            return None
+        return f"{stat.st_ino}:{stat.st_mtime_ns}:{stat.st_size}"
+
+
+class _IndexEntry(NamedTuple):
+    topic: str
+    timestamp: float
+    offset: int
+    length: int
+
+
+class NdjsonNewsStorage(NewsStorage):
+    """Хранилище новостей в NDJSON с отдельным индексом смещений.
+
+    Записи дописываются в конец файла данных по одной на строку, а в
+    индекс (тоже построчно) — их ID, тема, время и положение в файле;
+    замена записи — новая строка, удаление — строка-надгробие без смещения.
+    Файл данных отображается в память (mmap), поэтому get_by_id и страница
+    по темам декодируют только нужные записи. Индекс читается
+    инкрементально: при дописывании разбираются лишь новые строки.
+
+    Первая строка индекса указывает файл данных текущего поколения.
+    Когда мёртвых записей становится больше живых, база переписывается
+    в файл следующего поколения, и индекс заменяется атомарно.
+
+    Бот держит max_news_count новостей в резидентном снимке (NewsStore):
+    на нём построены поиск и объединение дубликатов, поэтому при старте
+    load_recent декодирует все записи, а запросы пользователей обслуживаются
+    из памяти. Ленивое чтение по индексу используют инструменты
+    (tools/convert_news_db.py, tools/bench_storage.py) и процессы, которым
+    нужны отдельные записи без загрузки всей базы.
+    """
+
+    COMPACT_MIN_GARBAGE = 1000
+    DECODE_BATCH = 1000
+
+    def __init__(self, path: str = None):
+        self.path = path or Settings.NDJSON_DATABASE_PATH
+        self.index_path = self.path + '.idx'
+        self._lock = threading.RLock()
+        self._index: Dict[str, _IndexEntry] = {}
+        self._order: Optional[List[Tuple[str, _IndexEntry]]] = None
+        self._index_inode: Optional[int] = None
+        self._index_pos = 0
+        self._index_lines = 0
+        self._data_file: Optional[str] = None
+        self._data_end = 0
+        self._mmap: Optional[mmap.mmap] = None
+        self._mmap_file: Optional[str] = None
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def _data_path(self, data_file: str) -> str:
+        return os.path.join(os.path.dirname(self.path), data_file)
+
+    def _next_data_file(self) -> str:
+        stem, ext = os.path.splitext(os.path.basename(self.path))
+        # Без расширения в пути номер поколения нельзя было бы отделить от имени
+        ext = ext or '.ndjson'
+        generation = 0
+        if self._data_file:
+            generation = int(self._data_file[len(stem) + 1:-len(ext)]) + 1
+        return f"{stem}.{generation}{ext}"
+
+    def _reset_index(self) -> None:
+        self._index, self._order = {}, None
+        self._index_inode = self._data_file = None
+        self._index_pos = self._index_lines = self._data_end = 0
+
+    def _refresh_index(self) -> None:
+        """Дочитывает индекс; при смене файла (уплотнение) читает заново"""
+        try:
+            stat = os.stat(self.index_path)
+        except FileNotFoundError:
+            self._reset_index()
+            return
+        if stat.st_ino == self._index_inode and stat.st_size == self._index_pos:
+            return
+        if stat.st_ino != self._index_inode or stat.st_size < self._index_pos:
+            self._reset_index()
+            self._index_inode = stat.st_ino
+
+        with open(self.index_path, 'rb') as f:
+            f.seek(self._index_pos)
+            chunk = f.read()
+        # Недописанную строку (запись идёт прямо сейчас) разберём в следующий раз
+        complete = chunk[:chunk.rfind(b'\n') + 1]
+        lines = complete.splitlines()
+        # Один вызов json.loads на все строки заметно быстрее построчного разбора
+        index = self._index
+        make_entry = _IndexEntry._make
+        for record in json.loads(b'[' + b','.join(lines) + b']') if lines else ():
+            if isinstance(record, dict):
+                self._data_file = record['data']
+                continue
+            self._index_lines += 1
+            if record[3] is None:
+                index.pop(record[0], None)
+            else:
+                index[record[0]] = make_entry(record[1:])
+                # Записи дописываются по порядку, поэтому последняя заканчивается дальше всех
+                self._data_end = record[3] + record[4]
+        if complete:
+            self._order = None
+        self._index_pos += len(complete)
+
+    def _sorted_entries(self) -> List[Tuple[str, _IndexEntry]]:
+        if self._order is None:
+            self._order = sorted(self._index.items(), key=lambda item: item[1].timestamp, reverse=True)
+        return self._order
+
+    def _buffer(self) -> mmap.mmap:
+        """Возвращает отображение файла данных, покрывающее все записи индекса"""
+        if self._mmap is None or self._mmap_file != self._data_file or len(self._mmap) < self._data_end:
+            if self._mmap is not None:
+                self._mmap.close()
+            with open(self._data_path(self._data_file), 'rb') as f:
+                self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            self._mmap_file = self._data_file
+        return self._mmap
+
+    def _decode(self, entries: List[_IndexEntry]) -> List[Dict]:
+        if not entries:
+            return []
+        buffer = self._buffer()
+        result = []
+        # Пачками: один json.loads на пачку быстрее построчного и не копирует весь файл разом
+        for start in range(0, len(entries), self.DECODE_BATCH):
+            records = b','.join(buffer[entry.offset:entry.offset + entry.length - 1]
+                                for entry in entries[start:start + self.DECODE_BATCH])
+            result.extend(json.loads(b'[' + records + b']'))
+        return result
+
+    def _read(self, entries_func) -> List[Dict]:
+        try:
+            with self._lock:
+                self._refresh_index()
+                return self._decode(entries_func())
+        except Exception as e:
+            logger.error(f"Ошибка загрузки новостей: {e}")
+            return []
+
+    @staticmethod
+    def _encode(news: Dict) -> bytes:
+        return json.dumps(news, ensure_ascii=False, separators=(',', ':')).encode('utf-8') + b'\n'
+
+    @staticmethod
+    def _index_line(news_id: str, entry: Optional[_IndexEntry]) -> bytes:
+        record = [news_id, *entry] if entry else [news_id, None, None, None, None]
+        return json.dumps(record, ensure_ascii=False, separators=(',', ':')).encode('utf-8') + b'\n'
+
+    def load_all(self) -> List[Dict]:
+        return self._read(lambda: [entry for _, entry in self._sorted_entries()])
+
+    def load_recent(self, limit: int) -> List[Dict]:
+        return self._read(lambda: [entry for _, entry in self._sorted_entries()[:limit]])
+
+    def save_all(self, news_list: List[Dict]) -> None:
+        try:
+            with self._lock:
+                self._refresh_index()
+                self._rewrite(news_list)
+        except Exception as e:
+            logger.error(f"Ошибка сохранения новостей: {e}")
+
+    def _rewrite(self, news_list: List[Dict]) -> None:
+        """Записывает базу в файл нового поколения и атомарно подменяет индекс"""
+        old_data_file = self._data_file
+        data_file = self._next_data_file()
+        data = bytearray()
+        index = bytearray(json.dumps({'data': data_file}).encode('utf-8') + b'\n')
+        seen = set()
+        for news in news_list:
+            if news['id'] in seen:
+                continue
+            seen.add(news['id'])
+            record = self._encode(news)
+            index += self._index_line(news['id'], _IndexEntry(news['topic'], news['timestamp'], len(data), len(record)))
+            data += record
+
+        atomic_write_bytes(self._data_path(data_file), bytes(data))
+        atomic_write_bytes(self.index_path, bytes(index))
+        # Читатели, уже отобразившие старый файл, продолжают работать с ним и после удаления
+        if old_data_file and old_data_file != data_file:
+            try:
+                os.remove(self._data_path(old_data_file))
+            except FileNotFoundError:
+                pass
+        self._reset_index()
+        self._refresh_index()
+
+    def append_news(self, news_list: List[Dict], max_count: int, evicted_ids: List[str] = None) -> None:
+        try:
+            with self._lock:
+                self._refresh_index()
+                if self._data_file is None:
+                    self._rewrite(news_list)
+                    news_list = []
+
+                data_path = self._data_path(self._data_file)
+                offset = os.path.getsize(data_path)
+                data = bytearray()
+                index = bytearray()
+                for news in news_list:
+                    record = self._encode(news)
+                    entry = _IndexEntry(news['topic'], news['timestamp'], offset + len(data), len(record))
+                    index += self._index_line(news['id'], entry)
+                    data += record
+                    self._index[news['id']] = entry
+                self._data_end = max(self._data_end, offset + len(data))
+                self._order = None
+
+                if evicted_ids is None:
+                    evicted_ids = [news_id for news_id, _ in self._sorted_entries()[max_count:]]
+                for news_id in evicted_ids:
+                    if self._index.pop(news_id, None) is not None:
+                        index += self._index_line(news_id, None)
+                self._order = None
+
+                # Сначала данные, затем индекс: читатель не увидит смещение за концом файла
+                with open(data_path, 'ab') as f:
+                    f.write(data)
+                    f.flush()
+                    os.fsync(f.fileno())
+                with open(self.index_path, 'ab') as f:
+                    f.write(index)
+                    f.flush()
+                    os.fsync(f.fileno())
+                self._index_lines += index.count(b'\n')
+                self._index_pos += len(index)
+
+                garbage = self._index_lines - len(self._index)
+                if garbage > max(self.COMPACT_MIN_GARBAGE, len(self._index)):
+                    logger.info(f"Уплотнение NDJSON-базы: живых записей {len(self._index)}, мёртвых {garbage}")
+                    self._rewrite(self._decode([entry for _, entry in self._sorted_entries()]))
+        except Exception as e:
+            logger.error(f"Ошибка сохранения новостей: {e}")
+            # Индекс в памяти мог разойтись с файлами: при следующем обращении он будет перечитан
+            with self._lock:
+                self._reset_index()
+
+    def get_by_id(self, news_id: str) -> Optional[Dict]:
+        def entries():
+            entry = self._index.get(news_id)
+            return [entry] if entry else []
+        result = self._read(entries)
+        return result[0] if result else None
+
+    def get_by_topics(self, topics: List[str], limit: int = None, offset: int = 0) -> List[Dict]:
+        topics = set(topics)
+        stop = offset + limit if limit else None
+
+        def entries():
+            matched = [entry for _, entry in self._sorted_entries() if entry.topic in topics]
+            return matched[offset:stop]
+        return self._read(entries)
+
+    def count(self) -> int:
+        with self._lock:
+            self._refresh_index()
+            return len(self._index)
+
+    def version(self) -> Optional[str]:
+        # Индекс дописывается или заменяется через rename при каждом изменении
+        try:
+            stat = os.stat(self.index_path)
+        except FileNotFoundError:
+            return None
+        return f"{stat.st_ino}:{stat.st_mtime_ns}:{stat.st_size}"
+
+    def close(self) -> None:
+        with self._lock:
+            if self._mmap is not None:
+                self._mmap.close()
+                self._mmap = None
+
+
+def _import_json_database(storage: NewsStorage, label: str) -> NewsStorage:
+    """Переносит существующую JSON-базу в пустое хранилище при первом запуске"""
+    if storage.count() == 0 and os.path.exists(Settings.DATABASE_PATH):
+        news_data = JsonNewsStorage().load_all()
+        if news_data:
+            storage.save_all(news_data)
+            logger.info(f"Импортировано {len(news_data)} новостей из {Settings.DATABASE_PATH} в {label}")
+    return storage
+
+
+def create_news_storage(backend: str = None) -> NewsStorage:
+    """Создаёт хранилище новостей по настройке NEWS_STORAGE"""
+    backend = (backend or Settings.NEWS_STORAGE).lower()
+
+    if backend == 'json':
+        return JsonNewsStorage()
+
+    if backend == 'sqlite':
+        return _import_json_database(SqliteNewsStorage(), 'SQLite')
+
+    if backend == 'ndjson':
+        return _import_json_database(NdjsonNewsStorage(), 'NDJSON')
+
+    if backend == 'partitioned':
+        return _import_json_database(PartitionedNewsStorage(), 'партиции')
+
+    raise ValueError(f"Неизвестное хранилище новостей: {backend}")
@@ -0,0 +1,146 @@
+"""
+Резидентное хранилище новостей с индексами
+"""
+
+import heapq
+from bisect import bisect_left, insort
+from itertools import islice
+from operator import attrgetter
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .news_item import NewsItem
+
+_by_timestamp = attrgetter('timestamp')
+
+
+def _recency_key(news: NewsItem) -> float:
+    # Списки упорядочены по убыванию времени, а bisect работает с возрастающим ключом
+    return -news.timestamp
+
+
+class NewsStore:
+    """Неизменяемый снимок базы новостей.
+
+    Снимок строится целиком и подменяется одной операцией присваивания,
+    поэтому читатели никогда не видят частично обновлённые индексы.
+    """
+
+    def __init__(self, news_list: Iterable[NewsItem], version: int = 0):
+        self.version = version
+        self.items: List[NewsItem] = sorted(news_list, key=_by_timestamp, reverse=True)
+        self.by_id: Dict[str, NewsItem] = {}
+        self.by_topic: Dict[str, List[NewsItem]] = {}
+
+        for news in self.items:
+            self.by_id[news.id] = news
+            self.by_topic.setdefault(news.topic, []).append(news)
+
+    @classmethod
+    def _from_indexes(cls, items: List[NewsItem], by_id: Dict[str, NewsItem],
+                      by_topic: Dict[str, List[NewsItem]], version: int) -> 'NewsStore':
+        store = cls.__new__(cls)
+        store.version = version
+        store.items = items
+        store.by_id = by_id
+        store.by_topic = by_topic
+        return store
+
+    def merged(self, added: Iterable[NewsItem], updated: Iterable[NewsItem] = (),
+               max_count: int = None) -> Tuple['NewsStore', List[NewsItem]]:
+        """Возвращает следующий снимок с новыми и заменёнными новостями.
+
+        Вместо пересортировки всей базы новые новости вставляются бинарным
+        поиском в уже упорядоченные списки, заменённые (с тем же ID
+        и временем) ставятся на место прежних, а ограничение max_count
+        отрезает хвост. Копируются только списки затронутых тем, поэтому
+        работа на Python-уровне пропорциональна числу изменений. Второй
+        элемент результата — вытесненные новости.
+        """
+        items = list(self.items)
+        by_id = dict(self.by_id)
+        by_topic = dict(self.by_topic)
+        copied_topics = set()
+
+        def topic_list(topic: str) -> List[NewsItem]:
+            if topic not in copied_topics:
+                by_topic[topic] = list(by_topic.get(topic, ()))
+                copied_topics.add(topic)
+            return by_topic[topic]
+
+        for news in updated:
+            previous = by_id.get(news.id)
+            if previous is None:
+                continue
+            self._remove_from(items, previous)
+            self._remove_from(topic_list(previous.topic), previous)
+            insort(items, news, key=_recency_key)
+            insort(topic_list(news.topic), news, key=_recency_key)
+            by_id[news.id] = news
+
+        added = [news for news in sorted(added, key=_by_timestamp, reverse=True) if news.id not in by_id]
+        if added and (not items or added[-1].timestamp >= items[0].timestamp):
+            # Обычный случай: все новые свежее базы и встают в начало одним блоком
+            items[:0] = added
+        else:
+            for news in added:
+                insort(items, news, key=_recency_key)
+        for news in added:
+            insort(topic_list(news.topic), news, key=_recency_key)
+            by_id[news.id] = news
+
+        evicted: List[NewsItem] = []
+        if max_count is not None and len(items) > max_count:
+            evicted = items[max_count:]
+            del items[max_count:]
+            for news in reversed(evicted):
+                del by_id[news.id]
+                self._remove_from(topic_list(news.topic), news)
+
+        for topic in copied_topics:
+            if not by_topic[topic]:
+                del by_topic[topic]
+
+        return self._from_indexes(items, by_id, by_topic, self.version + 1), evicted
+
+    @staticmethod
+    def _remove_from(news_list: List[NewsItem], news: NewsItem) -> None:
+        """Удаляет новость из упорядоченного списка, находя её бинарным поиском"""
+        index = bisect_left(news_list, _recency_key(news), key=_recency_key)
+        while index < len(news_list):
+            if news_list[index].id == news.id:
+                del news_list[index]
+                return
+            if news_list[index].timestamp != news.timestamp:
+                return
+            index += 1
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def __contains__(self, news_id: str) -> bool:
+        return news_id in self.by_id
+
+    def get(self, news_id: str) -> Optional[NewsItem]:
+        """Возвращает новость по ID"""
+        return self.by_id.get(news_id)
+
+    def count_by_topics(self, topics: List[str]) -> int:
+        """Возвращает количество новостей по заданным темам"""
+        return sum(len(self.by_topic.get(topic, ())) for topic in set(topics))
+
+    def get_by_topics(self, topics: List[str], limit: int = None, offset: int = 0) -> List[NewsItem]:
+        """Возвращает новости по темам в порядке убывания свежести.
+
+        Списки тем уже упорядочены, поэтому они сливаются слиянием куч,
+        и для страницы обходится только offset + limit элементов.
+        """
+        lists = [self.by_topic[topic] for topic in set(topics) if topic in self.by_topic]
+        if not lists:
+            return []
+
+        stop = offset + limit if limit else None
+        if len(lists) == 1:
+            return lists[0][offset:stop]
+
+        merged = heapq.merge(*lists, key=_by_timestamp, reverse=True)
+        return list(islice(merged, offset, stop))
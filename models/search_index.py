@@ -0,0 +1,184 @@
+"""
+Полнотекстовый поиск по новостям
+"""
+
+import heapq
+import math
+import re
+import threading
+from collections import Counter
+from operator import itemgetter
+from typing import Dict, Iterable, List, Optional
+
+_TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+_STOP_WORDS = frozenset({
+    'и', 'в', 'во', 'не', 'что', 'он', 'на', 'я', 'с', 'со', 'как', 'а', 'то', 'все', 'она',
+    'так', 'его', 'но', 'да', 'ты', 'к', 'у', 'же', 'вы', 'за', 'бы', 'по', 'только', 'ее',
+    'мне', 'было', 'вот', 'от', 'меня', 'еще', 'нет', 'о', 'из', 'ему', 'для', 'при', 'это',
+    'the', 'a', 'an', 'and', 'or', 'of', 'to', 'in', 'on', 'for', 'with', 'at', 'by', 'from',
+    'is', 'are', 'was', 'were', 'be', 'as', 'it', 'its', 'that', 'this', 'has', 'have', 'will',
+})
+
+# Окончания упорядочены по убыванию длины: отрезается самое длинное подходящее
+_RU_ENDINGS = tuple(sorted({
+    'иями', 'ями', 'ами', 'ого', 'его', 'ому', 'ему', 'ыми', 'ими', 'ией', 'иях',
+    'ах', 'ях', 'ов', 'ев', 'ей', 'ой', 'ий', 'ый', 'ая', 'яя', 'ое', 'ее', 'ые', 'ие',
+    'ую', 'юю', 'ом', 'ем', 'ам', 'ям', 'их', 'ых', 'ия', 'ию', 'ии', 'ием', 'иям', 'ть',
+    'а', 'я', 'о', 'е', 'ы', 'и', 'у', 'ю', 'ь', 'й',
+}, key=len, reverse=True))
+
+_EN_ENDINGS = ('ations', 'ation', 'ings', 'ing', 'ies', 'ed', 'es', 'ly', 's')
+
+_MIN_STEM = 3
+
+
+def stem(token: str) -> str:
+    """Облегчённый стемминг русских и английских слов"""
+    if token.isdigit():
+        return token
+
+    endings = _RU_ENDINGS if 'а' <= token[0] <= 'я' else _EN_ENDINGS
+    for ending in endings:
+        if token.endswith(ending) and len(token) - len(ending) >= _MIN_STEM:
+            if ending == 'ies':
+                return token[:-3] + 'y'
+            return token[:-len(ending)]
+    return token
+
+
+def tokenize(text: str) -> List[str]:
+    """Разбивает текст на нормализованные термы"""
+    tokens = _TOKEN_RE.findall(text.lower().replace('ё', 'е'))
+    return [stem(token) for token in tokens if token not in _STOP_WORDS and len(token) > 1]
+
+
+class SearchIndex:
+    """Инвертированный индекс по заголовку и описанию с ранжированием BM25.
+
+    Индекс обновляется инкрементально: новости добавляются и удаляются
+    по одной, без перестроения. Вклад частоты терма с нормализацией по длине
+    вычисляется при добавлении, поэтому при поиске остаётся умножение на idf.
+    Все операции защищены блокировкой, так как поиск и обновление могут идти
+    из разных потоков.
+    """
+
+    K1 = 1.5
+    B = 0.75
+    TITLE_WEIGHT = 2
+    COMMON_TERM_RATIO = 0.1
+
+    def __init__(self):
+        self._postings: Dict[str, Dict[str, float]] = {}
+        self._doc_terms: Dict[str, Counter] = {}
+        self._doc_topics: Dict[str, str] = {}
+        self._doc_lengths: Dict[str, int] = {}
+        self._total_length = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._doc_terms)
+
+    def _terms(self, news: Dict) -> Counter:
+        terms = Counter(tokenize(news.get('description', '')))
+        for term in tokenize(news.get('title', '')):
+            terms[term] += self.TITLE_WEIGHT
+        return terms
+
+    def add(self, news: Dict) -> None:
+        """Добавляет новость в индекс"""
+        terms = self._terms(news)
+        with self._lock:
+            if news['id'] in self._doc_terms:
+                return
+            self._doc_terms[news['id']] = terms
+            self._doc_topics[news['id']] = news['topic']
+            length = sum(terms.values())
+            self._doc_lengths[news['id']] = length
+            self._total_length += length
+
+            avg_length = self._total_length / len(self._doc_terms) or 1.0
+            norm = self.K1 * (1 - self.B + self.B * length / avg_length)
+            for term, frequency in terms.items():
+                weight = frequency * (self.K1 + 1) / (frequency + norm)
+                self._postings.setdefault(term, {})[news['id']] = weight
+
+    def add_many(self, news_list: Iterable[Dict]) -> None:
+        """Добавляет несколько новостей"""
+        for news in news_list:
+            self.add(news)
+
+    def remove(self, news_id: str) -> None:
+        """Удаляет новость из индекса"""
+        with self._lock:
+            terms = self._doc_terms.pop(news_id, None)
+            if terms is None:
+                return
+            del self._doc_topics[news_id]
+            self._total_length -= self._doc_lengths.pop(news_id)
+            for term in terms:
+                postings = self._postings.get(term)
+                if postings is not None:
+                    postings.pop(news_id, None)
+                    if not postings:
+                        del self._postings[term]
+
+    def rebuild(self, news_list: Iterable[Dict]) -> None:
+        """Перестраивает индекс с нуля.
+
+        Новый индекс строится отдельно и подменяет текущий одной операцией
+        под блокировкой, поэтому поиск во время перестройки идёт по прежнему
+        индексу, а не по пустому или частично заполненному.
+        """
+        fresh = SearchIndex()
+        fresh.add_many(news_list)
+        with self._lock:
+            self._postings = fresh._postings
+            self._doc_terms = fresh._doc_terms
+            self._doc_topics = fresh._doc_topics
+            self._doc_lengths = fresh._doc_lengths
+            self._total_length = fresh._total_length
+
+    def search(self, query: str, topics: Optional[List[str]] = None, limit: int = 10) -> List[str]:
+        """Возвращает ID новостей, упорядоченные по релевантности"""
+        query_terms = set(tokenize(query))
+        if not query_terms:
+            return []
+
+        allowed_topics = set(topics) if topics else None
+        scores: Dict[str, float] = {}
+
+        with self._lock:
+            doc_count = len(self._doc_terms)
+
+            # Редкие термы обрабатываются первыми; частые термы с низким idf
+            # только уточняют оценки уже найденных кандидатов
+            postings_by_term = [self._postings[term] for term in query_terms if term in self._postings]
+            postings_by_term.sort(key=len)
+
+            if len(postings_by_term) == 1:
+                # Для одного терма idf одинаков у всех документов и не влияет на порядок
+                scores = postings_by_term[0]
+            else:
+                for postings in postings_by_term:
+                    df = len(postings)
+                    idf = math.log(1 + (doc_count - df + 0.5) / (df + 0.5))
+
+                    if scores and df > self.COMMON_TERM_RATIO * doc_count:
+                        for news_id in list(scores):
+                            weight = postings.get(news_id)
+                            if weight:
+                                scores[news_id] += idf * weight
+                    else:
+                        for news_id, weight in postings.items():
+                            scores[news_id] = scores.get(news_id, 0.0) + idf * weight
+
+            if allowed_topics is not None:
+                doc_topics = self._doc_topics
+                ranked = [item for item in scores.items() if doc_topics[item[0]] in allowed_topics]
+            else:
+                ranked = scores.items()
+
+            top = heapq.nlargest(limit, ranked, key=itemgetter(1))
+
+        return [news_id for news_id, _ in top]
@@ -0,0 +1,140 @@
+"""
+Состояние RSS-источников: экспоненциальная задержка и автоматический выключатель
+"""
+
+import json
+import logging
+import os
+import random
+import threading
+import time
+from typing import Dict, List
+
+from config.settings import Settings
+from utils.file_utils import atomic_write_json
+
+logger = logging.getLogger(__name__)
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+
+class SourceHealth:
+    """Отслеживает ошибки источников и временно исключает сбойные из опроса.
+
+    После failure_threshold ошибок подряд выключатель источника размыкается
+    (open) на backoff_base секунд; каждая следующая неудачная пробная загрузка
+    (half_open) удваивает паузу вплоть до backoff_max. Первая успешная
+    загрузка замыкает выключатель и сбрасывает счётчик.
+    """
+
+    def __init__(self, state_path: str = None):
+        self.state_path = state_path or Settings.SOURCE_HEALTH_PATH
+        self.failure_threshold = max(1, Settings.SOURCE_FAILURE_THRESHOLD)
+        self.backoff_base = Settings.SOURCE_BACKOFF_BASE
+        self.backoff_max = Settings.SOURCE_BACKOFF_MAX
+        self.state: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+        self._dirty = False
+        self.load()
+
+    def load(self) -> None:
+        """Загружает состояние источников из файла"""
+        try:
+            if os.path.exists(self.state_path):
+                with open(self.state_path, 'r', encoding='utf-8') as f:
+                    self.state = json.load(f)
+        except Exception as e:
+            logger.error(f"Ошибка загрузки состояния источников: {e}")
+            self.state = {}
+
+    def save(self) -> None:
+        """Сохраняет состояние источников, если оно изменилось"""
+        with self._lock:
+            if not self._dirty:
+                return
+            snapshot = {url: dict(entry) for url, entry in self.state.items()}
+            self._dirty = False
+        try:
+            atomic_write_json(self.state_path, snapshot)
+        except Exception as e:
+            logger.error(f"Ошибка сохранения состояния источников: {e}")
+
+    def _entry(self, url: str) -> Dict:
+        return self.state.setdefault(url, {
+            'state': CLOSED,
+            'failures': 0,
+            'total_failures': 0,
+            'open_until': 0.0,
+            'last_error': None
+        })
+
+    def allow(self, url: str, now: float = None) -> bool:
+        """Проверяет, можно ли загружать источник сейчас"""
+        now = now or time.time()
+        with self._lock:
+            entry = self._entry(url)
+            if entry['state'] == OPEN:
+                if now < entry['open_until']:
+                    return False
+                # Пауза истекла: пропускаем одну пробную загрузку
+                entry['state'] = HALF_OPEN
+                self._dirty = True
+            return True
+
+    def filter_allowed(self, sources: List[str]) -> List[str]:
+        """Оставляет источники, которые можно загружать сейчас"""
+        now = time.time()
+        return [url for url in sources if self.allow(url, now)]
+
+    def record_success(self, url: str) -> None:
+        """Учитывает успешную загрузку источника"""
+        with self._lock:
+            entry = self._entry(url)
+            if entry['state'] != CLOSED:
+                logger.info(f"Источник восстановился после {entry['failures']} ошибок: {url}")
+            if entry['state'] != CLOSED or entry['failures']:
+                entry['state'] = CLOSED
+                entry['failures'] = 0
+                self._dirty = True
+
+    def record_failure(self, url: str, error: str, now: float = None) -> None:
+        """Учитывает ошибку источника и при необходимости размыкает выключатель"""
+        now = now or time.time()
+        with self._lock:
+            entry = self._entry(url)
+            entry['failures'] += 1
+            entry['total_failures'] += 1
+            entry['last_error'] = error[:200]
+            self._dirty = True
+
+            if entry['failures'] < self.failure_threshold:
+                return
+
+            exponent = entry['failures'] - self.failure_threshold
+            backoff = min(self.backoff_base * 2 ** min(exponent, 32), self.backoff_max)
+            # Разброс, чтобы источники, сломавшиеся одновременно, не проверялись пачкой
+            backoff *= random.uniform(0.9, 1.1)
+            entry['state'] = OPEN
+            entry['open_until'] = now + backoff
+            logger.warning(
+                f"Источник отключён на {backoff:.0f} с после {entry['failures']} ошибок подряд: "
+                f"{url}, {entry['last_error']}"
+            )
+
+    def get_stats(self) -> Dict:
+        """Возвращает сводку по сбойным источникам"""
+        now = time.time()
+        with self._lock:
+            unhealthy = {
+                url: {
+                    'state': entry['state'],
+                    'failures': entry['failures'],
+                    'retry_in': max(0, round(entry['open_until'] - now)) if entry['state'] == OPEN else 0,
+                    'last_error': entry['last_error']
+                }
+                for url, entry in self.state.items()
+                if entry['state'] != CLOSED or entry['failures']
+            }
+        return {'unhealthy': len(unhealthy), 'sources': unhealthy}
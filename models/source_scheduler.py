@@ -0,0 +1,132 @@
+"""
+Адаптивное расписание опроса RSS-источников
+"""
+
+import json
+import logging
+import os
+import random
+import threading
+import time
+from typing import Dict, List
+
+from config.settings import Settings
+from utils.file_utils import atomic_write_json
+
+logger = logging.getLogger(__name__)
+
+
+class SourceScheduler:
+    """Подбирает интервал опроса каждого источника по частоте его публикаций.
+
+    Частота оценивается экспоненциальным скользящим средним числа новых
+    записей в секунду. Интервал выбирается так, чтобы за один опрос
+    появлялось около target_items новых записей, и ограничивается
+    [min_interval, max_interval]; к моменту следующего опроса добавляется
+    случайный разброс, чтобы запросы к источникам не шли пачкой.
+    """
+
+    def __init__(self, sources: List[str], state_path: str = None):
+        self.sources = list(sources)
+        self.state_path = state_path or Settings.SOURCE_SCHEDULE_PATH
+        self.min_interval = Settings.SOURCE_MIN_INTERVAL
+        self.max_interval = Settings.SOURCE_MAX_INTERVAL
+        self.initial_interval = min(max(Settings.NEWS_UPDATE_INTERVAL, self.min_interval), self.max_interval)
+        self.target_items = Settings.SOURCE_TARGET_ITEMS
+        self.alpha = Settings.SOURCE_RATE_ALPHA
+        self.jitter = Settings.SOURCE_JITTER
+        self.state: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+        self.load()
+
+    def load(self) -> None:
+        """Загружает состояние расписания из файла"""
+        try:
+            if os.path.exists(self.state_path):
+                with open(self.state_path, 'r', encoding='utf-8') as f:
+                    self.state = json.load(f)
+        except Exception as e:
+            logger.error(f"Ошибка загрузки расписания источников: {e}")
+            self.state = {}
+
+    def save(self) -> None:
+        """Сохраняет состояние расписания в файл"""
+        with self._lock:
+            snapshot = {url: dict(entry) for url, entry in self.state.items()}
+        try:
+            atomic_write_json(self.state_path, snapshot)
+        except Exception as e:
+            logger.error(f"Ошибка сохранения расписания источников: {e}")
+
+    def _entry(self, url: str) -> Dict:
+        return self.state.setdefault(url, {
+            'rate': 0.0,
+            'interval': self.initial_interval,
+            'next_due': 0.0,
+            'last_polled': None,
+            'polls': 0
+        })
+
+    def due_sources(self, now: float = None) -> List[str]:
+        """Возвращает источники, которые пора опросить (новые — сразу)"""
+        now = now or time.time()
+        with self._lock:
+            return [url for url in self.sources if self._entry(url)['next_due'] <= now]
+
+    def next_due_in(self, now: float = None) -> float:
+        """Возвращает, через сколько секунд наступит ближайший опрос"""
+        now = now or time.time()
+        with self._lock:
+            if not self.sources:
+                return self.max_interval
+            return max(0.0, min(self._entry(url)['next_due'] for url in self.sources) - now)
+
+    def record(self, url: str, new_items: int, now: float = None) -> float:
+        """Учитывает результат опроса и назначает следующий, возвращает интервал"""
+        now = now or time.time()
+        with self._lock:
+            entry = self._entry(url)
+            last_polled = entry['last_polled']
+            # Первый опрос отдаёт всю ленту, поэтому частоту по нему не оцениваем
+            if last_polled is not None and now > last_polled:
+                observed = new_items / (now - last_polled)
+                entry['rate'] = self.alpha * observed + (1 - self.alpha) * entry['rate']
+
+            if entry['rate'] > 0:
+                interval = self.target_items / entry['rate']
+            elif last_polled is not None:
+                # Новых записей ещё не было: постепенно реже опрашиваем источник
+                interval = entry['interval'] * 2
+            else:
+                interval = self.initial_interval
+            interval = min(max(interval, self.min_interval), self.max_interval)
+
+            entry['interval'] = interval
+            entry['next_due'] = now + interval * random.uniform(1 - self.jitter, 1 + self.jitter)
+            entry['last_polled'] = now
+            entry['polls'] += 1
+            return interval
+
+    def postpone(self, url: str, now: float = None) -> float:
+        """Назначает повтор неудавшегося опроса через текущий интервал.
+
+        Частота публикаций и интервал не меняются: опрос с ошибкой ничего
+        не говорит о ленте, а частые сбои разводит SourceHealth.
+        """
+        now = now or time.time()
+        with self._lock:
+            entry = self._entry(url)
+            entry['next_due'] = now + entry['interval'] * random.uniform(1 - self.jitter, 1 + self.jitter)
+            return entry['interval']
+
+    def get_stats(self) -> Dict[str, Dict]:
+        """Возвращает текущие интервалы и оценки частоты по источникам"""
+        with self._lock:
+            return {
+                url: {
+                    'interval': round(self._entry(url)['interval']),
+                    'items_per_hour': round(self._entry(url)['rate'] * 3600, 2),
+                    'polls': self._entry(url)['polls']
+                }
+                for url in self.sources
+            }
@@ -0,0 +1,153 @@
+"""
+Классификатор тем и фильтр новостей
+"""
+
+import re
+from typing import Dict, List, NamedTuple
+
+DEFAULT_TOPIC = 'общее'
+
+TOPIC_KEYWORDS: Dict[str, List[str]] = {
+    'экономика': [
+        'экономика', 'экономический', 'экономист', 'экономические', 'экономике',
+        'economy', 'economic', 'economics', 'economist', 'macroeconomics', 'microeconomics', 'growth', 'gdp', 'inflation', 'recession'
+    ],
+
+    'финансы': [
+        'финансы', 'финансовый', 'финансовые', 'банк', 'банки', 'кредит', 'деньги',
+        'finance', 'financial', 'bank', 'banks', 'credit', 'money', 'loan', 'monetary', 'cash', 'budget', 'liquidity', 'debt', 'funding'
+    ],
+
+    'рынки': [
+        'рынок', 'рынки', 'торговля', 'торговый', 'акции', 'облигации', 'индекс',
+        'market', 'markets', 'trade', 'trading', 'stocks', 'shares', 'bonds', 'index', 'indices', 'commodities', 'forex', 'exchange', 'derivatives'
+    ],
+
+    'технологии': [
+        'технология', 'технологии', 'технологический', 'инновации', 'стартап',
+        'technology', 'technologies', 'tech', 'innovation', 'innovations', 'startup', 'startups', 'ai', 'artificial intelligence', 'machine learning', 'blockchain', 'fintech', 'digital', 'automation', 'software'
+    ],
+
+    'инвестиции': [
+        'инвестиции', 'инвестиционный', 'инвестор', 'капитал', 'портфель',
+        'investment', 'investments', 'investor', 'investors', 'capital', 'portfolio', 'venture', 'fund', 'funds', 'asset', 'equity', 'returns', 'valuation', 'securities'
+    ]
+}
+
+_CYRILLIC_RE = re.compile(r'[а-яё]')
+
+# Английские ключевые слова не короче этой длины совпадают как начало слова
+# (loan → loans, trade → traders); более короткие (ai, gdp) — только целым словом
+MIN_PREFIX_KEYWORD_LENGTH = 4
+
+
+def _trie_pattern(words: List[str]) -> str:
+    """Строит регулярное выражение по префиксному дереву слов.
+
+    Общие префиксы вынесены за скобки (bank|banks -> bank(?:s)?), поэтому
+    движок регулярных выражений не перебирает все ключевые слова на каждой
+    позиции. Квантификаторы жадные: совпадает самое длинное слово.
+    """
+    trie: Dict = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[''] = {}
+
+    def build(node: Dict) -> str:
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else f"(?:{'|'.join(branches)})"
+        return f"(?:{body})?" if '' in node else body
+
+    return build(trie) if words else '(?!)'
+
+
+class Classification(NamedTuple):
+    """Результат классификации новости"""
+    topic: str
+    scores: Dict[str, int]
+    filtered: bool
+
+    @property
+    def topics(self) -> List[str]:
+        """Все найденные темы по убыванию числа совпадений"""
+        return sorted(self.scores, key=self.scores.get, reverse=True)
+
+
+class TopicClassifier:
+    """Определяет тему и необходимость фильтрации за один проход по тексту.
+
+    Все ключевые слова тем и фильтра собираются в одно регулярное выражение
+    по префиксному дереву.
+    Совпадение должно начинаться с границы слова и допускает окончание
+    (банк → банков, loan → loans); английские ключевые слова короче
+    MIN_PREFIX_KEYWORD_LENGTH совпадают только целым словом (ai не совпадает
+    с said) — в отличие от прежнего поиска подстрокой.
+    Основная тема — первая по порядку объявления тема с совпадениями,
+    число совпадений по всем темам доступно в Classification.scores.
+    """
+
+    def __init__(self, topic_keywords: Dict[str, List[str]] = None, filter_keywords: List[str] = None):
+        self.topic_keywords = topic_keywords if topic_keywords is not None else TOPIC_KEYWORDS
+        self.topic_order = list(self.topic_keywords)
+        self.filter_keywords = [kw.lower() for kw in (filter_keywords or [])]
+
+        # Ключевое слово -> темы, к которым оно относится, и признак фильтра
+        self._labels: Dict[str, tuple] = {}
+        for topic, keywords in self.topic_keywords.items():
+            for keyword in keywords:
+                topics, is_filter = self._labels.get(keyword.lower(), ((), False))
+                self._labels[keyword.lower()] = (topics + (topic,), is_filter)
+        for keyword in self.filter_keywords:
+            topics, _ = self._labels.get(keyword, ((), False))
+            self._labels[keyword] = (topics, True)
+
+        self._pattern = self._compile(self._labels)
+
+    @staticmethod
+    def _matches_prefix(keyword: str) -> bool:
+        return len(keyword) >= MIN_PREFIX_KEYWORD_LENGTH or bool(_CYRILLIC_RE.search(keyword))
+
+    @classmethod
+    def _compile(cls, keywords) -> re.Pattern:
+        prefix_words = [kw for kw in keywords if cls._matches_prefix(kw)]
+        whole_words = [kw for kw in keywords if not cls._matches_prefix(kw)]
+
+        # Опережающая проверка первого символа позволяет движку быстро
+        # пропускать позиции, с которых не начинается ни одно ключевое слово
+        first_chars = ''.join(sorted({re.escape(kw[0]) for kw in keywords})) or '^\\s\\S'
+
+        # Без групп: findall возвращает само ключевое слово. Окончание
+        # слова не захватывается, со следующих позиций внутри слова совпадений нет
+        return re.compile(
+            f"(?=[{first_chars}])(?<!\\w)"
+            f"(?:{_trie_pattern(prefix_words)}|{_trie_pattern(whole_words)}(?!\\w))"
+        )
+
+    def classify(self, title: str, description: str) -> Classification:
+        """Классифицирует новость по заголовку и описанию"""
+        text = f"{title} {description}".lower()
+        scores: Dict[str, int] = {}
+        filtered = False
+
+        labels = self._labels
+        for keyword in self._pattern.findall(text):
+            topics, is_filter = labels[keyword]
+            filtered = filtered or is_filter
+            for topic in topics:
+                scores[topic] = scores.get(topic, 0) + 1
+
+        # Основная тема — первая по порядку объявления тема с совпадениями, как в прежнем _detect_topic
+        topic = next((t for t in self.topic_order if t in scores), DEFAULT_TOPIC)
+        return Classification(topic, scores, filtered)
+
+    def detect_topic(self, title: str, description: str) -> str:
+        """Определяет основную тему новости"""
+        return self.classify(title, description).topic
+
+    def should_filter(self, title: str, description: str) -> bool:
+        """Проверяет, нужно ли фильтровать новость"""
+        return self.classify(title, description).filtered
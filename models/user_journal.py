@@ -0,0 +1,186 @@
+"""
+Журнал изменений пользователей (append-only)
+"""
+
+import json
+import logging
+import os
+from contextlib import contextmanager
+from typing import BinaryIO, Callable, List, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows: журнал используется одним процессом
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+
+class UserJournal:
+    """Журнал операций над пользователями в формате JSON Lines.
+
+    Каждая операция дописывается одной строкой (op, user_id, args), поэтому
+    стоимость записи не зависит от числа пользователей. При уплотнении
+    текущий журнал переименовывается в .old, а после записи снимка удаляется.
+
+    Если задан origin, журнал общий для нескольких процессов: записи
+    помечаются источником и дописываются под файловой блокировкой, а метод
+    follow применяет записи других процессов, появившиеся после replay.
+    """
+
+    def __init__(self, path: str, origin: Optional[str] = None):
+        self.path = path
+        self.old_path = f"{path}.old"
+        self.origin = origin
+        self.records = 0
+        self._file = None
+        self._reader: Optional[BinaryIO] = None
+        self._lock_file = None
+
+    def _open(self):
+        if self._file is not None and self.origin is not None and self._rotated(self._file):
+            # Журнал уплотнил другой процесс: дописываем уже в новый файл
+            self._file.close()
+            self._file = None
+        if self._file is None:
+            self._ensure_directory()
+            self._file = open(self.path, 'a', encoding='utf-8')
+        return self._file
+
+    def _ensure_directory(self) -> None:
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def _rotated(self, f) -> bool:
+        """Проверяет, что открытый файл больше не является текущим журналом"""
+        try:
+            return os.stat(self.path).st_ino != os.fstat(f.fileno()).st_ino
+        except FileNotFoundError:
+            return True
+
+    @contextmanager
+    def exclusive(self):
+        """Блокирует журнал для других процессов (только для общего журнала)"""
+        if self.origin is None or fcntl is None:
+            yield
+            return
+        if self._lock_file is None:
+            self._ensure_directory()
+            self._lock_file = open(f"{self.path}.lock", 'a')
+        fcntl.flock(self._lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(self._lock_file, fcntl.LOCK_UN)
+
+    def append(self, op: str, user_id: str, args: List) -> None:
+        """Дописывает операцию в журнал"""
+        record = [op, user_id, args] if self.origin is None else [op, user_id, args, self.origin]
+        line = json.dumps(record, ensure_ascii=False) + '\n'
+        with self.exclusive():
+            f = self._open()
+            f.write(line)
+            f.flush()
+        self.records += 1
+
+    def _read_records(self, f: BinaryIO, apply: Callable[[str, str, List], None],
+                      skip_own: bool = False) -> int:
+        """Применяет полные строки из файла, начиная с текущей позиции"""
+        count = 0
+        while True:
+            position = f.tell()
+            line = f.readline()
+            if not line:
+                break
+            if not line.endswith(b'\n'):
+                # Строка ещё дописывается: дочитаем её в следующий раз
+                f.seek(position)
+                break
+            try:
+                op, user_id, args, *origin = json.loads(line)
+            except ValueError:
+                # Недописанная последняя строка после аварийного завершения
+                logger.warning(f"Пропущена повреждённая запись журнала {f.name}")
+                continue
+            if skip_own and origin and origin[0] == self.origin:
+                continue
+            apply(op, user_id, args)
+            count += 1
+        return count
+
+    def replay(self, apply: Callable[[str, str, List], None]) -> int:
+        """Применяет записи из .old и текущего журнала, возвращает их количество"""
+        count = 0
+        if os.path.exists(self.old_path):
+            with open(self.old_path, 'rb') as f:
+                count += self._read_records(f, apply)
+        if os.path.exists(self.path):
+            f = open(self.path, 'rb')
+            count += self._read_records(f, apply)
+            if self.origin is not None:
+                # Общий журнал: продолжим чтение с этого места в follow
+                self._reader = f
+            else:
+                f.close()
+        self.records = count
+        return count
+
+    def follow(self, apply: Callable[[str, str, List], None]) -> int:
+        """Применяет записи других процессов, дописанные с прошлого чтения"""
+        if self.origin is None:
+            return 0
+
+        count = 0
+        if self._reader is None:
+            if not os.path.exists(self.path):
+                return 0
+            self._reader = open(self.path, 'rb')
+
+        count += self._read_records(self._reader, apply, skip_own=True)
+        if self._rotated(self._reader):
+            # Дочитываем записи, сделанные до ротации, и переходим на новый файл
+            count += self._read_records(self._reader, apply, skip_own=True)
+            self._reader.close()
+            self._reader = None
+            if os.path.exists(self.path):
+                self._reader = open(self.path, 'rb')
+                count += self._read_records(self._reader, apply, skip_own=True)
+
+        self.records += count
+        return count
+
+    def rotate(self) -> None:
+        """Начинает новый журнал; прежний сохраняется как .old до записи снимка.
+
+        Для общего журнала вызывается под exclusive() после follow, чтобы
+        снимок учитывал записи всех процессов.
+        """
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        if self._reader is not None:
+            self._reader.close()
+            self._reader = None
+        if os.path.exists(self.path):
+            if os.path.exists(self.old_path):
+                # Прошлый снимок не был записан: сохраняем обе части журнала
+                with open(self.path, 'r', encoding='utf-8') as src, \
+                        open(self.old_path, 'a', encoding='utf-8') as dst:
+                    dst.write(src.read())
+                os.remove(self.path)
+            else:
+                os.replace(self.path, self.old_path)
+        self.records = 0
+
+    def discard_old(self) -> None:
+        """Удаляет журнал, уже учтённый в снимке"""
+        if os.path.exists(self.old_path):
+            os.remove(self.old_path)
+
+    def close(self) -> None:
+        """Закрывает файлы журнала"""
+        for f in (self._file, self._reader, self._lock_file):
+            if f is not None:
+                f.close()
+        self._file = self._reader = self._lock_file = None
@@ -5,10 +5,13 @@
 import json
 import logging
 import os
+import threading
 import time
 from typing import Dict, List, Optional
 
 from config.settings import Settings
+from utils.file_utils import atomic_write_text
+from .user_journal import UserJournal
 
 logger = logging.getLogger(__name__)
 
@@ -16,13 +19,34 @@ logger = logging.getLogger(__name__)
 class UserManager:
     """Класс для управления пользователями и их настройками"""
     
-    def __init__(self):
+    def __init__(self, write_behind: Optional[bool] = None, journal: Optional[bool] = None,
+                 worker_id: Optional[int] = None):
         self.users_path = Settings.USERS_PATH
         self.users_data = {}
+        self.write_behind = Settings.USERS_WRITE_BEHIND if write_behind is None else write_behind
+        self.flush_interval = Settings.USERS_FLUSH_INTERVAL
+        # Несколько процессов бота делят пользователей через общий журнал;
+        # снимок пишет только основной процесс (worker_id = 0)
+        self.worker_id = worker_id
+        self.owns_snapshot = worker_id in (None, 0)
+        use_journal = Settings.USERS_JOURNAL if journal is None else journal
+        if worker_id is not None:
+            self.journal: Optional[UserJournal] = UserJournal(Settings.USERS_JOURNAL_PATH, origin=str(worker_id))
+        elif use_journal:
+            self.journal = UserJournal(Settings.USERS_JOURNAL_PATH)
+        else:
+            self.journal = None
+        self.compact_records = Settings.USERS_JOURNAL_COMPACT_RECORDS
+        self.compact_interval = Settings.USERS_JOURNAL_COMPACT_INTERVAL
+        self._last_compaction = time.monotonic()
+        self._lock = threading.RLock()
+        self._dirty = False
+        self._flusher: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
         self.load_users_data()
     
     def load_users_data(self) -> None:
-        """Загружает данные пользователей из файла"""
+        """Загружает снимок пользователей из файла и применяет журнал изменений"""
         try:
             if os.path.exists(self.users_path):
                 with open(self.users_path, 'r', encoding='utf-8') as f:
@@ -30,53 +54,207 @@ class UserManager:
         except Exception as e:
             logger.error(f"Ошибка загрузки пользователей: {e}")
             self.users_data = {}
+
+        if self.journal:
+            try:
+                replayed = self.journal.replay(self._apply)
+                if replayed:
+                    logger.info(f"Применено {replayed} записей журнала пользователей")
+            except Exception as e:
+                logger.error(f"Ошибка чтения журнала пользователей: {e}")
+
+    @staticmethod
+    def _new_user(created_at: float) -> Dict:
+        return {
+            'topics': [],
+            'favorites': [],
+            'created_at': created_at,
+            'last_activity': created_at
+        }
+
+    def _apply(self, op: str, user_id: str, args: List) -> None:
+        """Применяет операцию журнала к данным в памяти.
+
+        Операции идемпотентны: повторное применение части журнала, уже
+        учтённой в снимке, не меняет результат.
+        """
+        if op == 'delete':
+            user = self.users_data.get(user_id)
+            # Удаляем только тот экземпляр пользователя, который был удалён
+            if user is not None and user.get('created_at') == args[0]:
+                del self.users_data[user_id]
+            return
+
+        if op == 'create':
+            self.users_data.setdefault(user_id, self._new_user(args[0]))
+            return
+
+        user = self.users_data.setdefault(user_id, self._new_user(time.time()))
+        if op == 'touch':
+            user['last_activity'] = max(user.get('last_activity', 0), args[0])
+        elif op == 'add_topic':
+            if args[0] not in user['topics']:
+                user['topics'].append(args[0])
+        elif op == 'remove_topic':
+            if args[0] in user['topics']:
+                user['topics'].remove(args[0])
+        elif op == 'add_favorite':
+            if args[0] not in user['favorites']:
+                user['favorites'].append(args[0])
+        elif op == 'remove_favorite':
+            if args[0] in user['favorites']:
+                user['favorites'].remove(args[0])
+        else:
+            logger.warning(f"Неизвестная операция журнала пользователей: {op}")
+
+    def _record(self, op: str, user_id: str, *args) -> None:
+        """Применяет операцию и, если включён журнал, дописывает её туда"""
+        with self._lock:
+            self._apply(op, user_id, list(args))
+            if self.journal:
+                self.journal.append(op, user_id, list(args))
+
+    def _persist(self) -> None:
+        """Сохраняет изменения: журналу достаточно фонового уплотнения"""
+        if self.journal:
+            self._start_flusher()
+        else:
+            self._mark_dirty()
+
+    def _commit(self, op: str, user_id: str, *args) -> None:
+        """Применяет операцию и сохраняет её"""
+        self._record(op, user_id, *args)
+        self._persist()
     
     def save_users_data(self) -> None:
-        """Сохраняет данные пользователей в файл"""
+        """Атомарно сохраняет данные пользователей в файл"""
         try:
-            os.makedirs(os.path.dirname(self.users_path), exist_ok=True)
-            with open(self.users_path, 'w', encoding='utf-8') as f:
-                json.dump(self.users_data, f, ensure_ascii=False, indent=2)
+            # Сериализуем под блокировкой, чтобы снимок был согласованным
+            with self._lock:
+                text = json.dumps(self.users_data, ensure_ascii=False, indent=2)
+                self._dirty = False
+            atomic_write_text(self.users_path, text)
         except Exception as e:
             logger.error(f"Ошибка сохранения пользователей: {e}")
+            with self._lock:
+                self._dirty = True
+
+    def _mark_dirty(self) -> None:
+        """Фиксирует изменение: сразу пишет файл или откладывает запись"""
+        if not self.write_behind:
+            self.save_users_data()
+            return
+
+        with self._lock:
+            self._dirty = True
+            self._start_flusher()
+
+    def _start_flusher(self) -> None:
+        """Запускает фоновый поток записи, если он ещё не запущен"""
+        with self._lock:
+            if self._flusher is None:
+                self._flusher = threading.Thread(
+                    target=self._flush_loop, name='users-flusher', daemon=True)
+                self._flusher.start()
+
+    def _flush_loop(self) -> None:
+        """Фоновая запись: все изменения за интервал сохраняются одной записью"""
+        while not self._stop_event.wait(self.flush_interval):
+            if self.journal:
+                self._maybe_compact()
+            else:
+                self.flush()
+
+    def flush(self) -> None:
+        """Сохраняет накопленные изменения, если они есть"""
+        if self._dirty:
+            self.save_users_data()
+
+    def sync_from_journal(self) -> int:
+        """Применяет изменения, сделанные другими процессами бота"""
+        if not self.journal:
+            return 0
+        try:
+            with self._lock:
+                return self.journal.follow(self._apply)
+        except Exception as e:
+            logger.error(f"Ошибка чтения журнала пользователей: {e}")
+            return 0
+
+    def _maybe_compact(self) -> None:
+        """Уплотняет журнал, если он разросся или давно не уплотнялся"""
+        if not self.owns_snapshot or not self.journal.records:
+            return
+        if (self.journal.records >= self.compact_records
+                or time.monotonic() - self._last_compaction >= self.compact_interval):
+            self.compact()
+
+    def compact(self) -> None:
+        """Записывает снимок пользователей и начинает журнал заново"""
+        try:
+            # Снимок и ротация журнала выполняются атомарно относительно изменений
+            # (в том числе других процессов); запись файла идёт уже без блокировки
+            with self._lock, self.journal.exclusive():
+                self.journal.follow(self._apply)
+                text = json.dumps(self.users_data, ensure_ascii=False, indent=2)
+                records = self.journal.records
+                self.journal.rotate()
+            atomic_write_text(self.users_path, text)
+            self.journal.discard_old()
+            self._last_compaction = time.monotonic()
+            logger.info(f"Журнал пользователей уплотнён, записей: {records}")
+        except Exception as e:
+            logger.error(f"Ошибка уплотнения журнала пользователей: {e}")
+
+    def close(self) -> None:
+        """Останавливает фоновую запись и сохраняет оставшиеся изменения"""
+        self._stop_event.set()
+        if self._flusher is not None:
+            self._flusher.join()
+            self._flusher = None
+        if self.journal:
+            if self.owns_snapshot and self.journal.records:
+                self.compact()
+            self.journal.close()
+        else:
+            self.flush()
     
     def get_user(self, user_id: str) -> Dict:
         """Получает данные пользователя"""
-        if user_id not in self.users_data:
-            self.users_data[user_id] = {
-                'topics': [],
-                'favorites': [],
-                'created_at': time.time(),
-                'last_activity': time.time()
-            }
-        return self.users_data[user_id]
+        with self._lock:
+            if user_id not in self.users_data:
+                created_at = time.time()
+                self.users_data[user_id] = self._new_user(created_at)
+                if self.journal:
+                    self.journal.append('create', user_id, [created_at])
+            return self.users_data[user_id]
     
     def update_user_activity(self, user_id: str) -> None:
         """Обновляет время последней активности пользователя"""
-        user = self.get_user(user_id)
-        user['last_activity'] = time.time()
-        self.save_users_data()
+        with self._lock:
+            self.get_user(user_id)
+            self._commit('touch', user_id, time.time())
     
     def add_topic(self, user_id: str, topic: str) -> bool:
         """Добавляет тему для пользователя"""
         if topic not in Settings.AVAILABLE_TOPICS:
             return False
             
-        user = self.get_user(user_id)
-        if topic not in user['topics']:
-            user['topics'].append(topic)
-            self.save_users_data()
-            return True
-        return False
+        with self._lock:
+            user = self.get_user(user_id)
+            if topic in user['topics']:
+                return False
+            self._commit('add_topic', user_id, topic)
+        return True
     
     def remove_topic(self, user_id: str, topic: str) -> bool:
         """Удаляет тему для пользователя"""
-        user = self.get_user(user_id)
-        if topic in user['topics']:
-            user['topics'].remove(topic)
-            self.save_users_data()
-            return True
-        return False
+        with self._lock:
+            user = self.get_user(user_id)
+            if topic not in user['topics']:
+                return False
+            self._commit('remove_topic', user_id, topic)
+        return True
     
     def get_user_topics(self, user_id: str) -> List[str]:
         """Получает список тем пользователя"""
@@ -85,21 +263,21 @@ class UserManager:
     
     def add_favorite(self, user_id: str, news_id: str) -> bool:
         """Добавляет новость в избранное"""
-        user = self.get_user(user_id)
-        if news_id not in user['favorites']:
-            user['favorites'].append(news_id)
-            self.save_users_data()
-            return True
-        return False
+        with self._lock:
+            user = self.get_user(user_id)
+            if news_id in user['favorites']:
+                return False
+            self._commit('add_favorite', user_id, news_id)
+        return True
     
     def remove_favorite(self, user_id: str, news_id: str) -> bool:
         """Удаляет новость из избранного"""
-        user = self.get_user(user_id)
-        if news_id in user['favorites']:
-            user['favorites'].remove(news_id)
-            self.save_users_data()
-            return True
-        return False
+        with self._lock:
+            user = self.get_user(user_id)
+            if news_id not in user['favorites']:
+                return False
+            self._commit('remove_favorite', user_id, news_id)
+        return True
     
     def get_user_favorites(self, user_id: str) -> List[str]:
         """Получает список избранных новостей пользователя"""
@@ -126,22 +304,46 @@ class UserManager:
         """Получает список доступных тем"""
         return Settings.AVAILABLE_TOPICS.copy()
     
+    def remap_favorites(self, id_mapping: Dict[str, str]) -> int:
+        """Заменяет ID новостей в избранном и сразу записывает снимок.
+
+        Используется при миграции формата ID; возвращает число заменённых ссылок.
+        """
+        replaced = 0
+        with self._lock:
+            for user in self.users_data.values():
+                favorites = []
+                for news_id in user.get('favorites', []):
+                    new_id = id_mapping.get(news_id, news_id)
+                    replaced += new_id != news_id
+                    if new_id not in favorites:
+                        favorites.append(new_id)
+                user['favorites'] = favorites
+
+        # Изменения не журналируются, поэтому фиксируем их снимком
+        if self.journal:
+            self.compact()
+        else:
+            self.save_users_data()
+        return replaced
+    
     def cleanup_inactive_users(self, days_inactive: int = 30) -> int:
         """Удаляет неактивных пользователей"""
         current_time = time.time()
         inactive_threshold = current_time - (days_inactive * 24 * 60 * 60)
         
-        inactive_users = []
-        for user_id, user_data in self.users_data.items():
-            last_activity = user_data.get('last_activity', 0)
-            if last_activity < inactive_threshold:
-                inactive_users.append(user_id)
-        
-        for user_id in inactive_users:
-            del self.users_data[user_id]
+        with self._lock:
+            inactive_users = []
+            for user_id, user_data in self.users_data.items():
+                last_activity = user_data.get('last_activity', 0)
+                if last_activity < inactive_threshold:
+                    inactive_users.append(user_id)
+            
+            for user_id in inactive_users:
+                self._record('delete', user_id, self.users_data[user_id].get('created_at'))
         
         if inactive_users:
-            self.save_users_data()
+            self._persist()
             logger.info(f"Удалено {len(inactive_users)} неактивных пользователей")
         
         return len(inactive_users)
@@ -180,7 +180,7 @@ try:
     import aiogram
     import feedparser
     import requests
-    import schedule
+    import pytz
     print('✅ Все основные зависимости импортированы успешно')
 except ImportError as e:
     print(f'❌ Ошибка импорта: {e}')
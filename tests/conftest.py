@@ -0,0 +1,76 @@
+"""
+Общие настройки тестов
+"""
+
+import os
+import sys
+from email.utils import formatdate
+from typing import Dict, List
+from xml.sax.saxutils import escape
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# Настройки читают sources.json относительно текущего каталога
+os.environ.setdefault('SOURCES_FILE', os.path.join(ROOT, 'sources.json'))
+
+from config.settings import Settings
+from models.feed_cache import FeedCache
+from models.news_aggregator import NewsAggregator
+from models.news_storage import JsonNewsStorage
+
+
+@pytest.fixture
+def data_paths(tmp_path, monkeypatch):
+    """Направляет все файлы данных во временный каталог"""
+    for name in dir(Settings):
+        if name.endswith('_PATH') and name != 'WEBHOOK_PATH':
+            monkeypatch.setattr(Settings, name, str(tmp_path / os.path.basename(getattr(Settings, name))))
+    return tmp_path
+
+
+def make_rss(entries: List[Dict]) -> bytes:
+    """Собирает RSS-ленту из записей с полями title, link, guid, description и published"""
+    items = []
+    for entry in entries:
+        fields = [f"<title>{escape(entry['title'])}</title>"]
+        if entry.get('link'):
+            fields.append(f"<link>{escape(entry['link'])}</link>")
+        if entry.get('guid'):
+            fields.append(f"<guid>{escape(entry['guid'])}</guid>")
+        fields.append(f"<description>{escape(entry.get('description', ''))}</description>")
+        if entry.get('published') is not None:
+            fields.append(f"<pubDate>{formatdate(entry['published'])}</pubDate>")
+        items.append(f"<item>{''.join(fields)}</item>")
+    return f"<rss version=\"2.0\"><channel><title>Лента</title>{''.join(items)}</channel></rss>".encode('utf-8')
+
+
+@pytest.fixture
+def make_aggregator(data_paths, monkeypatch):
+    """Создаёт NewsAggregator над временными файлами.
+
+    Ленты задаются словарём URL → список записей (см. make_rss); его можно
+    менять между циклами сбора, сеть не используется.
+    """
+    created = []
+
+    def factory(feeds: Dict[str, List[Dict]], **settings):
+        monkeypatch.setattr(Settings, 'SOURCES', list(feeds))
+        monkeypatch.setattr(Settings, 'ADAPTIVE_POLLING', False)
+        for name, value in settings.items():
+            monkeypatch.setattr(Settings, name, value)
+        aggregator = NewsAggregator(storage=JsonNewsStorage(Settings.DATABASE_PATH))
+
+        def download(url):
+            content = make_rss(feeds[url])
+            return content, {'etag': None, 'last_modified': None, 'content_hash': FeedCache.content_hash(content)}
+
+        aggregator._download_feed = download
+        created.append(aggregator)
+        return aggregator
+
+    yield factory
+    for aggregator in created:
+        aggregator.close()
@@ -0,0 +1,43 @@
+"""
+Тесты фильтра Блума с поколениями
+"""
+
+from utils.bloom_filter import BloomFilter
+
+
+def test_added_items_are_found_and_false_positive_rate_is_low():
+    bloom = BloomFilter(capacity=2000, error_rate=0.01)
+    for i in range(2000):
+        bloom.add(f"added_{i}")
+
+    assert all(f"added_{i}" in bloom for i in range(2000))
+    false_positives = sum(f"other_{i}" in bloom for i in range(10000))
+    assert false_positives < 300
+
+
+def test_generations_forget_oldest_items():
+    bloom = BloomFilter(capacity=100, error_rate=0.001)
+    for i in range(250):
+        bloom.add(f"item_{i}")
+
+    # Первое поколение вытеснено, два последних на месте (граница поколения
+    # может сдвинуться на несколько строк из-за ложных срабатываний)
+    assert all(f"item_{i}" in bloom for i in range(110, 250))
+    assert sum(f"item_{i}" in bloom for i in range(90)) < 5
+    assert 140 <= len(bloom) <= 150
+
+
+def test_save_and_load_roundtrip(tmp_path):
+    path = str(tmp_path / 'seen.bloom')
+    bloom = BloomFilter(capacity=100, error_rate=0.001)
+    for i in range(150):
+        bloom.add(f"item_{i}")
+    bloom.save(path)
+
+    loaded = BloomFilter.load(path, capacity=100, error_rate=0.001)
+    assert all(f"item_{i}" in loaded for i in range(150))
+    assert len(loaded) == len(bloom)
+    assert not loaded.dirty
+
+    # Другие параметры: файл несовместим, фильтр создаётся пустым
+    assert len(BloomFilter.load(path, capacity=500, error_rate=0.001)) == 0
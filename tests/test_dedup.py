@@ -0,0 +1,103 @@
+"""
+Тесты поиска почти одинаковых новостей
+"""
+
+import time
+
+from models.dedup import NearDuplicateIndex
+from models.news_item import NewsItem
+from views.message_formatter import MessageFormatter
+
+STORY = "Federal Reserve holds interest rates steady as inflation cools in march"
+DJ_TOP = 'https://feeds.content.dowjones.io/public/rss/mw_topstories'
+DJ_MARKETS = 'https://feeds.content.dowjones.io/public/rss/mw_marketpulse'
+
+
+def make_news(news_id: str, title: str, published: float = 1000.0, source: str = 'a.com',
+              feed: str = None) -> NewsItem:
+    return NewsItem(
+        id=news_id, title=title, link='', description='Markets reacted across the board.',
+        source=source, topic='экономика', published=published, timestamp=published,
+        feed=f"https://{source}/rss" if feed is None else feed
+    )
+
+
+def test_finds_reworded_story_within_window():
+    index = NearDuplicateIndex(window=3600)
+    index.add(make_news('a', STORY))
+
+    assert index.find(make_news('b', STORY.replace('holds', 'keeps') + ' - report', 1500.0, 'b.com')) == 'a'
+    assert index.find(make_news('c', 'Oil prices jump after OPEC announces surprise production cuts', 1000.0, 'b.com')) is None
+
+
+def test_window_uses_publication_time():
+    index = NearDuplicateIndex(window=3600)
+    index.add(make_news('a', STORY, published=1000.0))
+
+    later = make_news('b', STORY, published=1000.0 + 7200, source='b.com').replace(timestamp=1000.0)
+    assert index.find(later) is None
+
+
+def test_same_feed_is_never_matched():
+    index = NearDuplicateIndex()
+    index.add(make_news('a', STORY, source='feeds.content.dowjones.io', feed=DJ_TOP))
+
+    assert index.find(make_news('b', STORY, source='feeds.content.dowjones.io', feed=DJ_TOP)) is None
+    # Другая лента на том же хосте
+    assert index.find(make_news('c', STORY, source='feeds.content.dowjones.io', feed=DJ_MARKETS)) == 'a'
+    # Новость, сохранённая без поля feed, сравнивается по хосту
+    index.add(make_news('old', STORY, source='b.com', feed=''))
+    assert index.find(make_news('d', STORY, source='b.com')) == 'a'
+
+
+def test_remove_and_rebuild():
+    index = NearDuplicateIndex()
+    first = make_news('a', STORY)
+    index.add(first)
+    index.remove('a')
+    assert index.find(make_news('b', STORY, source='b.com')) is None
+    assert len(index) == 0
+
+    index.rebuild([first, make_news('short', 'Коротко').replace(description='')])
+    assert len(index) == 1
+    assert index.find(make_news('b', STORY, source='b.com')) == 'a'
+
+
+def templated_entries(start: int, count: int, published: float):
+    return [{
+        'title': f"Company {i} reports quarterly earnings above analyst expectations",
+        'link': f"https://example.com/earnings/{i}",
+        'description': 'Shares moved in extended trading after the results were released.',
+        'published': published,
+    } for i in range(start, start + count)]
+
+
+def test_templated_articles_from_one_feed_are_all_kept(make_aggregator):
+    now = time.time()
+    feeds = {'https://example.com/rss': templated_entries(0, 5, now)}
+    aggregator = make_aggregator(feeds)
+    aggregator.update_news_database()
+    assert aggregator.get_news_count() == 5
+
+    feeds['https://example.com/rss'] = templated_entries(5, 3, now) + feeds['https://example.com/rss']
+    aggregator.update_news_database()
+
+    assert aggregator.get_news_count() == 8
+    assert all(not news.alt_sources for news in aggregator.store.items)
+
+
+def test_story_from_sibling_feed_on_same_host_is_merged(make_aggregator):
+    now = time.time()
+    story = {'title': STORY, 'description': 'Markets reacted across the board.', 'published': now}
+    feeds = {
+        DJ_TOP: [dict(story, link='https://www.marketwatch.com/story/fed-holds')],
+        DJ_MARKETS: [dict(story, link='https://www.marketwatch.com/story/fed-holds-rates', title=STORY + ' - live')],
+    }
+    aggregator = make_aggregator(feeds)
+    aggregator.update_news_database()
+
+    [news] = aggregator.store.items
+    assert news.feed == DJ_TOP
+    assert news.alt_sources == (DJ_MARKETS,)
+    assert MessageFormatter.format_source(news) == (
+        'feeds.content.dowjones.io (+ feeds.content.dowjones.io/public/rss/mw_marketpulse)')
@@ -0,0 +1,48 @@
+"""
+Тесты планировщика ежедневной рассылки
+"""
+
+from controllers.digest_planner import DigestPlanner
+
+
+class FakeAggregator:
+    def __init__(self, news_by_topic):
+        self.news_by_topic = news_by_topic
+        self.requests = []
+
+    def get_news_by_topics(self, topics, limit=None):
+        self.requests.append(tuple(topics))
+        return [news for topic in topics for news in self.news_by_topic.get(topic, [])][:limit]
+
+
+class FakeFormatter:
+    @staticmethod
+    def format_daily_digest(news_list):
+        return ' | '.join(news_list)
+
+
+def test_plan_renders_each_topic_set_once():
+    aggregator = FakeAggregator({'рынки': ['Рынки растут'], 'финансы': ['Банки отчитались']})
+    planner = DigestPlanner(aggregator, FakeFormatter())
+    users = {
+        '1': {'topics': ['рынки', 'финансы']},
+        '2': {'topics': ['финансы', 'рынки', 'рынки']},
+        '3': {'topics': ['рынки']},
+        '4': {'topics': []},
+    }
+
+    plan = planner.plan(users)
+
+    groups = {group.topics: group for group in plan}
+    assert sorted(aggregator.requests) == [('рынки',), ('рынки', 'финансы')]
+    assert groups[('рынки', 'финансы')].user_ids == ['1', '2']
+    assert groups[('рынки', 'финансы')].text == 'Рынки растут | Банки отчитались'
+    assert groups[('рынки',)].user_ids == ['3']
+
+
+def test_plan_keeps_group_without_news():
+    planner = DigestPlanner(FakeAggregator({}), FakeFormatter())
+
+    plan = planner.plan({'1': {'topics': ['технологии']}})
+
+    assert [(group.topics, group.text, group.user_ids) for group in plan] == [(('технологии',), None, ['1'])]
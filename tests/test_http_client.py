@@ -0,0 +1,87 @@
+"""
+Тесты HTTP-клиента загрузки RSS
+"""
+
+import gzip
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+from utils.http_client import HttpClient, ResponseTooLarge
+
+FEED = b'<rss><channel><title>' + b'x' * 2000 + b'</title></channel></rss>'
+
+
+class FeedHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    connections = 0
+
+    def setup(self):
+        super().setup()
+        FeedHandler.connections += 1
+
+    def do_GET(self):
+        if self.path == '/missing':
+            self._reply(404, b'not found')
+        elif self.path == '/gzip' and 'gzip' in self.headers.get('Accept-Encoding', ''):
+            self._reply(200, gzip.compress(FEED), {'Content-Encoding': 'gzip'})
+        elif self.path == '/bomb':
+            # Маленькое сжатое тело, которое после распаковки больше лимита
+            self._reply(200, gzip.compress(b'0' * 100000), {'Content-Encoding': 'gzip'})
+        else:
+            self._reply(200, FEED, {'ETag': '"v1"'})
+
+    def _reply(self, status, body, headers=None):
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    FeedHandler.connections = 0
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), FeedHandler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+@pytest.fixture
+def client():
+    client = HttpClient(pool_connections=2, pool_maxsize=2, max_bytes=10000, timeout=(2, 2))
+    yield client
+    client.close()
+
+
+def test_reuses_connection_and_decompresses(server, client):
+    plain = client.get(f"{server}/feed")
+    compressed = client.get(f"{server}/gzip")
+
+    assert plain.content == compressed.content == FEED
+    assert plain.headers['ETag'] == '"v1"'
+    assert FeedHandler.connections == 1
+    assert client.stats['requests'] == 2
+
+
+def test_error_status_raises(server, client):
+    response = client.get(f"{server}/missing")
+
+    with pytest.raises(requests.HTTPError):
+        response.raise_for_status()
+
+
+def test_body_limit_applies_to_decompressed_size(server, client):
+    with pytest.raises(ResponseTooLarge):
+        client.get(f"{server}/bomb")
+
+    assert client.stats['too_large'] == 1
@@ -0,0 +1,57 @@
+"""
+Тесты стабильных ID новостей
+"""
+
+import time
+
+import pytest
+
+from models.news_id import canonicalize_link, make_news_id
+
+FEED = 'https://example.com/rss'
+
+
+def test_canonicalize_link_drops_tracking_and_normalizes():
+    link = 'HTTPS://Example.COM/news/1/?utm_source=tg&b=2&fbclid=x&a=1#comments'
+
+    assert canonicalize_link(link) == 'https://example.com/news/1?a=1&b=2'
+    assert canonicalize_link('https://example.com') == 'https://example.com/'
+
+
+def test_id_is_stable_and_ignores_tracking_parameters():
+    news_id = make_news_id('example.com', 'https://example.com/news/1?utm_medium=rss')
+
+    assert news_id == make_news_id('example.com', 'https://example.com/news/1/')
+    assert news_id.startswith('example.com_')
+    assert news_id != make_news_id('example.com', 'https://example.com/news/2')
+
+
+def test_id_falls_back_to_guid_then_title_and_publication_time():
+    assert make_news_id('example.com', None, 'urn:1') != make_news_id('example.com', None, 'urn:2')
+    assert make_news_id('example.com', '', ' urn:1 ') == make_news_id('example.com', None, 'urn:1')
+
+    first = make_news_id('example.com', None, None, 'Сводка рынков', 1700000000)
+    assert first == make_news_id('example.com', None, '', 'Сводка рынков', 1700000000.4)
+    assert first != make_news_id('example.com', None, None, 'Сводка рынков', 1700086400)
+    assert first != make_news_id('example.com', None, None, 'Сводка валют', 1700000000)
+
+
+def test_entry_without_any_key_is_rejected():
+    with pytest.raises(ValueError):
+        make_news_id('example.com', None, None, '  ')
+
+
+def test_entries_without_link_and_guid_are_not_collapsed(make_aggregator):
+    now = time.time()
+    feeds = {FEED: [
+        {'title': 'Курс доллара на утро', 'published': now - 7200},
+        {'title': 'Курс доллара на вечер', 'published': now - 3600},
+    ]}
+    aggregator = make_aggregator(feeds, NEAR_DUPLICATE_DETECTION=False)
+    aggregator.update_news_database()
+
+    feeds[FEED].append({'title': 'Курс доллара на ночь', 'published': now})
+    aggregator.update_news_database()
+
+    assert sorted(news.title for news in aggregator.store.items) == [
+        'Курс доллара на вечер', 'Курс доллара на ночь', 'Курс доллара на утро']
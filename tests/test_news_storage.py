@@ -0,0 +1,203 @@
+"""
+Тесты хранилищ базы новостей
+"""
+
+import time
+
+import pytest
+
+from models.news_item import NewsItem
+from models.news_storage import JsonNewsStorage, NdjsonNewsStorage, PartitionedNewsStorage, SqliteNewsStorage
+
+TOPICS = ['экономика', 'финансы', 'рынки']
+BACKENDS = ['json', 'sqlite', 'ndjson', 'partitioned']
+
+
+def make_record(index: int, timestamp: float, **changes) -> dict:
+    news = NewsItem(
+        id=f"example.com_{index:04d}",
+        title=f"Новость «{index}»",
+        link=f"https://example.com/{index}",
+        description='Описание с юникодом: ₽, ё',
+        source='example.com',
+        topic=TOPICS[index % len(TOPICS)],
+        published=timestamp - 60,
+        timestamp=timestamp
+    )
+    return news.replace(**changes).to_dict()
+
+
+def open_storage(backend: str, directory):
+    if backend == 'json':
+        return JsonNewsStorage(str(directory / 'news.json'))
+    if backend == 'sqlite':
+        return SqliteNewsStorage(str(directory / 'news.db'))
+    if backend == 'ndjson':
+        return NdjsonNewsStorage(str(directory / 'news.ndjson'))
+    return PartitionedNewsStorage(str(directory / 'partitions'), 'hour', retention_days=30, compress_after_days=2)
+
+
+@pytest.fixture(params=BACKENDS)
+def backend(request):
+    return request.param
+
+
+@pytest.fixture
+def storage(backend, tmp_path):
+    storage = open_storage(backend, tmp_path)
+    yield storage
+    storage.close()
+
+
+@pytest.fixture
+def records():
+    # Свежие записи, разнесённые по нескольким часовым партициям
+    now = time.time()
+    return [make_record(i, now - i * 600) for i in range(40)]
+
+
+def ids(news_list):
+    return [news['id'] for news in news_list]
+
+
+def test_save_all_roundtrip(storage, records):
+    storage.save_all(records)
+
+    assert storage.load_all() == records
+    assert storage.count() == len(records)
+    assert ids(storage.load_recent(7)) == ids(records[:7])
+    assert NewsItem.from_dict(storage.get_by_id(records[12]['id'])).to_dict() == records[12]
+    assert storage.get_by_id('missing') is None
+
+
+def test_get_by_topics_pages(storage, records):
+    storage.save_all(records)
+
+    expected = [news for news in records if news['topic'] in ('финансы', 'рынки')]
+    assert storage.get_by_topics(['финансы', 'рынки']) == expected
+    assert ids(storage.get_by_topics(['финансы', 'рынки'], limit=5, offset=5)) == ids(expected[5:10])
+
+
+def test_append_news_upserts_and_changes_version(storage, records):
+    storage.save_all(records[10:])
+    version = storage.version()
+
+    replaced = dict(records[15], title='Заголовок обновлён', alt_sources=['other.com'])
+    storage.append_news(records[:10] + [replaced], max_count=1000)
+
+    loaded = storage.load_all()
+    assert ids(loaded) == ids(records)
+    assert storage.get_by_id(replaced['id']) == replaced
+    assert storage.version() != version
+
+
+def test_append_news_removes_evicted(backend, storage, records):
+    if backend == 'partitioned':
+        pytest.skip('партиции ограничиваются сроком хранения, а не max_count')
+    storage.save_all(records[5:30])
+
+    storage.append_news(records[:5], max_count=25, evicted_ids=ids(records[25:30]))
+
+    assert ids(storage.load_all()) == ids(records[:25])
+
+
+def test_append_news_trims_to_max_count(backend, storage, records):
+    if backend == 'partitioned':
+        pytest.skip('партиции ограничиваются сроком хранения, а не max_count')
+    storage.save_all(records[5:])
+
+    storage.append_news(records[:5], max_count=20)
+
+    assert ids(storage.load_all()) == ids(records[:20])
+
+
+def test_reopened_storage_reads_same_data(backend, storage, records, tmp_path):
+    storage.save_all(records[3:])
+    storage.append_news(records[:3], max_count=1000)
+
+    reopened = open_storage(backend, tmp_path)
+    try:
+        assert reopened.load_all() == records
+    finally:
+        reopened.close()
+
+
+
+def test_ndjson_compaction_keeps_live_records(tmp_path, records):
+    storage = NdjsonNewsStorage(str(tmp_path / 'news.ndjson'))
+    storage.COMPACT_MIN_GARBAGE = 5
+    storage.save_all(records[1:])
+    for round_number in range(3):
+        storage.append_news([dict(news, title=f"правка {round_number}") for news in records[10:30]], max_count=1000)
+    storage.append_news(records[:1], max_count=1000)
+
+    expected = records[:10] + [dict(news, title='правка 2') for news in records[10:30]] + records[30:]
+    assert storage.load_all() == expected
+    # Уплотнение переписало базу в файл следующего поколения, старый удалён
+    data_files = [path.name for path in tmp_path.glob('news.*.ndjson')]
+    assert len(data_files) == 1 and data_files != ['news.0.ndjson']
+    storage.close()
+
+
+def test_ndjson_path_without_extension(tmp_path, records):
+    storage = NdjsonNewsStorage(str(tmp_path / 'news'))
+    storage.save_all(records)
+    storage.close()
+
+    reopened = NdjsonNewsStorage(str(tmp_path / 'news'))
+    assert reopened.load_all() == records
+    assert [path.name for path in tmp_path.glob('news.*.ndjson')] == ['news.0.ndjson']
+    reopened.close()
+
+
+def test_partitioned_drops_expired_and_compresses_cold_partitions(tmp_path):
+    now = time.time()
+    storage = PartitionedNewsStorage(str(tmp_path), 'day', retention_days=10, compress_after_days=2)
+    fresh = make_record(1, now)
+    cold = make_record(2, now - 5 * 86400)
+    expired = make_record(3, now - 20 * 86400)
+
+    storage.save_all([fresh, cold, expired])
+
+    assert storage.load_all() == [fresh, cold]
+    assert sorted(path.suffix for path in tmp_path.glob('*-*')) == ['.gz', '.json']
+
+
+def test_partitioned_keeps_unreadable_cold_partition(tmp_path):
+    now = time.time()
+    storage = PartitionedNewsStorage(str(tmp_path), 'day', retention_days=10, compress_after_days=0)
+    fresh = make_record(1, now)
+    storage.save_all([fresh, make_record(2, now - 5 * 86400)])
+    cold_file = sorted(tmp_path.glob('*-*.json'))[0]
+    cold_file.write_text('не JSON')
+
+    storage.compress_after_days = 2
+    storage.append_news([make_record(3, now + 1)], max_count=1000)
+
+    assert ids(storage.load_all()) == ids([make_record(3, now + 1), fresh])
+    # Нечитаемый файл не сжат и не удалён: его можно восстановить вручную
+    assert cold_file.read_text() == 'не JSON'
+    assert not list(tmp_path.glob('*.gz'))
+
+
+def test_partitioned_append_does_not_overwrite_partition_after_read_error(tmp_path, monkeypatch):
+    now = time.time()
+    storage = PartitionedNewsStorage(str(tmp_path), 'day', retention_days=10, compress_after_days=2)
+    records = [make_record(i, now - i) for i in range(1, 51)]
+    storage.save_all(records)
+
+    load_partition = storage._load_partition
+    failures = iter([OSError('сбой чтения')])
+
+    def flaky_load(entry):
+        error = next(failures, None)
+        if error is not None:
+            raise error
+        return load_partition(entry)
+
+    monkeypatch.setattr(storage, '_load_partition', flaky_load)
+    storage.append_news([make_record(0, now)], max_count=1000)
+    assert ids(storage.load_all()) == ids(records)
+
+    storage.append_news([make_record(0, now)], max_count=1000)
+    assert ids(storage.load_all()) == ids([make_record(0, now)] + records)
@@ -0,0 +1,98 @@
+"""
+Тесты резидентного снимка базы новостей
+"""
+
+import random
+
+import pytest
+
+from models.news_item import NewsItem
+from models.news_store import NewsStore
+
+TOPICS = ['экономика', 'финансы', 'рынки']
+
+
+def make_news(index: int, timestamp: float, topic: str = None, title: str = None) -> NewsItem:
+    return NewsItem(
+        id=f"source_{index}",
+        title=title or f"Новость {index}",
+        link=f"https://example.com/{index}",
+        description='',
+        source='example.com',
+        topic=topic or TOPICS[index % len(TOPICS)],
+        published=timestamp,
+        timestamp=timestamp
+    )
+
+
+def expected_snapshot(base, added, updated, max_count):
+    """Эталон: полная пересортировка и обрезка по max_count"""
+    by_id = {news.id: news for news in base}
+    for news in updated:
+        if news.id in by_id:
+            by_id[news.id] = news
+    for news in added:
+        by_id.setdefault(news.id, news)
+    ordered = sorted(by_id.values(), key=lambda news: news.timestamp, reverse=True)
+    if max_count is None:
+        return ordered, []
+    return ordered[:max_count], ordered[max_count:]
+
+
+def assert_consistent(store: NewsStore, expected):
+    assert [news.id for news in store.items] == [news.id for news in expected]
+    assert [news.title for news in store.items] == [news.title for news in expected]
+    assert store.by_id == {news.id: news for news in expected}
+    for topic in TOPICS:
+        topic_news = [news.id for news in expected if news.topic == topic]
+        assert [news.id for news in store.by_topic.get(topic, [])] == topic_news
+    assert all(store.by_topic.values())
+
+
+@pytest.mark.parametrize('seed', range(30))
+def test_merged_matches_full_resort(seed):
+    rng = random.Random(seed)
+    # Различные метки времени: порядок равных меток не определён ни там, ни там
+    timestamps = rng.sample(range(100000), 400)
+    base = [make_news(i, float(timestamps[i])) for i in range(rng.randint(0, 150))]
+    store = NewsStore(base, version=3)
+    base_ids = [news.id for news in store.items]
+
+    added = [make_news(i, float(timestamps[i])) for i in range(150, 150 + rng.randint(0, 100))]
+    # Повтор уже известной новости добавлять не нужно
+    added += [make_news(i, float(timestamps[i]), title='повтор') for i in rng.sample(range(len(base)), min(3, len(base)))]
+    updated = [
+        news.replace(title=f"обновлено {news.id}", alt_sources=('other.com',))
+        for news in rng.sample(base, min(len(base), rng.randint(0, 10)))
+    ]
+    max_count = rng.choice([None, 0, 50, 120, 1000])
+
+    merged, evicted = store.merged(added, updated, max_count)
+
+    expected, expected_evicted = expected_snapshot(base, added, updated, max_count)
+    assert_consistent(merged, expected)
+    assert sorted(news.id for news in evicted) == sorted(news.id for news in expected_evicted)
+    assert merged.version == 4
+    # Исходный снимок не меняется
+    assert [news.id for news in store.items] == base_ids
+    assert_consistent(store, sorted(base, key=lambda news: news.timestamp, reverse=True))
+
+
+def test_merged_prepends_newer_block_and_interleaves_older():
+    store = NewsStore([make_news(i, float(i * 10)) for i in range(5)])
+
+    merged, evicted = store.merged([make_news(10, 100.0), make_news(11, 15.0)], max_count=6)
+
+    assert [news.id for news in merged.items] == [
+        'source_10', 'source_4', 'source_3', 'source_2', 'source_11', 'source_1']
+    assert [news.id for news in evicted] == ['source_0']
+
+
+def test_get_by_topics_pages_follow_merged_order():
+    store = NewsStore([make_news(i, float(i)) for i in range(30)])
+    merged, _ = store.merged([make_news(i, float(i)) for i in range(30, 40)])
+
+    expected = [news.id for news in merged.items if news.topic in ('экономика', 'рынки')]
+    pages = [merged.get_by_topics(['экономика', 'рынки'], limit=4, offset=offset) for offset in range(0, 28, 4)]
+    assert [news.id for page in pages for news in page] == expected
+    assert merged.count_by_topics(['экономика', 'рынки']) == len(expected)
@@ -0,0 +1,37 @@
+"""
+Тесты ограничителя скорости отправки
+"""
+
+import asyncio
+import time
+
+from utils.rate_limiter import TokenBucket
+
+
+def run_acquires(bucket: TokenBucket, count: int, before=None) -> float:
+    """Забирает count токенов конкурентно и возвращает затраченное время"""
+    async def main():
+        if before is not None:
+            before(bucket)
+        started = time.monotonic()
+        await asyncio.gather(*(bucket.acquire() for _ in range(count)))
+        return time.monotonic() - started
+
+    return asyncio.run(main())
+
+
+def test_burst_up_to_capacity_is_immediate():
+    assert run_acquires(TokenBucket(rate=10, capacity=5), 5) < 0.05
+
+
+def test_rate_limits_acquires_beyond_capacity():
+    elapsed = run_acquires(TokenBucket(rate=20, capacity=2), 6)
+
+    # Сверх ёмкости: 4 токена по 50 мс
+    assert 0.18 <= elapsed < 0.4
+
+
+def test_pause_blocks_all_waiters():
+    elapsed = run_acquires(TokenBucket(rate=100, capacity=10), 3, before=lambda bucket: bucket.pause(0.2))
+
+    assert 0.2 <= elapsed < 0.4
@@ -0,0 +1,91 @@
+"""
+Тесты планировщика задач на asyncio
+"""
+
+import asyncio
+from datetime import datetime
+
+import pytz
+
+from utils.scheduler import TaskScheduler
+
+
+def run_for(scheduler: TaskScheduler, seconds: float) -> None:
+    async def main():
+        runner = asyncio.create_task(scheduler.start())
+        await asyncio.sleep(seconds)
+        scheduler.stop()
+        await runner
+
+    asyncio.run(main())
+
+
+def test_interval_task_runs_on_schedule():
+    scheduler = TaskScheduler('UTC')
+    calls = []
+
+    async def task(value):
+        calls.append(value)
+
+    scheduler.add_interval_task(0.05, task, 'x', name='tick')
+    run_for(scheduler, 0.28)
+
+    assert 4 <= len(calls) <= 6 and set(calls) == {'x'}
+    assert scheduler.get_stats()['tick']['runs'] == len(calls)
+
+
+def test_long_running_task_is_not_overlapped():
+    scheduler = TaskScheduler('UTC')
+    started = []
+
+    async def slow():
+        started.append(1)
+        await asyncio.sleep(0.2)
+
+    job = scheduler.add_interval_task(0.05, slow)
+    run_for(scheduler, 0.23)
+
+    assert len(started) == 1
+    assert job.skipped >= 2
+
+
+def test_failures_are_counted_and_names_are_unique():
+    scheduler = TaskScheduler('UTC')
+
+    async def broken():
+        raise RuntimeError('сбой')
+
+    first = scheduler.add_interval_task(0.05, broken, name='job')
+    second = scheduler.add_interval_task(10, broken, name='job')
+    run_for(scheduler, 0.08)
+
+    assert (first.name, second.name) == ('job', 'job_2')
+    assert first.failures == first.runs == 1
+
+
+def test_missed_runs_are_coalesced():
+    scheduler = TaskScheduler('UTC')
+
+    async def task():
+        pass
+
+    job = scheduler.add_interval_task(10, task)
+    scheduler._heap.clear()
+    scheduler._reschedule(job, scheduled=1000, now=1055)
+
+    assert job.next_run == 1065
+
+
+def test_daily_run_uses_timezone_and_dst():
+    scheduler = TaskScheduler('Europe/Berlin')
+    zone = pytz.timezone('Europe/Berlin')
+    # 30 марта 2024 года, до перехода на летнее время
+    after = zone.localize(datetime(2024, 3, 30, 10, 0)).timestamp()
+
+    today = scheduler._next_daily_run('09:30', after - 3600)
+    tomorrow = scheduler._next_daily_run('09:30', after)
+
+    assert datetime.fromtimestamp(today, zone).strftime('%d %H:%M') == '30 09:30'
+    assert datetime.fromtimestamp(tomorrow, zone).strftime('%d %H:%M %Z') == '31 09:30 CEST'
+    # Сутки с переходом на летнее время короче на час
+    assert tomorrow - today == 23 * 3600
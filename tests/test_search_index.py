@@ -0,0 +1,52 @@
+"""
+Тесты полнотекстового поиска
+"""
+
+from models.search_index import SearchIndex, stem, tokenize
+
+
+def make_news(news_id: str, title: str, description: str = '', topic: str = 'экономика') -> dict:
+    return {'id': news_id, 'title': title, 'description': description, 'topic': topic}
+
+
+def test_tokenize_drops_stop_words_and_normalizes_forms():
+    assert tokenize('Ставки и ставкам') == ['ставк', 'ставк']
+    assert tokenize('Ещё рост') == tokenize('еще рост')
+    assert stem('companies') == 'company'
+    assert stem('2024') == '2024'
+
+
+def test_search_matches_inflected_query_and_ranks_title_higher():
+    index = SearchIndex()
+    index.add_many([
+        make_news('in_description', 'Итоги недели', 'Банк сохранил ключевую ставку'),
+        make_news('in_title', 'Ключевая ставка сохранена', 'Решение совета директоров'),
+        make_news('unrelated', 'Нефть дорожает', 'Цены на нефть растут'),
+    ])
+
+    assert index.search('ключевой ставки') == ['in_title', 'in_description']
+    assert index.search('и на') == []
+
+
+def test_search_filters_topics_and_limits_results():
+    index = SearchIndex()
+    index.add_many(make_news(f"n{i}", f"Биткоин новость {i}", topic='криптовалюта' if i % 2 else 'рынки')
+                   for i in range(10))
+
+    found = index.search('биткоин', topics=['криптовалюта'], limit=3)
+
+    assert len(found) == 3
+    assert all(int(news_id[1:]) % 2 for news_id in found)
+
+
+def test_remove_and_rebuild():
+    index = SearchIndex()
+    index.add_many([make_news('a', 'Инфляция замедлилась'), make_news('b', 'Инфляция ускорилась')])
+
+    index.remove('a')
+    assert index.search('инфляция') == ['b']
+    assert len(index) == 1
+
+    index.rebuild([make_news('c', 'Инфляция в еврозоне')])
+    assert index.search('инфляция') == ['c']
+    assert index.search('ускорилась') == []
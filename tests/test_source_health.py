@@ -0,0 +1,59 @@
+"""
+Тесты выключателя и экспоненциальной задержки источников
+"""
+
+import pytest
+
+from config.settings import Settings
+from models.source_health import CLOSED, HALF_OPEN, OPEN, SourceHealth
+
+FEED = 'https://example.com/rss'
+
+
+@pytest.fixture
+def health(data_paths, monkeypatch):
+    monkeypatch.setattr(Settings, 'SOURCE_FAILURE_THRESHOLD', 2)
+    monkeypatch.setattr(Settings, 'SOURCE_BACKOFF_BASE', 100)
+    monkeypatch.setattr(Settings, 'SOURCE_BACKOFF_MAX', 1000)
+    return SourceHealth()
+
+
+def test_opens_after_threshold_and_probes_after_backoff(health):
+    health.record_failure(FEED, 'timeout', now=1000)
+    assert health.allow(FEED, now=1000)
+
+    health.record_failure(FEED, 'timeout', now=1000)
+    entry = health.state[FEED]
+    assert entry['state'] == OPEN
+    assert 90 <= entry['open_until'] - 1000 <= 110
+    assert not health.allow(FEED, now=1050)
+
+    assert health.allow(FEED, now=1200)
+    assert entry['state'] == HALF_OPEN
+
+
+def test_backoff_doubles_up_to_maximum(health):
+    pauses = []
+    for _ in range(8):
+        health.record_failure(FEED, 'HTTP 500', now=1000)
+        pauses.append(health.state[FEED]['open_until'] - 1000)
+
+    assert pauses[1] == pytest.approx(100, rel=0.11)
+    assert pauses[2] == pytest.approx(200, rel=0.11)
+    assert pauses[3] == pytest.approx(400, rel=0.11)
+    assert max(pauses) <= 1100
+
+
+def test_success_closes_breaker_and_state_survives_restart(health):
+    for _ in range(3):
+        health.record_failure(FEED, 'HTTP 503')
+    assert health.get_stats()['unhealthy'] == 1
+    health.save()
+
+    restored = SourceHealth()
+    assert restored.state[FEED]['state'] == OPEN
+    assert restored.filter_allowed([FEED, 'https://other.example.com/rss']) == ['https://other.example.com/rss']
+
+    restored.record_success(FEED)
+    assert restored.state[FEED]['state'] == CLOSED
+    assert restored.get_stats() == {'unhealthy': 0, 'sources': {}}
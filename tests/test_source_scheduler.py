@@ -0,0 +1,80 @@
+"""
+Тесты адаптивного расписания опроса источников
+"""
+
+import pytest
+
+from config.settings import Settings
+from models.news_aggregator import NewsAggregator, _FetchResult
+from models.news_storage import JsonNewsStorage
+from models.source_scheduler import SourceScheduler
+
+FEED = 'https://example.com/rss'
+
+
+@pytest.fixture
+def scheduler(data_paths, monkeypatch):
+    monkeypatch.setattr(Settings, 'NEWS_UPDATE_INTERVAL', 1800)
+    monkeypatch.setattr(Settings, 'SOURCE_MIN_INTERVAL', 120)
+    monkeypatch.setattr(Settings, 'SOURCE_MAX_INTERVAL', 21600)
+    monkeypatch.setattr(Settings, 'SOURCE_TARGET_ITEMS', 1)
+    monkeypatch.setattr(Settings, 'SOURCE_RATE_ALPHA', 0.5)
+    monkeypatch.setattr(Settings, 'SOURCE_JITTER', 0)
+    return SourceScheduler([FEED])
+
+
+def test_new_source_is_due_immediately(scheduler):
+    assert scheduler.due_sources(now=1000) == [FEED]
+
+    assert scheduler.record(FEED, 20, now=1000) == 1800
+    assert scheduler.due_sources(now=2000) == []
+    assert scheduler.due_sources(now=2800) == [FEED]
+
+
+def test_interval_follows_publication_rate(scheduler):
+    scheduler.record(FEED, 20, now=1000)
+
+    # 6 записей за 600 с: 0.01 в секунду, со средним 0.005 → интервал 200 с
+    assert scheduler.record(FEED, 6, now=1600) == pytest.approx(200)
+    # Без новых записей частота падает, а интервал растёт
+    assert scheduler.record(FEED, 0, now=1800) == pytest.approx(400)
+
+
+def test_interval_doubles_without_items_and_is_bounded(scheduler):
+    scheduler.record(FEED, 0, now=1000)
+    intervals = [scheduler.record(FEED, 0, now=t) for t in (2800, 6400, 13600, 28000, 49600)]
+
+    assert intervals == [3600, 7200, 14400, 21600, 21600]
+
+
+def test_postpone_keeps_rate_and_interval(scheduler):
+    scheduler.record(FEED, 20, now=1000)
+    scheduler.record(FEED, 6, now=1600)
+    before = dict(scheduler.state[FEED])
+
+    assert scheduler.postpone(FEED, now=1700) == pytest.approx(200)
+
+    entry = scheduler.state[FEED]
+    assert entry['next_due'] == pytest.approx(1900)
+    assert (entry['rate'], entry['interval'], entry['last_polled'], entry['polls']) == (
+        before['rate'], before['interval'], before['last_polled'], before['polls'])
+
+
+def test_failed_poll_does_not_slow_down_source(scheduler, monkeypatch):
+    monkeypatch.setattr(Settings, 'SOURCES', [FEED])
+    monkeypatch.setattr(Settings, 'ADAPTIVE_POLLING', True)
+    aggregator = NewsAggregator(storage=JsonNewsStorage(Settings.DATABASE_PATH))
+    aggregator.source_scheduler = scheduler
+    scheduler.record(FEED, 20, now=1000)
+    scheduler.record(FEED, 6, now=1600)
+    scheduler.state[FEED]['next_due'] = 0
+    aggregator._fetch_source = lambda url: _FetchResult([], error='404 Client Error')
+    try:
+        aggregator.update_news_database()
+    finally:
+        aggregator.close()
+
+    entry = scheduler.state[FEED]
+    assert entry['interval'] == pytest.approx(200)
+    assert entry['polls'] == 2
+    assert aggregator.source_health.state[FEED]['failures'] == 1
@@ -0,0 +1,51 @@
+"""
+Тесты извлечения текста из HTML-описаний
+"""
+
+import pytest
+from bs4 import BeautifulSoup
+
+from utils.text_extractor import TextExtractor, html_to_text
+
+SAMPLES = [
+    '<p>Первый абзац.</p><p>Второй&nbsp;абзац</p>',
+    'Строка<br/>вторая строка<img src="x.png"/>подпись',
+    '<div><script>track()</script><style>p {}</style>Текст <b>жирный</b> и <a href="#">ссылка</a></div>',
+    '<ul><li>один</li><li>два</li></ul>хвост',
+    'AT&amp;T &lt;NYSE&gt; shares',
+    '<p>Незакрытый <i>тег',
+]
+
+
+def legacy_text(markup: str) -> str:
+    """Прежнее извлечение через дерево BeautifulSoup"""
+    soup = BeautifulSoup(markup, 'html.parser')
+    for element in soup(['script', 'style']):
+        element.decompose()
+    return ' '.join(soup.get_text(' ').split())
+
+
+@pytest.mark.parametrize('markup', SAMPLES)
+def test_matches_beautifulsoup_text(markup):
+    assert html_to_text(markup).split() == legacy_text(markup).split()
+
+
+def test_plain_text_and_empty_values():
+    assert html_to_text('  Просто\n\tтекст  ') == 'Просто текст'
+    assert html_to_text('Цена &euro;5') == 'Цена €5'
+    assert html_to_text(None) == ''
+    assert html_to_text('') == ''
+
+
+def test_blocks_are_separated_by_spaces():
+    assert html_to_text('<p>раз</p><p>два</p>') == 'раз два'
+    assert html_to_text('<b>слит</b><i>но</i>') == 'слитно'
+
+
+def test_extract_many_in_process_pool_keeps_order():
+    extractor = TextExtractor(processes=2, batch_threshold=4)
+    markups = [f"<p>новость {i}</p>" for i in range(10)] + [None]
+    try:
+        assert extractor.extract_many(markups) == [f"новость {i}" for i in range(10)] + ['']
+    finally:
+        extractor.close()
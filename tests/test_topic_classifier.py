@@ -0,0 +1,50 @@
+"""
+Тесты классификатора тем и фильтра
+"""
+
+import pytest
+
+from models.topic_classifier import DEFAULT_TOPIC, TopicClassifier
+
+
+@pytest.fixture
+def classifier():
+    return TopicClassifier(filter_keywords=['Реклама', 'sponsored'])
+
+
+@pytest.mark.parametrize('title, topic', [
+    ('Traders brace for payrolls report', 'рынки'),
+    ('Assets under management hit record', 'инвестиции'),
+    ('Loans to small businesses fall', 'финансы'),
+    ('Budgets squeezed as rates rise', 'финансы'),
+    ('Banking shares slide after results', 'финансы'),
+    ('Startups cut hiring', 'технологии'),
+    ('Экономические итоги года', 'экономика'),
+    ('Банков стало меньше', 'финансы'),
+])
+def test_inflected_keywords_match(classifier, title, topic):
+    assert classifier.detect_topic(title, '') == topic
+
+
+def test_short_english_keywords_match_whole_words_only(classifier):
+    assert classifier.detect_topic('Minister said nothing new', '') == DEFAULT_TOPIC
+    assert classifier.detect_topic('New AI model released', '') == 'технологии'
+    assert classifier.detect_topic('Quarterly GDP figures', '') == 'экономика'
+
+
+def test_keywords_do_not_match_inside_words(classifier):
+    assert classifier.detect_topic('Livestock prices', 'Farmers await the harvest') == DEFAULT_TOPIC
+
+
+def test_primary_topic_is_first_declared_topic_with_matches(classifier):
+    result = classifier.classify('Stocks and shares rally', 'Bank earnings lift the market')
+
+    assert result.topic == 'финансы'
+    assert result.scores == {'финансы': 1, 'рынки': 3}
+    assert result.topics == ['рынки', 'финансы']
+
+
+def test_filter_keywords(classifier):
+    assert classifier.should_filter('Новость', 'Реклама партнёра')
+    assert classifier.should_filter('Sponsored: markets outlook', '')
+    assert not classifier.should_filter('Markets outlook', '')
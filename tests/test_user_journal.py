@@ -0,0 +1,94 @@
+"""
+Тесты журнала пользователей: воспроизведение, уплотнение и общий журнал процессов
+"""
+
+import json
+import os
+
+import pytest
+
+from config.settings import Settings
+from models.user_manager import UserManager
+
+
+@pytest.fixture(autouse=True)
+def users_paths(tmp_path, monkeypatch):
+    monkeypatch.setattr(Settings, 'USERS_PATH', str(tmp_path / 'users.json'))
+    monkeypatch.setattr(Settings, 'USERS_JOURNAL_PATH', str(tmp_path / 'users.journal'))
+    return tmp_path
+
+
+def make_changes(manager: UserManager) -> None:
+    manager.add_topic('1', 'экономика')
+    manager.add_topic('1', 'финансы')
+    manager.remove_topic('1', 'экономика')
+    manager.add_favorite('2', 'example.com_01')
+    manager.add_favorite('2', 'example.com_02')
+    manager.remove_favorite('2', 'example.com_01')
+
+
+def abandon(manager: UserManager) -> None:
+    """Останавливает фоновый поток без уплотнения, как при аварийном завершении"""
+    manager._stop_event.set()
+    if manager._flusher is not None:
+        manager._flusher.join()
+    manager.journal.close()
+
+
+def test_replay_restores_changes_without_snapshot(users_paths):
+    manager = UserManager(write_behind=True, journal=True)
+    make_changes(manager)
+    expected = json.loads(json.dumps(manager.users_data))
+    abandon(manager)
+
+    assert not os.path.exists(Settings.USERS_PATH)
+    restored = UserManager(write_behind=True, journal=True)
+    try:
+        assert restored.users_data == expected
+        assert restored.get_user_topics('1') == ['финансы']
+        assert restored.get_user_favorites('2') == ['example.com_02']
+    finally:
+        restored.close()
+
+
+def test_compaction_writes_snapshot_and_starts_new_journal(users_paths):
+    manager = UserManager(write_behind=True, journal=True)
+    make_changes(manager)
+    expected = json.loads(json.dumps(manager.users_data))
+    manager.close()
+
+    with open(Settings.USERS_PATH, encoding='utf-8') as f:
+        assert json.load(f) == expected
+    assert not os.path.exists(Settings.USERS_JOURNAL_PATH + '.old')
+    assert not os.path.exists(Settings.USERS_JOURNAL_PATH) or os.path.getsize(Settings.USERS_JOURNAL_PATH) == 0
+
+    # Изменения после уплотнения ложатся поверх снимка
+    manager = UserManager(write_behind=True, journal=True)
+    manager.add_topic('3', 'рынки')
+    abandon(manager)
+    restored = UserManager(write_behind=True, journal=True)
+    try:
+        assert restored.get_user_topics('1') == ['финансы']
+        assert restored.get_user_topics('3') == ['рынки']
+    finally:
+        restored.close()
+
+
+def test_workers_share_changes_through_journal(users_paths):
+    main = UserManager(write_behind=True, worker_id=0)
+    worker = UserManager(write_behind=True, worker_id=1)
+    try:
+        worker.add_topic('1', 'рынки')
+        worker.add_favorite('1', 'example.com_03')
+        assert main.sync_from_journal() > 0
+        assert main.get_user_topics('1') == ['рынки']
+        assert main.get_user_favorites('1') == ['example.com_03']
+
+        # Уплотнение основным процессом не теряет последующие записи другого
+        main.compact()
+        worker.add_topic('1', 'финансы')
+        main.sync_from_journal()
+        assert main.get_user_topics('1') == ['рынки', 'финансы']
+    finally:
+        worker.close()
+        main.close()
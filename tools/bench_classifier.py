@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Микробенчмарк классификатора тем
+
+Сравнивает прежнюю реализацию (_detect_topic + _should_filter с подстрочным
+поиском) с TopicClassifier на новостях из текущей базы.
+
+Запуск из корня проекта:
+    python -m tools.bench_classifier [--count 5000] [--repeat 5]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.settings import Settings
+from models.news_storage import create_news_storage
+from models.topic_classifier import TOPIC_KEYWORDS, TopicClassifier
+
+SAMPLE_NEWS = [
+    ('Stocks rally as banks report strong earnings', 'Markets rose on Tuesday after major banks beat forecasts.'),
+    ('ЦБ сохранил ключевую ставку', 'Банк России оставил ставку без изменений, инфляция замедляется.'),
+    ('AI startup raises $200 million in venture funding', 'The company builds machine learning software for fintech.'),
+    ('IMF cuts global growth forecast', 'The fund warned about recession risks and rising public debt.'),
+    ('Нефть дорожает на фоне сокращения добычи', 'Котировки Brent выросли на 2% на торгах в понедельник.'),
+    # Словоформы, которых нет в списках ключевых слов
+    ('Traders brace for payrolls report', 'Economists expect hiring to slow.'),
+    ('Assets under management hit record', 'Inflows into passive products accelerated.'),
+    ('Loans to small businesses fall', 'Lenders tightened standards for the third quarter.'),
+    ('Budgets squeezed as rates rise', 'Households cut spending on travel.'),
+    ('Banking shares slide after results', 'Investors worry about deposit outflows.'),
+]
+
+
+def legacy_detect_topic(title: str, description: str) -> str:
+    """Прежняя реализация NewsAggregator._detect_topic"""
+    text = f"{title} {description}".lower()
+    # Как и раньше, словарь собирается заново при каждом вызове
+    topics = {topic: list(keywords) for topic, keywords in TOPIC_KEYWORDS.items()}
+    for topic, keywords in topics.items():
+        if any(keyword in text for keyword in keywords):
+            return topic
+    return 'общее'
+
+
+def legacy_should_filter(title: str, description: str, filter_keywords) -> bool:
+    """Прежняя реализация NewsAggregator._should_filter"""
+    if not filter_keywords:
+        return False
+    text = f"{title} {description}".lower()
+    return any(keyword in text for keyword in filter_keywords)
+
+
+def load_entries(count: int):
+    news_data = create_news_storage().load_all()
+    entries = [(news['title'], news.get('description', '')) for news in news_data]
+    if not entries:
+        print("База новостей пуста, используются встроенные примеры")
+        entries = SAMPLE_NEWS
+    return [entries[i % len(entries)] for i in range(count)]
+
+
+def bench(label: str, func, entries, repeat: int) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for title, description in entries:
+            func(title, description)
+        best = min(best, time.perf_counter() - started)
+    per_entry = best / len(entries) * 1e6
+    print(f"{label:<28} {best * 1000:8.1f} мс  {per_entry:6.1f} мкс/новость")
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--count', type=int, default=5000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    filter_keywords = Settings.FILTER_KEYWORDS
+    entries = load_entries(args.count)
+    classifier = TopicClassifier(filter_keywords=filter_keywords)
+
+    def legacy(title, description):
+        return legacy_detect_topic(title, description), legacy_should_filter(title, description, filter_keywords)
+
+    print(f"Новостей: {len(entries)}, фильтр: {len(filter_keywords)} слов, повторов: {args.repeat}")
+    legacy_time = bench('прежняя реализация', legacy, entries, args.repeat)
+    compiled_time = bench('TopicClassifier', classifier.classify, entries, args.repeat)
+    print(f"Ускорение: x{legacy_time / compiled_time:.1f}")
+
+    same = sum(
+        1 for title, description in entries
+        if legacy(title, description)[0] == classifier.classify(title, description).topic
+    )
+    print(f"Совпадение основной темы с прежней реализацией: {same / len(entries):.1%}")
+
+
+if __name__ == '__main__':
+    main()
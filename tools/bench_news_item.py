@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Бенчмарк памяти резидентной базы новостей
+
+Сравнивает новости в виде словарей (как их отдаёт json.loads из хранилища)
+с объектами NewsItem: память на новость по tracemalloc и время
+преобразования. База синтетическая, источники и темы повторяются, как
+в реальной ленте.
+
+Запуск из корня проекта:
+    python -m tools.bench_news_item [--count 50000]
+"""
+
+import argparse
+import gc
+import json
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.news_item import NewsItem
+
+TOPICS = ['экономика', 'финансы', 'рынки', 'технологии', 'криптовалюта', 'общее']
+SOURCES = [f"news{i}.example.com" for i in range(20)]
+
+
+def make_raw_news(count: int) -> str:
+    """Возвращает синтетическую базу в формате JSON-хранилища"""
+    rng = random.Random(1)
+    now = time.time()
+    news_data = []
+    for i in range(count):
+        source = rng.choice(SOURCES)
+        news_data.append({
+            'id': f"{source}_{i:016x}",
+            'title': f"Новость номер {i}: рынки реагируют на решение регулятора",
+            'link': f"https://{source}/news/{i}",
+            'description': "Аналитики оценивают последствия решения для экономики. " * rng.randint(1, 4),
+            'source': source,
+            'topic': rng.choice(TOPICS),
+            'published': list(time.gmtime(now - i * 60)),
+            'timestamp': now - i * 60
+        })
+    return json.dumps(news_data, ensure_ascii=False)
+
+
+def measure(build) -> tuple:
+    """Возвращает память (байт) и время построения результата build()"""
+    gc.collect()
+    tracemalloc.start()
+    started = time.perf_counter()
+    result = build()
+    elapsed = time.perf_counter() - started
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return current, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--count', type=int, default=50000)
+    args = parser.parse_args()
+
+    raw = make_raw_news(args.count)
+    dict_bytes, dict_seconds = measure(lambda: json.loads(raw))
+    # Словари освобождаются сразу после преобразования, как при загрузке базы
+    item_bytes, item_seconds = measure(lambda: [NewsItem.from_dict(news) for news in json.loads(raw)])
+
+    print(f"Новостей: {args.count}")
+    print(f"{'представление':<14} {'память, МБ':>11} {'байт/новость':>13} {'загрузка, мс':>13}")
+    for name, size, seconds in (('dict', dict_bytes, dict_seconds), ('NewsItem', item_bytes, item_seconds)):
+        print(f"{name:<14} {size / 1024 / 1024:>11.1f} {size / args.count:>13.0f} {seconds * 1000:>13.1f}")
+    print(f"Экономия памяти: {(1 - item_bytes / dict_bytes) * 100:.0f}%")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Бенчмарк форматов хранения базы новостей
+
+Сравнивает JSON с отступами (json) и NDJSON с индексом смещений (ndjson)
+на синтетической базе: размер на диске, время полной загрузки, получения
+новости по ID и страницы по темам (первый вызов и повторный в том же
+процессе), а также пиковую память (RSS). Каждый замер выполняется
+в отдельном процессе, чтобы пиковая память одного формата не влияла
+на другой.
+
+Запуск из корня проекта:
+    python -m tools.bench_storage [--count 50000]
+"""
+
+import argparse
+import json
+import os
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.news_storage import JsonNewsStorage, NdjsonNewsStorage
+
+TOPICS = ['экономика', 'финансы', 'рынки', 'технологии', 'криптовалюта', 'общее']
+OPERATIONS = ('load_all', 'get_by_id', 'topics_page')
+
+
+def make_news(count: int):
+    rng = random.Random(1)
+    now = time.time()
+    for i in range(count):
+        yield {
+            'id': f"example.com_{i:016x}",
+            'title': f"Новость номер {i}: рынки реагируют на решение регулятора",
+            'link': f"https://example.com/news/{i}",
+            'description': "Аналитики оценивают последствия решения для экономики. " * rng.randint(2, 8),
+            'source': 'example.com',
+            'topic': rng.choice(TOPICS),
+            'published': [2024, 1, 1, 12, 0, 0, 0, 1, 0],
+            'timestamp': now - i * 60
+        }
+
+
+def open_storage(backend: str, directory: str):
+    if backend == 'json':
+        return JsonNewsStorage(os.path.join(directory, 'news.json'))
+    return NdjsonNewsStorage(os.path.join(directory, 'news.ndjson'))
+
+
+def storage_size(directory: str, backend: str) -> int:
+    prefix = 'news.json' if backend == 'json' else 'news.'
+    return sum(
+        os.path.getsize(os.path.join(directory, name))
+        for name in os.listdir(directory)
+        if name.startswith(prefix) and (backend == 'json') == (name == 'news.json')
+    )
+
+
+def prepare(directory: str, count: int) -> None:
+    """Записывает синтетическую базу в обоих форматах"""
+    news_data = list(make_news(count))
+    for backend in ('json', 'ndjson'):
+        open_storage(backend, directory).save_all(news_data)
+
+
+def current_rss_mb() -> float:
+    with open('/proc/self/statm') as f:
+        return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 1024 / 1024
+
+
+def run_child(backend: str, operation: str, directory: str, count: int) -> None:
+    """Выполняет один замер и печатает результат в JSON"""
+    storage = open_storage(backend, directory)
+    baseline = current_rss_mb()
+
+    def call():
+        if operation == 'load_all':
+            return len(storage.load_all())
+        if operation == 'get_by_id':
+            return storage.get_by_id(f"example.com_{count // 2:016x}") is not None
+        return len(storage.get_by_topics(['рынки', 'финансы'], limit=10, offset=20))
+
+    started = time.perf_counter()
+    result = call()
+    elapsed = time.perf_counter() - started
+    peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Повторный вызов в том же процессе: индекс и отображение файла уже готовы
+    started = time.perf_counter()
+    call()
+    warm = time.perf_counter() - started
+    print(json.dumps({'seconds': elapsed, 'warm_seconds': warm, 'peak_rss_mb': peak_kb / 1024,
+                      'delta_rss_mb': peak_kb / 1024 - baseline, 'result': result}))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--count', type=int, default=50000)
+    parser.add_argument('--prepare', metavar='DIR', help=argparse.SUPPRESS)
+    parser.add_argument('--child', nargs=3, metavar=('BACKEND', 'OPERATION', 'DIR'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.prepare:
+        prepare(args.prepare, args.count)
+        return
+    if args.child:
+        run_child(*args.child, count=args.count)
+        return
+
+    def run(*extra) -> str:
+        # Пиковая память наследуется при fork, поэтому родитель не держит базу в памяти
+        return subprocess.run(
+            [sys.executable, '-m', 'tools.bench_storage', '--count', str(args.count), *extra],
+            check=True, capture_output=True, text=True,
+            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        ).stdout
+
+    with tempfile.TemporaryDirectory(prefix='bench_storage_') as directory:
+        run('--prepare', directory)
+
+        print(f"Новостей: {args.count}")
+        print(f"{'формат':<8} {'операция':<12} {'время, мс':>10} {'повтор, мс':>11} "
+              f"{'пик RSS, МБ':>12} {'прирост, МБ':>12}")
+        for backend in ('json', 'ndjson'):
+            print(f"{backend:<8} {'размер':<12} {storage_size(directory, backend) / 1024 / 1024:>9.1f}М")
+            for operation in OPERATIONS:
+                measurement = json.loads(run('--child', backend, operation, directory).strip().splitlines()[-1])
+                print(f"{backend:<8} {operation:<12} {measurement['seconds'] * 1000:>10.1f} "
+                      f"{measurement['warm_seconds'] * 1000:>11.2f} "
+                      f"{measurement['peak_rss_mb']:>12.1f} {measurement['delta_rss_mb']:>12.1f}")
+
+
+if __name__ == '__main__':
+    main()
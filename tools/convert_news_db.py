@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Перенос базы новостей между форматами хранения
+
+По умолчанию переносит news.json (DATABASE_PATH) в NDJSON с индексом
+смещений (NDJSON_DATABASE_PATH). Исходная база не изменяется; после
+переноса укажите NEWS_STORAGE=<формат> в .env. Запускать при
+остановленных боте и сборщике.
+
+Запуск из корня проекта:
+    python -m tools.convert_news_db [--from json] [--to ndjson]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.news_storage import (
+    JsonNewsStorage, NdjsonNewsStorage, PartitionedNewsStorage, SqliteNewsStorage
+)
+
+BACKENDS = {
+    'json': JsonNewsStorage,
+    'sqlite': SqliteNewsStorage,
+    'ndjson': NdjsonNewsStorage,
+    'partitioned': PartitionedNewsStorage,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--from', dest='source', choices=BACKENDS, default='json')
+    parser.add_argument('--to', dest='target', choices=BACKENDS, default='ndjson')
+    args = parser.parse_args()
+
+    if args.source == args.target:
+        parser.error("исходный и целевой форматы совпадают")
+
+    source = BACKENDS[args.source]()
+    target = BACKENDS[args.target]()
+
+    started = time.perf_counter()
+    news_data = source.load_all()
+    target.save_all(news_data)
+    converted = target.count()
+    source.close()
+    target.close()
+
+    print(f"Перенесено новостей: {converted} из {len(news_data)} ({args.source} -> {args.target}) "
+          f"за {time.perf_counter() - started:.2f} с")
+    if converted != len(news_data):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Перевод базы новостей на стабильные ID
+
+Прежние ID строились из hash() ссылки и менялись при каждом перезапуске.
+Скрипт пересчитывает ID сохранённых новостей по канонической ссылке,
+удаляет получившиеся дубликаты и обновляет ссылки в избранном пользователей.
+Запускать при остановленных боте и сборщике.
+
+Запуск из корня проекта:
+    python -m tools.migrate_news_ids [--dry-run]
+"""
+
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.news_id import make_news_id
+from models.news_item import to_epoch
+from models.news_storage import create_news_storage
+from models.user_manager import UserManager
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Перевод базы новостей на стабильные ID')
+    parser.add_argument('--dry-run', action='store_true', help='только показать, что изменится')
+    args = parser.parse_args()
+
+    storage = create_news_storage()
+    news_data = storage.load_all()
+
+    mapping = {}
+    migrated = []
+    seen_ids = set()
+    for news in news_data:
+        new_id = make_news_id(news['source'], news.get('link'),
+                              title=news.get('title'), published=to_epoch(news.get('published')))
+        mapping[news['id']] = new_id
+        # Новости отсортированы по свежести: из дубликатов остаётся самый новый
+        if new_id in seen_ids:
+            continue
+        seen_ids.add(new_id)
+        migrated.append(dict(news, id=new_id))
+
+    changed = sum(1 for old_id, new_id in mapping.items() if old_id != new_id)
+    print(f"Новостей: {len(news_data)}, ID изменится: {changed}, "
+          f"дубликатов удалится: {len(news_data) - len(migrated)}")
+
+    if args.dry_run:
+        return
+
+    storage.save_all(migrated)
+    storage.close()
+
+    user_manager = UserManager(write_behind=False)
+    replaced = user_manager.remap_favorites(mapping)
+    user_manager.close()
+    print(f"Ссылок в избранном обновлено: {replaced}")
+
+
+if __name__ == '__main__':
+    main()
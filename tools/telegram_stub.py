@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Локальная заглушка Telegram Bot API для проверки режима webhook
+
+Принимает вызовы Bot API от бота (TELEGRAM_API_SERVER=http://127.0.0.1:8081)
+и отвечает успешными фиктивными результатами. С параметром --updates
+отправляет на webhook бота синтетические обновления с командами и измеряет,
+за какое время бот ответил на все из них.
+
+Запуск из корня проекта:
+    python -m tools.telegram_stub [--port 8081]
+    python -m tools.telegram_stub --updates 5000 --webhook http://127.0.0.1:8080/webhook
+"""
+
+import argparse
+import asyncio
+import itertools
+import time
+from collections import Counter
+
+from aiohttp import ClientSession, ClientTimeout, web
+
+COMMANDS = ['/help', '/latest', '/mytopics', '/search ставка', '/favorites']
+
+
+class TelegramStub:
+    """Фиктивный сервер Bot API, считающий вызовы методов"""
+
+    def __init__(self):
+        self.calls = Counter()
+        self.message_ids = itertools.count(1)
+        self.replies = asyncio.Event()
+        self.expected_replies = 0
+
+    def _result(self, method: str, params: dict):
+        if method == 'getme':
+            return {'id': 1, 'is_bot': True, 'first_name': 'Stub', 'username': 'stub_bot'}
+        if method in ('sendmessage', 'editmessagetext'):
+            return {
+                'message_id': next(self.message_ids),
+                'date': int(time.time()),
+                'chat': {'id': int(params.get('chat_id', 0)), 'type': 'private'},
+                'text': params.get('text', '')
+            }
+        return True
+
+    async def handle_method(self, request: web.Request) -> web.Response:
+        """Обрабатывает вызов /bot{token}/{method}"""
+        method = request.match_info['method'].lower()
+        if request.content_type == 'application/json':
+            params = await request.json()
+        else:
+            params = dict(await request.post())
+        self.calls[method] += 1
+        if method == 'sendmessage' and self.expected_replies and self.calls[method] >= self.expected_replies:
+            self.replies.set()
+        return web.json_response({'ok': True, 'result': self._result(method, params)})
+
+    async def handle_stats(self, request: web.Request) -> web.Response:
+        """Возвращает число вызовов по методам"""
+        return web.json_response(dict(self.calls))
+
+    def make_app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_route('*', '/bot{token}/{method}', self.handle_method)
+        app.router.add_get('/stats', self.handle_stats)
+        return app
+
+
+def make_update(update_id: int, user_id: int, text: str) -> dict:
+    """Формирует обновление с текстовым сообщением от пользователя"""
+    user = {'id': user_id, 'is_bot': False, 'first_name': f'User{user_id}'}
+    return {
+        'update_id': update_id,
+        'message': {
+            'message_id': update_id,
+            'date': int(time.time()),
+            'chat': {'id': user_id, 'type': 'private'},
+            'from': user,
+            'text': text,
+            'entities': [{'type': 'bot_command', 'offset': 0, 'length': len(text.split()[0])}]
+        }
+    }
+
+
+async def send_updates(stub: TelegramStub, webhook: str, count: int, users: int,
+                       concurrency: int, secret: str) -> None:
+    """Отправляет обновления на webhook и ждёт ответов бота"""
+    headers = {'X-Telegram-Bot-Api-Secret-Token': secret} if secret else {}
+    stub.expected_replies = stub.calls['sendmessage'] + count
+    queue = iter(range(1, count + 1))
+    errors = 0
+
+    async def worker(session: ClientSession):
+        nonlocal errors
+        for update_id in queue:
+            update = make_update(update_id, 1000 + update_id % users, COMMANDS[update_id % len(COMMANDS)])
+            async with session.post(webhook, json=update, headers=headers) as response:
+                if response.status != 200:
+                    errors += 1
+
+    started = time.perf_counter()
+    async with ClientSession(timeout=ClientTimeout(total=30)) as session:
+        await asyncio.gather(*(worker(session) for _ in range(concurrency)))
+    accepted = time.perf_counter() - started
+
+    try:
+        await asyncio.wait_for(stub.replies.wait(), timeout=max(30.0, count / 50))
+    except asyncio.TimeoutError:
+        print(f"Не дождались всех ответов: {dict(stub.calls)}")
+    elapsed = time.perf_counter() - started
+
+    print(f"Обновлений: {count}, ошибок webhook: {errors}")
+    print(f"Приём webhook: {accepted:.2f} с ({count / accepted:.0f} обновлений/с)")
+    print(f"Ответы бота:   {elapsed:.2f} с ({count / elapsed:.0f} обновлений/с)")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description='Заглушка Telegram Bot API')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8081)
+    parser.add_argument('--updates', type=int, default=0, help='отправить N обновлений и завершиться')
+    parser.add_argument('--webhook', default='http://127.0.0.1:8080/webhook')
+    parser.add_argument('--secret', default='')
+    parser.add_argument('--users', type=int, default=1000)
+    parser.add_argument('--concurrency', type=int, default=50)
+    args = parser.parse_args()
+
+    stub = TelegramStub()
+    runner = web.AppRunner(stub.make_app())
+    await runner.setup()
+    await web.TCPSite(runner, args.host, args.port).start()
+    print(f"Заглушка Bot API: http://{args.host}:{args.port}")
+
+    try:
+        if args.updates:
+            await send_updates(stub, args.webhook, args.updates, args.users, args.concurrency, args.secret)
+        else:
+            await asyncio.Event().wait()
+    finally:
+        await runner.cleanup()
+
+
+if __name__ == '__main__':
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass
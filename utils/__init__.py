@@ -4,5 +4,13 @@
 
 from .logger import setup_logging, get_logger
 from .scheduler import TaskScheduler, scheduler
+from .rate_limiter import TokenBucket
+from .loop_monitor import LoopLagMonitor
+from .file_utils import atomic_write_bytes, atomic_write_json, atomic_write_text
+from .bloom_filter import BloomFilter
+from .http_client import HttpClient, HttpResponse, ResponseTooLarge
+from .text_extractor import TextExtractor, html_to_text
 
-__all__ = ['setup_logging', 'get_logger', 'TaskScheduler', 'scheduler']
+__all__ = ['setup_logging', 'get_logger', 'TaskScheduler', 'scheduler', 'TokenBucket', 'LoopLagMonitor',
+           'atomic_write_bytes', 'atomic_write_json', 'atomic_write_text', 'BloomFilter',
+           'HttpClient', 'HttpResponse', 'ResponseTooLarge', 'TextExtractor', 'html_to_text']
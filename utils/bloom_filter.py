@@ -0,0 +1,97 @@
+"""
+Фильтр Блума для компактного хранения множества строк
+"""
+
+import hashlib
+import logging
+import math
+import os
+import struct
+
+from .file_utils import atomic_write_bytes
+
+logger = logging.getLogger(__name__)
+
+
+class BloomFilter:
+    """Фильтр Блума из двух поколений.
+
+    Отвечает «точно нет» или «вероятно да» с долей ложных срабатываний
+    около error_rate при capacity элементах в поколении. Когда текущее
+    поколение заполняется, оно становится предыдущим, а самое старое
+    забывается, поэтому точность не деградирует со временем.
+    """
+
+    MAGIC = b'BLM1'
+    HEADER = struct.Struct('<4sIIII')  # magic, бит, хэшей, элементов в текущем и предыдущем поколении
+
+    def __init__(self, capacity: int = 100000, error_rate: float = 0.001):
+        self.capacity = capacity
+        self.size = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self._current = bytearray((self.size + 7) // 8)
+        self._previous = bytearray((self.size + 7) // 8)
+        self._current_count = 0
+        self._previous_count = 0
+        self.dirty = False
+
+    def _positions(self, item: str):
+        digest = hashlib.blake2b(item.encode('utf-8'), digest_size=16).digest()
+        h1, h2 = struct.unpack('<QQ', digest)
+        # Двойное хэширование: k позиций из двух независимых хэшей
+        return [(h1 + i * h2) % self.size for i in range(self.hash_count)]
+
+    @staticmethod
+    def _has(bits: bytearray, positions) -> bool:
+        return all(bits[position >> 3] & (1 << (position & 7)) for position in positions)
+
+    def add(self, item: str) -> None:
+        """Добавляет строку в фильтр"""
+        positions = self._positions(item)
+        if self._has(self._current, positions):
+            return
+        if self._current_count >= self.capacity:
+            self._previous, self._current = self._current, bytearray(len(self._current))
+            self._previous_count, self._current_count = self._current_count, 0
+        for position in positions:
+            self._current[position >> 3] |= 1 << (position & 7)
+        self._current_count += 1
+        self.dirty = True
+
+    def __contains__(self, item: str) -> bool:
+        positions = self._positions(item)
+        return self._has(self._current, positions) or self._has(self._previous, positions)
+
+    def __len__(self) -> int:
+        return self._current_count + self._previous_count
+
+    def save(self, path: str) -> None:
+        """Атомарно сохраняет фильтр в файл"""
+        header = self.HEADER.pack(self.MAGIC, self.size, self.hash_count,
+                                  self._current_count, self._previous_count)
+        atomic_write_bytes(path, header + bytes(self._current) + bytes(self._previous))
+        self.dirty = False
+
+    @classmethod
+    def load(cls, path: str, capacity: int = 100000, error_rate: float = 0.001) -> 'BloomFilter':
+        """Загружает фильтр из файла; при отсутствии или несовпадении параметров создаёт пустой"""
+        bloom = cls(capacity, error_rate)
+        if not os.path.exists(path):
+            return bloom
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+            magic, size, hash_count, current_count, previous_count = cls.HEADER.unpack_from(data)
+            length = (size + 7) // 8
+            if magic != cls.MAGIC or size != bloom.size or hash_count != bloom.hash_count \
+                    or len(data) != cls.HEADER.size + 2 * length:
+                logger.warning(f"Параметры фильтра Блума {path} изменились, фильтр создан заново")
+                return bloom
+            offset = cls.HEADER.size
+            bloom._current = bytearray(data[offset:offset + length])
+            bloom._previous = bytearray(data[offset + length:])
+            bloom._current_count = current_count
+            bloom._previous_count = previous_count
+        except Exception as e:
+            logger.error(f"Ошибка загрузки фильтра Блума: {e}")
+        return bloom
@@ -0,0 +1,36 @@
+"""
+Вспомогательные функции для работы с файлами
+"""
+
+import json
+import os
+import tempfile
+from typing import Any
+
+
+def atomic_write_bytes(path: str, data: bytes) -> None:
+    """Атомарно записывает данные: во временный файл рядом с целевым, затем rename"""
+    directory = os.path.dirname(path) or '.'
+    os.makedirs(directory, exist_ok=True)
+
+    fd, tmp_path = tempfile.mkstemp(prefix='.tmp_', dir=directory)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def atomic_write_text(path: str, text: str) -> None:
+    """Атомарно записывает текст в кодировке UTF-8"""
+    atomic_write_bytes(path, text.encode('utf-8'))
+
+
+def atomic_write_json(path: str, data: Any, indent: int = None) -> None:
+    """Атомарно записывает данные в JSON-файл"""
+    atomic_write_text(path, json.dumps(data, ensure_ascii=False, indent=indent))
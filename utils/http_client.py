@@ -0,0 +1,91 @@
+"""
+HTTP-клиент для загрузки RSS-каналов
+"""
+
+import threading
+from typing import Dict, Mapping, NamedTuple, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from config.settings import Settings
+
+
+class ResponseTooLarge(requests.RequestException):
+    """Тело ответа превышает допустимый размер"""
+
+
+class HttpResponse(NamedTuple):
+    """Прочитанный ответ: код, заголовки и тело"""
+    url: str
+    status_code: int
+    headers: Mapping[str, str]
+    content: bytes
+
+    def raise_for_status(self) -> None:
+        """Вызывает HTTPError для ответов с кодом ошибки"""
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"HTTP {self.status_code} для {self.url}")
+
+
+class HttpClient:
+    """Общий клиент с пулом соединений по хостам.
+
+    Соединения с одним хостом переиспользуются между загрузками и потоками
+    (keep-alive), ответы запрашиваются со сжатием gzip/deflate, а тело
+    читается потоком и обрывается, как только превышает max_bytes.
+    """
+
+    CHUNK_SIZE = 64 * 1024
+
+    def __init__(self, pool_connections: int = None, pool_maxsize: int = None,
+                 max_bytes: int = None, timeout: Tuple[float, float] = None):
+        self.max_bytes = max_bytes or Settings.FETCH_MAX_BYTES
+        self.timeout = timeout or (Settings.FETCH_CONNECT_TIMEOUT, Settings.FETCH_READ_TIMEOUT)
+        self.session = requests.Session()
+        self.session.headers.update({
+            'User-Agent': Settings.HTTP_USER_AGENT,
+            'Accept-Encoding': 'gzip, deflate',
+            'Accept': 'application/rss+xml, application/atom+xml, application/xml;q=0.9, */*;q=0.8'
+        })
+        # pool_connections — число хостов с пулом, pool_maxsize — соединений на хост
+        adapter = HTTPAdapter(
+            pool_connections=pool_connections or Settings.HTTP_POOL_CONNECTIONS,
+            pool_maxsize=pool_maxsize or max(1, Settings.FETCH_MAX_WORKERS)
+        )
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self._lock = threading.Lock()
+        self.stats = {'requests': 0, 'bytes': 0, 'too_large': 0}
+
+    def get(self, url: str, headers: Optional[Dict[str, str]] = None) -> HttpResponse:
+        """Выполняет GET-запрос и читает тело с ограничением размера"""
+        with self.session.get(url, headers=headers, timeout=self.timeout, stream=True) as response:
+            declared = response.headers.get('Content-Length')
+            if declared and declared.isdigit() and int(declared) > self.max_bytes:
+                self._count(0, too_large=True)
+                raise ResponseTooLarge(f"Ответ {url} больше {self.max_bytes} байт: {declared}")
+
+            chunks = []
+            size = 0
+            # iter_content распаковывает gzip, поэтому лимит действует и на распакованные данные
+            for chunk in response.iter_content(self.CHUNK_SIZE):
+                size += len(chunk)
+                if size > self.max_bytes:
+                    self._count(size, too_large=True)
+                    raise ResponseTooLarge(f"Ответ {url} больше {self.max_bytes} байт")
+                chunks.append(chunk)
+
+            self._count(size)
+            return HttpResponse(url, response.status_code, response.headers, b''.join(chunks))
+
+    def _count(self, size: int, too_large: bool = False) -> None:
+        with self._lock:
+            self.stats['requests'] += 1
+            self.stats['bytes'] += size
+            if too_large:
+                self.stats['too_large'] += 1
+
+    def close(self) -> None:
+        """Закрывает соединения пула"""
+        self.session.close()
@@ -0,0 +1,60 @@
+"""
+Мониторинг задержки цикла событий asyncio
+"""
+
+import asyncio
+import logging
+from collections import deque
+from typing import Dict
+
+logger = logging.getLogger(__name__)
+
+
+class LoopLagMonitor:
+    """Измеряет задержку цикла событий.
+
+    Раз в interval секунд задача засыпает и сравнивает фактическое время
+    пробуждения с ожидаемым. Разница — время, на которое цикл был занят
+    чужим кодом, то есть задержка, которую увидят обработчики команд.
+    """
+
+    def __init__(self, interval: float = 0.1, warn_threshold: float = 0.2, window: int = 600):
+        self.interval = interval
+        self.warn_threshold = warn_threshold
+        self.samples = deque(maxlen=window)
+        self.max_lag = 0.0
+        self.is_running = False
+
+    async def start(self):
+        """Запускает измерения"""
+        loop = asyncio.get_running_loop()
+        self.is_running = True
+
+        while self.is_running:
+            started = loop.time()
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, loop.time() - started - self.interval)
+            self.samples.append(lag)
+            self.max_lag = max(self.max_lag, lag)
+            if lag > self.warn_threshold:
+                logger.warning(f"Цикл событий был заблокирован на {lag * 1000:.0f} мс")
+
+    def stop(self):
+        """Останавливает измерения"""
+        self.is_running = False
+
+    def reset_max(self) -> float:
+        """Возвращает максимум с прошлого сброса и сбрасывает его"""
+        max_lag, self.max_lag = self.max_lag, 0.0
+        return max_lag
+
+    def stats(self) -> Dict[str, float]:
+        """Возвращает статистику задержки в миллисекундах за окно измерений"""
+        if not self.samples:
+            return {'avg_ms': 0.0, 'p99_ms': 0.0, 'max_ms': 0.0}
+        ordered = sorted(self.samples)
+        return {
+            'avg_ms': round(sum(ordered) / len(ordered) * 1000, 1),
+            'p99_ms': round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))] * 1000, 1),
+            'max_ms': round(ordered[-1] * 1000, 1)
+        }
@@ -0,0 +1,49 @@
+"""
+Ограничитель скорости отправки сообщений
+"""
+
+import asyncio
+import time
+
+
+class TokenBucket:
+    """Асинхронный ограничитель скорости по алгоритму token bucket.
+
+    Токены пополняются со скоростью rate в секунду до capacity. Метод pause
+    останавливает выдачу токенов всем ожидающим, например после ответа
+    Telegram RetryAfter.
+    """
+
+    def __init__(self, rate: float, capacity: float = None):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = asyncio.Lock()
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self) -> None:
+        """Ожидает и забирает один токен"""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self._paused_until:
+                    await asyncio.sleep(self._paused_until - now)
+                    continue
+
+                self._refill(now)
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+    def pause(self, seconds: float) -> None:
+        """Приостанавливает выдачу токенов на заданное время"""
+        now = time.monotonic()
+        self._paused_until = max(self._paused_until, now + seconds)
+        self._tokens = 0
+        self._updated = max(self._updated, self._paused_until)
@@ -3,60 +3,212 @@
 """
 
 import asyncio
+import heapq
+import itertools
 import logging
-import schedule
 import time
-from typing import Callable
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional, Tuple
+
+import pytz
 
 from config.settings import Settings
 
 logger = logging.getLogger(__name__)
 
 
+class ScheduledJob:
+    """Периодическая задача планировщика и статистика её запусков"""
+
+    def __init__(self, name: str, task_func: Callable, args: tuple, kwargs: dict,
+                 interval: Optional[float] = None, daily_time: Optional[str] = None,
+                 allow_overlap: bool = False, coalesce: bool = True):
+        self.name = name
+        self.task_func = task_func
+        self.args = args
+        self.kwargs = kwargs
+        self.interval = interval
+        self.daily_time = daily_time
+        self.allow_overlap = allow_overlap
+        self.coalesce = coalesce
+        self.next_run = 0.0
+        self.running = 0
+        self.runs = 0
+        self.failures = 0
+        self.skipped = 0
+        self.total_duration = 0.0
+        self.max_duration = 0.0
+        self.last_duration: Optional[float] = None
+        self.last_started: Optional[float] = None
+
+    def get_stats(self) -> Dict:
+        """Возвращает статистику запусков задачи"""
+        return {
+            'next_run': datetime.fromtimestamp(self.next_run).isoformat(timespec='seconds'),
+            'running': self.running,
+            'runs': self.runs,
+            'failures': self.failures,
+            'skipped': self.skipped,
+            'last_duration': round(self.last_duration, 3) if self.last_duration is not None else None,
+            'avg_duration': round(self.total_duration / self.runs, 3) if self.runs else None,
+            'max_duration': round(self.max_duration, 3)
+        }
+
+
 class TaskScheduler:
-    """Класс для планирования периодических задач"""
-    
-    def __init__(self):
+    """Планировщик периодических задач на asyncio.
+
+    Задачи хранятся в куче по времени следующего запуска, и цикл спит ровно
+    до ближайшего из них. Ежедневные задачи считаются в часовом поясе
+    Settings.TIMEZONE. По умолчанию задача не запускается повторно, пока не
+    завершился предыдущий запуск, а пропущенные запуски (после долгой
+    блокировки или сна системы) объединяются в один.
+    """
+
+    def __init__(self, timezone: str = None):
         self.is_running = False
-        self.tasks = []
-    
-    def add_daily_task(self, time_str: str, task_func: Callable, *args, **kwargs):
+        self.tasks: List[ScheduledJob] = []
+        self.timezone = pytz.timezone(timezone or Settings.TIMEZONE)
+        self._heap: List[Tuple[float, int, ScheduledJob]] = []
+        self._counter = itertools.count()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._running_tasks = set()
+
+    def _next_daily_run(self, time_str: str, after: float) -> float:
+        """Вычисляет ближайший момент time_str (ЧЧ:ММ) в часовом поясе планировщика"""
+        hour, minute = (int(part) for part in time_str.split(':'))
+        now = datetime.fromtimestamp(after, self.timezone)
+        day = now.date()
+        while True:
+            # localize для каждой даты, чтобы учитывать переход на летнее время
+            candidate = self.timezone.localize(datetime(day.year, day.month, day.day, hour, minute))
+            if candidate.timestamp() > after:
+                return candidate.timestamp()
+            day += timedelta(days=1)
+
+    def _add_job(self, job: ScheduledJob) -> ScheduledJob:
+        # Имена задач — ключи статистики, поэтому делаем их уникальными
+        names = {task.name for task in self.tasks}
+        if job.name in names:
+            job.name = next(f"{job.name}_{i}" for i in itertools.count(2) if f"{job.name}_{i}" not in names)
+        now = time.time()
+        if job.daily_time is not None:
+            job.next_run = self._next_daily_run(job.daily_time, now)
+        else:
+            job.next_run = now + job.interval
+        self.tasks.append(job)
+        self._push(job)
+        return job
+
+    def _push(self, job: ScheduledJob) -> None:
+        heapq.heappush(self._heap, (job.next_run, next(self._counter), job))
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    def add_daily_task(self, time_str: str, task_func: Callable, *args, name: str = None,
+                       allow_overlap: bool = False, **kwargs) -> ScheduledJob:
         """Добавляет ежедневную задачу"""
-        schedule.every().day.at(time_str).do(
-            lambda: asyncio.create_task(task_func(*args, **kwargs))
-        )
-        logger.info(f"Добавлена ежедневная задача на {time_str}")
-    
-    def add_interval_task(self, interval_seconds: int, task_func: Callable, *args, **kwargs):
+        self._next_daily_run(time_str, time.time())  # проверка формата времени
+        job = self._add_job(ScheduledJob(
+            name or task_func.__name__, task_func, args, kwargs,
+            daily_time=time_str, allow_overlap=allow_overlap))
+        logger.info(f"Добавлена ежедневная задача {job.name} на {time_str} ({self.timezone.zone})")
+        return job
+
+    def add_interval_task(self, interval_seconds: float, task_func: Callable, *args, name: str = None,
+                          allow_overlap: bool = False, coalesce: bool = True, **kwargs) -> ScheduledJob:
         """Добавляет задачу с интервалом"""
-        schedule.every(interval_seconds).seconds.do(
-            lambda: asyncio.create_task(task_func(*args, **kwargs))
-        )
-        logger.info(f"Добавлена задача с интервалом {interval_seconds} секунд")
-    
+        job = self._add_job(ScheduledJob(
+            name or task_func.__name__, task_func, args, kwargs,
+            interval=interval_seconds, allow_overlap=allow_overlap, coalesce=coalesce))
+        logger.info(f"Добавлена задача {job.name} с интервалом {interval_seconds} секунд")
+        return job
+
+    def _reschedule(self, job: ScheduledJob, scheduled: float, now: float) -> None:
+        """Назначает следующий запуск задачи"""
+        if job.daily_time is not None:
+            job.next_run = self._next_daily_run(job.daily_time, max(now, scheduled))
+        else:
+            # Отсчёт от планового времени, чтобы интервал не накапливал сдвиг
+            job.next_run = scheduled + job.interval
+            if job.next_run <= now and job.coalesce:
+                missed = int((now - scheduled) // job.interval)
+                logger.warning(f"Задача {job.name} отстала от расписания: {missed} запусков объединены в один")
+                job.next_run = now + job.interval
+        self._push(job)
+
+    async def _run_job(self, job: ScheduledJob) -> None:
+        """Выполняет задачу и обновляет её статистику"""
+        job.running += 1
+        started = time.monotonic()
+        job.last_started = time.time()
+        try:
+            await job.task_func(*job.args, **job.kwargs)
+        except Exception as e:
+            job.failures += 1
+            logger.error(f"Ошибка задачи {job.name}: {e}")
+        finally:
+            duration = time.monotonic() - started
+            job.running -= 1
+            job.runs += 1
+            job.last_duration = duration
+            job.total_duration += duration
+            job.max_duration = max(job.max_duration, duration)
+
+    def _dispatch(self, job: ScheduledJob) -> None:
+        """Запускает задачу с учётом политики перекрытия"""
+        if job.running and not job.allow_overlap:
+            job.skipped += 1
+            logger.warning(f"Задача {job.name} ещё выполняется, запуск пропущен")
+            return
+        task = asyncio.create_task(self._run_job(job), name=f"scheduler-{job.name}")
+        self._running_tasks.add(task)
+        task.add_done_callback(self._running_tasks.discard)
+
     async def start(self):
         """Запускает планировщик"""
         self.is_running = True
+        self._wakeup = asyncio.Event()
         logger.info("Планировщик запущен")
-        
+
         while self.is_running:
             try:
-                schedule.run_pending()
-                await asyncio.sleep(Settings.SCHEDULER_CHECK_INTERVAL)
+                now = time.time()
+                if self._heap and self._heap[0][0] <= now:
+                    scheduled, _, job = heapq.heappop(self._heap)
+                    if job in self.tasks:
+                        self._dispatch(job)
+                        self._reschedule(job, scheduled, now)
+                    continue
+
+                # Спим до ближайшей задачи или до добавления новой
+                timeout = self._heap[0][0] - now if self._heap else None
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout)
+                except asyncio.TimeoutError:
+                    pass
             except Exception as e:
                 logger.error(f"Ошибка в планировщике: {e}")
-                await asyncio.sleep(60)  # Ждем минуту при ошибке
-    
+                await asyncio.sleep(1)
+
     def stop(self):
         """Останавливает планировщик"""
         self.is_running = False
+        if self._wakeup is not None:
+            self._wakeup.set()
         logger.info("Планировщик остановлен")
-    
+
     def clear_tasks(self):
         """Очищает все задачи"""
-        schedule.clear()
+        self.tasks.clear()
+        self._heap.clear()
         logger.info("Все задачи очищены")
 
+    def get_stats(self) -> Dict[str, Dict]:
+        """Возвращает статистику запусков по задачам"""
+        return {job.name: job.get_stats() for job in self.tasks}
+
 
 # Глобальный экземпляр планировщика
 scheduler = TaskScheduler()
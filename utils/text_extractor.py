@@ -0,0 +1,101 @@
+"""
+Извлечение текста из HTML-описаний новостей
+"""
+
+import html
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional
+
+from bs4 import BeautifulSoup
+from lxml import etree
+from lxml import html as lxml_html
+
+from config.settings import Settings
+
+logger = logging.getLogger(__name__)
+
+# После этих элементов вставляется пробел, чтобы не склеивались абзацы и строки
+_BLOCK_TAGS = frozenset({
+    'br', 'p', 'div', 'li', 'ul', 'ol', 'tr', 'td', 'th', 'table', 'blockquote',
+    'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'hr', 'img', 'figure', 'figcaption', 'pre',
+})
+_SKIP_TAGS = frozenset({'script', 'style'})
+
+
+def normalize_whitespace(text: str) -> str:
+    """Схлопывает пробельные символы (включая неразрывные) в одиночные пробелы"""
+    return ' '.join(text.split())
+
+
+def _lxml_text(markup: str) -> str:
+    root = lxml_html.fragment_fromstring(markup, create_parent='div')
+    etree.strip_elements(root, *_SKIP_TAGS, with_tail=False)
+    for element in root.iter(*_BLOCK_TAGS):
+        element.tail = ' ' + element.tail if element.tail else ' '
+    return root.text_content()
+
+
+def html_to_text(markup: Optional[str]) -> str:
+    """Преобразует HTML-фрагмент в текст с нормализованными пробелами.
+
+    Строки без разметки обрабатываются без разбора (только сущности),
+    остальные — парсером lxml; BeautifulSoup используется, только если
+    lxml не справился с разметкой.
+    """
+    if not markup:
+        return ''
+    if '<' not in markup:
+        return normalize_whitespace(html.unescape(markup) if '&' in markup else markup)
+
+    try:
+        return normalize_whitespace(_lxml_text(markup))
+    except (etree.LxmlError, ValueError) as e:
+        logger.debug(f"lxml не разобрал описание, используется BeautifulSoup: {e}")
+        return normalize_whitespace(BeautifulSoup(markup, 'html.parser').get_text(' '))
+
+
+class TextExtractor:
+    """Извлекает текст описаний, большие пачки — в пуле процессов.
+
+    Разбор HTML нагружает процессор и под GIL не ускоряется потоками
+    загрузки, поэтому при processes > 0 пачка от batch_threshold описаний
+    (первый опрос источника, накопившийся бэклог) распределяется по
+    процессам. Пул создаётся при первой такой пачке; меньшие пачки
+    дешевле разобрать на месте, чем передавать между процессами.
+    """
+
+    def __init__(self, processes: int = None, batch_threshold: int = None):
+        self.processes = Settings.TEXT_EXTRACT_PROCESSES if processes is None else processes
+        self.batch_threshold = batch_threshold or Settings.TEXT_EXTRACT_BATCH
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def _pool(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # spawn, а не fork: процесс уже многопоточный (загрузка RSS, бот)
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.processes, mp_context=multiprocessing.get_context('spawn'))
+        return self._executor
+
+    def extract(self, markup: Optional[str]) -> str:
+        """Извлекает текст из одного описания"""
+        return html_to_text(markup)
+
+    def extract_many(self, markups: List[Optional[str]]) -> List[str]:
+        """Извлекает текст из списка описаний, сохраняя порядок"""
+        if self.processes > 0 and len(markups) >= self.batch_threshold:
+            chunksize = max(1, len(markups) // (self.processes * 4))
+            try:
+                return list(self._pool().map(html_to_text, markups, chunksize=chunksize))
+            except Exception as e:
+                logger.error(f"Ошибка извлечения текста в пуле процессов: {e}")
+                # Упавший пул непригоден, следующая пачка создаст новый
+                self.close()
+        return [html_to_text(markup) for markup in markups]
+
+    def close(self) -> None:
+        """Останавливает пул процессов"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
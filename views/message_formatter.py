@@ -9,6 +9,16 @@ from config.settings import Settings
 class MessageFormatter:
     """Класс для форматирования сообщений бота"""
     
+    @staticmethod
+    def format_source(news: Dict) -> str:
+        """Форматирует источник новости вместе с лентами её дубликатов"""
+        alt_sources = news.get('alt_sources')
+        if not alt_sources:
+            return news['source']
+        # В alt_sources хранятся URL лент (в старых записях — хосты); схему не показываем
+        names = [source.split('://', 1)[-1].rstrip('/') for source in alt_sources]
+        return f"{news['source']} (+ {', '.join(names)})"
+    
     @staticmethod
     def format_welcome_message() -> str:
         """Форматирует приветственное сообщение"""
@@ -78,7 +88,7 @@ class MessageFormatter:
         response = f"{title} (Страница {page}):\n\n"
         for i, news in enumerate(news_list, 1):
             response += f"{i + (page-1) * limit}. {news['title']}\n"
-            response += f"   📅 {news['source']} | {news['topic']}\n"
+            response += f"   📅 {MessageFormatter.format_source(news)} | {news['topic']}\n"
             response += f"   📝 {news['description'][:100]}...\n"
             response += f"   🔗 {news['link']}\n\n"
         
@@ -93,7 +103,7 @@ class MessageFormatter:
         response = f"🔍 Результаты поиска по запросу '{query}':\n\n"
         for i, news in enumerate(results, 1):
             response += f"{i}. {news['title']}\n"
-            response += f"   📅 {news['source']} | {news['topic']}\n"
+            response += f"   📅 {MessageFormatter.format_source(news)} | {news['topic']}\n"
             response += f"   📝 {news['description'][:100]}...\n"
             response += f"   🔗 {news['link']}\n\n"
         
@@ -108,7 +118,7 @@ class MessageFormatter:
         response = "⭐ Ваши сохранённые новости:\n\n"
         for i, news in enumerate(favorites, 1):
             response += f"{i}. {news['title']}\n"
-            response += f"   📅 {news['source']} | {news['topic']}\n"
+            response += f"   📅 {MessageFormatter.format_source(news)} | {news['topic']}\n"
             response += f"   📝 {news['description'][:100]}...\n"
             response += f"   🔗 {news['link']}\n\n"
         
@@ -123,7 +133,7 @@ class MessageFormatter:
         digest_text = f"📰 Ежедневный дайджест новостей\n\n"
         for i, news in enumerate(news_list, 1):
             digest_text += f"{i}. {news['title']}\n"
-            digest_text += f"   📅 {news['source']} | {news['topic']}\n"
+            digest_text += f"   📅 {MessageFormatter.format_source(news)} | {news['topic']}\n"
             digest_text += f"   📝 {news['description'][:100]}...\n"
             digest_text += f"   🔗 {news['link']}\n\n"
         